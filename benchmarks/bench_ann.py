@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Approximate search with `examples/retrieval/ann.IvfIndex`, compared with exact `top_k`.
+
+Each operation is one query for the 10 nearest rows, at 10k, 100k and 1M rows,
+or a batch of 100 queries for `*_batch_100`. The rows are normalized
+256-dimension vectors scattered around 2,000 topics, so that they have some of
+the cluster structure of real embeddings; 1M of them take 1 GB.
+`ann.ivf_<rows>_nprobe_<n>` notes the recall@10 against exact search over 100
+queries. It always probes the index, including below `ann.EXACT_SEARCH_ROWS`,
+where `IvfIndex.search` runs the exact search by default.
+"""
+
+import functools
+import itertools
+
+import numpy as np
+
+from harness import benchmark, load_module
+
+DIM = 256
+TOPICS = 2000
+NOISE = 1.0  # Per-dimension noise around the topic, relative to the topic vector's.
+K = 10
+QUERIES = 100
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+NPROBES = (1, 8, 32)
+BATCH_NPROBE = 8
+
+
+def _clustered(rows: int, seed: int) -> np.ndarray:
+    search = load_module("examples", "retrieval.search")
+    topics = np.random.default_rng(0).standard_normal((TOPICS, DIM), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    vectors = topics[rng.integers(0, TOPICS, rows)]
+    vectors += NOISE * rng.standard_normal((rows, DIM), dtype=np.float32)
+    return search.normalize(vectors)
+
+
+@functools.lru_cache(maxsize=None)
+def _dataset(rows: int):
+    """The matrix, the queries, and the exact nearest rows of each query."""
+    search = load_module("examples", "retrieval.search")
+    matrix = _clustered(rows, seed=1)
+    queries = _clustered(QUERIES, seed=2)
+    _, exact_rows = search.top_k(matrix, queries, k=K)
+    return matrix, queries, exact_rows
+
+
+@functools.lru_cache(maxsize=None)
+def _index(rows: int):
+    ann = load_module("examples", "retrieval.ann")
+    matrix, _, _ = _dataset(rows)
+    return ann.IvfIndex.build(matrix)
+
+
+def _cycle(queries, search_one):
+    queries = itertools.cycle(queries)
+    return lambda: search_one(next(queries))
+
+
+def _recall_note(index, found_rows, exact_rows) -> str:
+    ann = load_module("examples", "retrieval.ann")
+    return f"recall@{K} {ann.recall(found_rows, exact_rows):.3f}, {len(index.centroids)} lists"
+
+
+for _label, _rows in SIZES.items():
+    @benchmark(f"ann.exact_{_label}", group="ann", repeats=3, alloc_calls=5)
+    def exact(rows=_rows):
+        search = load_module("examples", "retrieval.search")
+        matrix, queries, _ = _dataset(rows)
+        return _cycle(queries, lambda query: search.top_k(matrix, query, k=K))
+
+    for _nprobe in NPROBES:
+        @benchmark(f"ann.ivf_{_label}_nprobe_{_nprobe}", group="ann", repeats=3, alloc_calls=5)
+        def ivf(rows=_rows, nprobe=_nprobe):
+            matrix, queries, exact_rows = _dataset(rows)
+            index = _index(rows)
+            _, found_rows = index.search(matrix, queries, k=K, nprobe=nprobe, exact_below=0)
+            op = _cycle(queries, lambda query: index.search(matrix, query, k=K, nprobe=nprobe, exact_below=0))
+            op.note = _recall_note(index, found_rows, exact_rows)
+            return op
+
+    @benchmark(f"ann.exact_{_label}_batch_100", group="ann", repeats=3, alloc_calls=2)
+    def exact_batch(rows=_rows):
+        search = load_module("examples", "retrieval.search")
+        matrix, queries, _ = _dataset(rows)
+        return lambda: search.top_k(matrix, queries, k=K)
+
+    @benchmark(f"ann.ivf_{_label}_nprobe_{BATCH_NPROBE}_batch_100", group="ann", repeats=3, alloc_calls=2)
+    def ivf_batch(rows=_rows):
+        matrix, queries, exact_rows = _dataset(rows)
+        index = _index(rows)
+        op = lambda: index.search(matrix, queries, k=K, nprobe=BATCH_NPROBE, exact_below=0)
+        op.note = _recall_note(index, op()[1], exact_rows)
+        return op
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized PCM helpers of `quickstarts/live_audio/`."""
+
+import array
+
+from harness import benchmark, load_module, synthetic_pcm
+
+CHUNK = synthetic_pcm(1600)  # 100 ms at 16 kHz, the LiveTranslate chunk size.
+
+
+def legacy_adjust_volume(pcm_data: bytes, volume: float) -> bytes:
+    """The per-sample loop `Get_started_LiveTranslate.adjust_volume` used to run."""
+    samples = array.array("h", pcm_data)
+    for i in range(len(samples)):
+        samples[i] = int(samples[i] * volume)
+    return samples.tobytes()
+
+
+@benchmark("dsp.legacy_gain_loop", group="dsp")
+def legacy_gain_loop():
+    return lambda: legacy_adjust_volume(CHUNK, 0.08)
+
+
+@benchmark("dsp.apply_gain", group="dsp")
+def apply_gain():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    return lambda: dsp.apply_gain(CHUNK, 0.08)
+
+
+@benchmark("dsp.apply_gain_in_place", group="dsp")
+def apply_gain_in_place():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    buffer = bytearray(CHUNK)
+    return lambda: dsp.apply_gain(buffer, 0.999, out=buffer)
+
+
+@benchmark("dsp.fade", group="dsp")
+def fade():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    return lambda: dsp.fade(CHUNK, 1.0, 0.0)
+
+
+@benchmark("dsp.crossfade_250ms_stereo", group="dsp")
+def crossfade():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    # The overlap `ContextCrossfader` uses for Lyria's 48 kHz stereo stream.
+    old, new = synthetic_pcm(24000), synthetic_pcm(24000, seed=1)
+    return lambda: dsp.crossfade(old, new, channels=2)
+
+
+@benchmark("dsp.mix", group="dsp")
+def mix():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    other = synthetic_pcm(1600, seed=1)
+    return lambda: dsp.mix(CHUNK, other, 0.08, 1.0)
+
+
+@benchmark("dsp.peak_and_rms", group="dsp")
+def peak_and_rms():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    return lambda: (dsp.peak(CHUNK), dsp.rms(CHUNK))
+
+
+@benchmark("dsp.resample_16k_to_24k", group="dsp")
+def resample():
+    dsp = load_module("quickstarts", "live_audio.dsp")
+    resampler = dsp.Resampler(16000, 24000)
+    return lambda: resampler.process(CHUNK)
+
+
+@benchmark("mixer.original_and_translation", group="dsp")
+def mix_original_and_translation():
+    """One LiveTranslate chunk: 100 ms of 16 kHz original plus 24 kHz translation, read in 20 ms blocks."""
+    mixer_module = load_module("quickstarts", "live_audio.mixer")
+    mixer = mixer_module.Mixer(24000)
+    original = mixer.add_input("original", rate=16000, gain=0.08)
+    translation = mixer.add_input("translation")
+    translated = synthetic_pcm(2400, sample_rate=24000, seed=1)
+
+    def op():
+        original.write(CHUNK)
+        translation.write(translated)
+        for _ in range(5):
+            mixer.read(480)
+
+    return op
+
+
+def lyria_layers(count: int):
+    """One Lyria device buffer (4200 frames of 48 kHz stereo, 87.5 ms) mixed from `count` layers.
+
+    A core keeps up with `count` layers as long as this runs above 11.4 ops/s
+    (one buffer per 87.5 ms), the difference between the layer counts gives the
+    cost of each extra layer.
+    """
+    mixer_module = load_module("quickstarts", "live_audio.mixer")
+    mixer = mixer_module.Mixer(48000, channels=2)
+    layers = [mixer.add_input(f"layer{i}", gain=0.5, realign=True) for i in range(count)]
+    chunk = synthetic_pcm(4200 * 2, sample_rate=48000)
+
+    def op():
+        for layer in layers:
+            layer.write(chunk)
+        mixer.read(4200)
+
+    return op
+
+
+for _count in (1, 4, 16):
+    benchmark(f"mixer.lyria_layers_{_count}", group="dsp")(lambda count=_count: lyria_layers(count))
+
+
+@benchmark("aec.process_mic_chunk", group="dsp")
+def aec_process_mic_chunk():
+    """One 1024-sample (64 ms) microphone chunk, with 24 kHz audio playing.
+
+    Real time on one core needs at least 15.6 ops/s.
+    """
+    aec = load_module("quickstarts", "live_audio.aec")
+    echo_canceller = aec.EchoCanceller(16000, 24000)
+    played = synthetic_pcm(1536, sample_rate=24000, seed=1)
+    mic = synthetic_pcm(1024)
+
+    def op():
+        echo_canceller.add_reference(played)
+        echo_canceller.process(mic)
+
+    return op
+
+
+@benchmark("segmenter.split_10_minutes", group="dsp")
+def split_10_minutes():
+    segmenter = load_module("quickstarts", "live_audio.segmenter")
+    recording = CHUNK * 6000  # 10 minutes at 16 kHz.
+    return lambda: segmenter.split_on_silence(recording, 16000, max_seconds=60)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The local work `file-api/sample.py` does before deciding whether to upload.
+
+`file_api.sha256_64mib` hashes a 64 MiB file, `file_api.cache_lookup` looks up
+a hash in an upload index of 10,000 entries.
+
+`file_api.resumable_64mib_<size>mib_chunks` uploads a 64 MiB file with
+`resumable_upload.upload_resumable` to the local stand-in server of
+`upload_server.py`, in chunks of that size: the client's overhead per chunk,
+without the network. `file_api.sdk_upload_64mib` is `client.files.upload` of
+the same file to the same server, for comparison.
+
+`file_api.resume_after_drop_64mib` has the server drop the connection in the
+middle of a chunk. The first `upload_resumable` call gives up, like a run
+interrupted there, and a second one resumes from the saved session. The
+resumed upload is checked against the file once, before timing.
+"""
+
+import atexit
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from harness import benchmark, load_module, require
+from upload_server import UploadServer
+
+FILE_BYTES = 64 << 20
+DROP_AT = (36 << 20) + (100 << 10)  # In the middle of the fifth 8 MiB chunk.
+CACHE_ENTRIES = 10_000
+
+
+def _temp_path(suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    atexit.register(os.remove, path)
+    return path
+
+
+def _random_file(num_bytes: int) -> str:
+    path = _temp_path(".bin")
+    with open(path, "wb") as f:
+        for _ in range(num_bytes >> 20):
+            f.write(os.urandom(1 << 20))
+    return path
+
+
+@benchmark("file_api.sha256_64mib", group="file_api", alloc_calls=3)
+def sha256_64mib():
+    upload_cache = load_module("quickstarts/file-api", "upload_cache")
+    path = _random_file(FILE_BYTES)
+    return lambda: upload_cache.file_sha256(path)
+
+
+@benchmark("file_api.cache_lookup", group="file_api")
+def cache_lookup():
+    upload_cache = load_module("quickstarts/file-api", "upload_cache")
+    cache = upload_cache.UploadCache(_temp_path(".sqlite"))
+    atexit.register(cache.close)
+    with cache.db:
+        cache.db.executemany(
+            "INSERT INTO uploads VALUES (?, ?, ?, ?, ?)",
+            ((f"{i:064x}", "image/png", f"files/{i}", None, None) for i in range(CACHE_ENTRIES)),
+        )
+    sha256 = f"{CACHE_ENTRIES // 2:064x}"
+    return lambda: cache.lookup(sha256, "image/png")
+
+
+for _chunk_mib in (1, 8, 32):
+    @benchmark(f"file_api.resumable_64mib_{_chunk_mib}mib_chunks", group="file_api", repeats=3, alloc_calls=3)
+    def resumable_upload(chunk_mib=_chunk_mib):
+        resumable_upload = load_module("quickstarts/file-api", "resumable_upload")
+        path = _random_file(FILE_BYTES)
+        state_dir = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, state_dir)
+        server = UploadServer().__enter__()
+        atexit.register(server.__exit__, None, None, None)
+        state_path = os.path.join(state_dir, "sessions.json")
+        # Like the SDK client below, keep the connection (and TLS setup) across uploads.
+        http = resumable_upload.httpx.Client()
+        atexit.register(http.close)
+        return lambda: resumable_upload.upload_resumable(
+            "unused",
+            path,
+            "video/mp4",
+            chunk_size=chunk_mib << 20,
+            state_path=state_path,
+            base_url=server.base_url,
+            http=http,
+        )
+
+
+@benchmark("file_api.resume_after_drop_64mib", group="file_api", repeats=3, alloc_calls=3)
+def resume_after_drop():
+    resumable_upload = load_module("quickstarts/file-api", "resumable_upload")
+    path = _random_file(FILE_BYTES)
+    state_dir = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, state_dir)
+    server = UploadServer().__enter__()
+    atexit.register(server.__exit__, None, None, None)
+    state_path = os.path.join(state_dir, "sessions.json")
+    http = resumable_upload.httpx.Client()
+    atexit.register(http.close)
+
+    def upload():
+        return resumable_upload.upload_resumable(
+            "unused", path, "video/mp4", state_path=state_path, base_url=server.base_url, http=http, retries=0
+        )
+
+    def drop_and_resume():
+        server.drop_at = DROP_AT
+        # Keep the report readable: upload_resumable prints where it resumes.
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                upload()
+            except resumable_upload.httpx.TransportError:
+                pass
+            else:
+                raise AssertionError("the upload wasn't interrupted")
+            if not os.path.exists(state_path):
+                raise AssertionError("the interrupted upload saved no session")
+            return upload()
+
+    server.keep_data = True
+    file = drop_and_resume()
+    session = server.sessions[file.name.removeprefix("files/")]
+    with open(path, "rb") as f:
+        expected = hashlib.sha256(f.read()).digest()
+    if hashlib.sha256(session["data"]).digest() != expected:
+        raise AssertionError("the resumed upload doesn't match the file")
+    server.keep_data = False
+    server.sessions.clear()
+    return drop_and_resume
+
+
+@benchmark("file_api.sdk_upload_64mib", group="file_api", repeats=3, alloc_calls=3)
+def sdk_upload():
+    genai = require("google.genai")
+    path = _random_file(FILE_BYTES)
+    server = UploadServer().__enter__()
+    atexit.register(server.__exit__, None, None, None)
+    client = genai.Client(api_key="unused", http_options={"base_url": server.base_url})
+    return lambda: client.files.upload(file=path, config={"mime_type": "video/mp4"})
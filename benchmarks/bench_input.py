@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-clip input startup of `Get_started_LiveTranslate.py`: ffmpeg versus memory-mapped PCM.
+
+Each operation opens a short 16 kHz mono WAV clip and reads its first 3200-byte
+chunk, so 1 / ops/s is the startup cost paid by every clip of a job.
+"""
+
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+
+from harness import Skip, benchmark, load_module, synthetic_pcm
+
+CHUNK_BYTES = 3200
+
+
+def _short_clip() -> str:
+    """Writes a 2 s 16 kHz mono WAV file, removed when the benchmarks exit."""
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    atexit.register(os.remove, path)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(synthetic_pcm(32000))
+    return path
+
+
+@benchmark("input.ffmpeg_first_chunk", group="input")
+def ffmpeg_first_chunk():
+    if shutil.which("ffmpeg") is None:
+        raise Skip("ffmpeg is not installed")
+    path = _short_clip()
+    # The same command `decode_audio` runs for inputs it can't memory-map.
+    command = ["ffmpeg", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", "-"]
+
+    def op():
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        process.stdout.read(CHUNK_BYTES)
+        process.terminate()
+        process.wait()
+        process.stdout.close()
+
+    return op
+
+
+@benchmark("input.mmap_first_chunk", group="input")
+def mmap_first_chunk():
+    pcm_file = load_module("quickstarts", "live_audio.pcm_file")
+    path = _short_clip()
+
+    def op():
+        with pcm_file.open_pcm(path, 16000, 1) as f:
+            next(f.chunks(CHUNK_BYTES))
+
+    return op
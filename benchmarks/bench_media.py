@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-chunk audio and video helpers of the Live API scripts and examples."""
+
+import base64
+
+from harness import Skip, benchmark, load_script, require, synthetic_pcm
+
+
+class SyntheticCamera:
+    """Stands in for `cv2.VideoCapture`, returning the same 720p BGR frame."""
+
+    def __init__(self, width=1280, height=720):
+        np = require("numpy")
+        rng = np.random.default_rng(0)
+        # Smooth gradient plus noise, so JPEG encoding does realistic work.
+        gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+        noise = rng.normal(0, 12, size=(height, width, 3))
+        self.frame = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+
+    def read(self):
+        return True, self.frame
+
+
+def _screen_grabber(method):
+    """Calls a screen capture method once, skipping when no display is available."""
+    try:
+        method()
+    except Exception as e:
+        raise Skip(f"screen capture unavailable: {e!r}") from e
+    return method
+
+
+@benchmark("live_api.capture_frame", group="video")
+def capture_frame():
+    module = load_script("quickstarts/Get_started_LiveAPI.py")
+    loop = module.AudioVideoLoop(video_mode="camera")
+    camera = SyntheticCamera()
+    return lambda: loop._capture_frame(camera)
+
+
+@benchmark("live_api.capture_screen", group="video")
+def capture_screen():
+    module = load_script("quickstarts/Get_started_LiveAPI.py")
+    loop = module.AudioVideoLoop(video_mode="screen")
+    return _screen_grabber(loop._capture_screen)
+
+
+@benchmark("websockets_live_api.get_screen", group="video")
+def get_screen():
+    module = load_script("quickstarts/websockets/Get_started_LiveAPI.py")
+    loop = module.AudioLoop(video_mode="screen")
+    return _screen_grabber(loop._get_screen)
+
+
+@benchmark("gradio_audio.encode_audio", group="audio")
+def encode_audio():
+    np = require("numpy")
+    module = load_script("examples/gradio_audio.py")
+    # 20 ms mono frame at 24 kHz, as delivered by WebRTC.
+    frame = np.frombuffer(synthetic_pcm(480, sample_rate=24000), dtype=np.int16)
+    return lambda: module.AudioProcessor.encode_audio(frame, 24000)
+
+
+@benchmark("gradio_audio.process_audio_response", group="audio")
+def process_audio_response():
+    module = load_script("examples/gradio_audio.py")
+    data = base64.b64encode(synthetic_pcm(4800, sample_rate=24000)).decode()
+    return lambda: module.AudioProcessor.process_audio_response(data)
+
+
+@benchmark("gradio_audio.process_server_content", group="audio")
+def process_server_content():
+    module = load_script("examples/gradio_audio.py")
+    handler = module.GeminiHandler()
+    # A model turn with several 200 ms inline audio parts.
+    data = base64.b64encode(synthetic_pcm(4800, sample_rate=24000)).decode()
+    content = {"parts": [{"inlineData": {"mimeType": "audio/pcm;rate=24000", "data": data}}] * 4}
+
+    def op():
+        handler.all_output_data = None
+        for _ in handler._process_server_content(content):
+            pass
+
+    return op
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Embedding cache, embedder and similarity search of `examples/retrieval/`.
+
+Searches run over 100,000 random 768-dimension vectors, the size
+gemini-embedding-001 is usually truncated to.
+
+`retrieval.batch_embedder_<count>` embeds that many passages with
+`embedder.BatchEmbedder`, against the local stand-in of `embed_server.py`
+answering each request after 10 ms. `retrieval.embed_one_per_request_200`
+embeds them one request at a time, like the notebooks.
+`retrieval.batch_embedder_titled_200` gives each passage its own title, as
+the notebooks do with the document titles.
+"""
+
+import atexit
+import shutil
+import tempfile
+
+import numpy as np
+
+from embed_server import EmbedServer
+from harness import benchmark, load_module, require
+
+ROWS = 100_000
+DIM = 768
+CACHED_TEXTS = 10_000
+EMBED_LATENCY = 0.01  # Seconds the stand-in server takes per request.
+
+
+def _vectors(rows: int, dim: int = DIM, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((rows, dim), dtype=np.float32)
+
+
+def _passages(count: int) -> list:
+    return [f"Passage {i}: " + "lorem ipsum " * 50 for i in range(count)]
+
+
+@benchmark("retrieval.legacy_stack_dot_100k", group="retrieval", alloc_calls=3)
+def legacy_stack_dot():
+    # What `find_best_passage` in Talk_to_documents_with_embeddings.ipynb runs
+    # per query, over a dataframe column holding one vector per passage.
+    column = list(_vectors(ROWS))
+    query = _vectors(1, seed=1)[0]
+    return lambda: np.argmax(np.dot(np.stack(column), query))
+
+
+@benchmark("retrieval.top_k_100k", group="retrieval", alloc_calls=3)
+def top_k():
+    search = load_module("examples", "retrieval.search")
+    matrix = _vectors(ROWS)
+    query = _vectors(1, seed=1)[0]
+    return lambda: search.top_k(matrix, query, k=5)
+
+
+@benchmark("retrieval.top_k_100k_32_queries", group="retrieval", alloc_calls=3)
+def top_k_batch():
+    search = load_module("examples", "retrieval.search")
+    matrix = _vectors(ROWS)
+    queries = _vectors(32, seed=1)
+    return lambda: search.top_k(matrix, queries, k=5)
+
+
+@benchmark("retrieval.cache_hits_10k", group="retrieval", alloc_calls=3)
+def cache_hits():
+    embedding_cache = load_module("examples", "retrieval.embedding_cache")
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory)
+    cache = embedding_cache.EmbeddingCache(directory, model="gemini-embedding-001", task_type="RETRIEVAL_DOCUMENT")
+    texts = _passages(CACHED_TEXTS)
+    cache.get_or_embed(texts, lambda texts: _vectors(len(texts)))
+
+    # A re-run over the same passages: hash and look up every one, embed none.
+    def op():
+        return cache.get_or_embed(texts, embed=None)
+
+    return op
+
+
+def _embed_client(genai):
+    server = EmbedServer(latency=EMBED_LATENCY).__enter__()
+    atexit.register(server.__exit__, None, None, None)
+    return genai.Client(api_key="unused", http_options={"base_url": server.base_url})
+
+
+@benchmark("retrieval.embed_one_per_request_200", group="retrieval", repeats=3, alloc_calls=1)
+def embed_one_per_request():
+    genai = require("google.genai")
+    client = _embed_client(genai)
+    texts = _passages(200)
+    # `embed_fn` of Talk_to_documents_with_embeddings.ipynb, applied to each row.
+    return lambda: [
+        client.models.embed_content(model="gemini-embedding-001", contents=text).embeddings[0].values
+        for text in texts
+    ]
+
+
+for _count in (200, 2000):
+    @benchmark(f"retrieval.batch_embedder_{_count}", group="retrieval", repeats=3, alloc_calls=1)
+    def batch_embedder(count=_count):
+        genai = require("google.genai")
+        embedder = load_module("examples", "retrieval.embedder")
+        client = _embed_client(genai)
+        texts = _passages(count)
+        batch_embedder = embedder.BatchEmbedder(client, model="gemini-embedding-001")
+        return lambda: batch_embedder.embed(texts)
+
+
+@benchmark("retrieval.batch_embedder_titled_200", group="retrieval", repeats=3, alloc_calls=1)
+def batch_embedder_titled():
+    genai = require("google.genai")
+    embedder = load_module("examples", "retrieval.embedder")
+    client = _embed_client(genai)
+    texts = _passages(200)
+    titles = [f"Document {i}" for i in range(len(texts))]
+    batch_embedder = embedder.BatchEmbedder(client, model="gemini-embedding-001", task_type="RETRIEVAL_DOCUMENT")
+    return lambda: batch_embedder.embed(texts, titles)
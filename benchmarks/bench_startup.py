@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Startup time of the Live API scripts, for each `--mode`.
+
+Each operation starts a fresh interpreter that imports the script and creates
+its loop for the mode, which is where the capture dependencies get imported.
+Connecting and opening the audio devices happen later, in `run()`, and aren't
+measured.
+"""
+
+import os
+import subprocess
+import sys
+
+from harness import REPO_ROOT, Skip, benchmark
+
+STARTUP_CODE = """
+import importlib.util, os, sys
+path, mode = sys.argv[1], sys.argv[2]
+sys.path.insert(0, os.path.dirname(path))
+spec = importlib.util.spec_from_file_location("script", path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+loop_class = getattr(module, "AudioVideoLoop", None) or module.AudioLoop
+loop_class(video_mode=mode)
+"""
+
+
+def startup(relative_path: str, mode: str):
+    command = [sys.executable, "-c", STARTUP_CODE, str(REPO_ROOT / relative_path), mode]
+    # Importing the scripts doesn't need a real key, the websockets one reads it in run().
+    env = {**os.environ, "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "unused")}
+    process = subprocess.run(command, env=env, capture_output=True, text=True)
+    if process.returncode:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else process.returncode
+        raise Skip(f"cannot start {relative_path} --mode {mode}: {error}")
+    return lambda: subprocess.run(command, env=env, check=True, capture_output=True)
+
+
+for _name, _path in (
+    ("live_api", "quickstarts/Get_started_LiveAPI.py"),
+    ("websockets_live_api", "quickstarts/websockets/Get_started_LiveAPI.py"),
+):
+    for _mode in ("none", "camera", "screen"):
+        benchmark(f"startup.{_name}_{_mode}", group="startup", repeats=3, alloc_calls=1)(
+            lambda path=_path, mode=_mode: startup(path, mode)
+        )
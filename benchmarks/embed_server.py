@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local stand-in for the `embed_content` endpoint.
+
+It answers `batchEmbedContents` requests after `latency` seconds, with a
+vector per text derived from its length, so the number of round trips a
+client makes can be measured without the network:
+
+```
+with EmbedServer(latency=0.01) as server:
+    client = genai.Client(api_key="unused", http_options={"base_url": server.base_url})
+```
+
+Run it directly to serve on port 8081.
+"""
+
+import http.server
+import json
+import threading
+import time
+
+DEFAULT_DIM = 768
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not self.path.endswith(":batchEmbedContents"):
+            self._reply(404, {"error": {"code": 404, "message": f"{self.path} not found", "status": "NOT_FOUND"}})
+            return
+        requests = body["requests"]
+        with server.lock:
+            server.requests += 1
+            server.texts += len(requests)
+        time.sleep(server.latency)
+        embeddings = []
+        for request in requests:
+            dim = request.get("outputDimensionality", DEFAULT_DIM)
+            text = request["content"]["parts"][0]["text"]
+            embeddings.append({"values": [len(text) / 1000] * dim})
+        self._reply(200, {"embeddings": embeddings})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class EmbedServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server_port}"
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.texts = 0
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    server = EmbedServer(port=8081)
+    print(f"[Info] Serving embeddings at {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Minimal benchmark harness used by `run_benchmarks.py`.
+
+A benchmark is a setup function decorated with `@benchmark(...)`. The setup
+prepares its synthetic input and returns a zero-argument callable, which is
+the operation being measured. Setups raise `Skip` when the code under test
+can't run in the current environment (missing optional dependency, no
+display, ...).
+"""
+
+import array
+import dataclasses
+import importlib
+import importlib.util
+import math
+import pathlib
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup when it can't run in this environment."""
+
+
+@dataclasses.dataclass
+class Benchmark:
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], object]]
+    repeats: int = 5
+    alloc_calls: int = 20
+
+
+@dataclasses.dataclass
+class Result:
+    name: str
+    group: str
+    ops_per_sec: float = 0.0
+    peak_alloc_bytes: int = 0
+    iterations: int = 0
+    skipped: Optional[str] = None
+    note: str = ""  # Context printed with the result, e.g. the recall of an approximate search.
+
+
+REGISTRY: list[Benchmark] = []
+
+
+def benchmark(name: str, group: str = "default", repeats: int = 5, alloc_calls: int = 20):
+    """Registers a benchmark setup function under `name`.
+
+    Operations taking seconds can lower `repeats` and `alloc_calls`, the
+    number of timed runs and of calls traced for allocations.
+    """
+    def decorator(setup):
+        REGISTRY.append(Benchmark(name=name, group=group, setup=setup, repeats=repeats, alloc_calls=alloc_calls))
+        return setup
+    return decorator
+
+
+def require(module_name: str):
+    """Imports `module_name`, or skips the benchmark if it isn't installed."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise Skip(f"{module_name} is not installed") from e
+
+
+def load_module(directory: str, module_name: str):
+    """Imports a helper module (e.g. "live_audio.dsp") living in a cookbook folder."""
+    path = str(REPO_ROOT / directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise Skip(f"cannot import {module_name}: {e!r}") from e
+
+
+def load_script(relative_path: str):
+    """Imports a cookbook script (e.g. "quickstarts/Get_started_LiveAPI.py") by path.
+
+    The scripts aren't packages and several share a file name, so each one is
+    registered under a name derived from its path. The script's directory is
+    added to `sys.path` so sibling helper modules resolve like they do when
+    the script is run directly.
+    """
+    path = REPO_ROOT / relative_path
+    module_name = "cookbook_" + relative_path.removesuffix(".py").replace("/", "_").replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        # Missing dependencies, API keys or audio devices all surface here.
+        raise Skip(f"cannot import {relative_path}: {e!r}") from e
+    sys.modules[module_name] = module
+    return module
+
+
+def synthetic_pcm(num_samples: int, sample_rate: int = 16000, channels: int = 1, seed: int = 0) -> bytes:
+    """Returns 16-bit little-endian PCM: a 440 Hz tone with some noise on top."""
+    rng = random.Random(seed)
+    samples = array.array("h", bytes(2 * num_samples * channels))
+    for i in range(num_samples):
+        value = 0.5 * math.sin(2 * math.pi * 440 * i / sample_rate) + 0.1 * (rng.random() - 0.5)
+        for c in range(channels):
+            samples[i * channels + c] = int(value * 32767)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def measure(op: Callable[[], object], min_time: float = 0.5, repeats: int = 5, alloc_calls: int = 20) -> tuple[float, int, int]:
+    """Times `op` and records its peak allocation.
+
+    Returns (ops_per_sec, peak_alloc_bytes, iterations). Throughput is the
+    median over `repeats` runs, each long enough to take roughly
+    `min_time / repeats` seconds. Allocations are measured separately with
+    tracemalloc since tracing slows the interpreter down.
+    """
+    op()  # Warm up caches and lazy imports.
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeats:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / repeats / elapsed) + 1))
+
+    rates = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        rates.append(number / (time.perf_counter() - start))
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_calls):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            op()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    return statistics.median(rates), int(statistics.median(peaks)), number * (repeats + 1)
+
+
+def run(bench: Benchmark, min_time: float = 0.5) -> Result:
+    result = Result(name=bench.name, group=bench.group)
+    try:
+        op = bench.setup()
+    except Skip as e:
+        result.skipped = str(e)
+        return result
+    result.ops_per_sec, result.peak_alloc_bytes, result.iterations = measure(
+        op, min_time=min_time, repeats=bench.repeats, alloc_calls=bench.alloc_calls
+    )
+    # Setups can attach a `note` attribute to the operation they return.
+    result.note = getattr(op, "note", "")
+    return result
+
+
+def compare(results: list[Result], baseline: dict, tolerance: float) -> list[str]:
+    """Returns a message for each result that regressed against `baseline`.
+
+    Throughput regresses when it drops by more than `tolerance` (a fraction),
+    allocations when they grow by more than `tolerance` and at least 1 KiB.
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if result.skipped or not reference:
+            continue
+        if result.ops_per_sec < reference["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: {result.ops_per_sec:,.0f} ops/s vs {reference['ops_per_sec']:,.0f} ops/s baseline"
+            )
+        allowed = max(reference["peak_alloc_bytes"] * (1 + tolerance), reference["peak_alloc_bytes"] + 1024)
+        if result.peak_alloc_bytes > allowed:
+            regressions.append(
+                f"{result.name}: {result.peak_alloc_bytes:,} B peak vs {reference['peak_alloc_bytes']:,} B baseline"
+            )
+    return regressions
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+## Run
+
+Run every benchmark and compare against the stored baseline (if any):
+
+```
+python benchmarks/run_benchmarks.py
+```
+
+Only run the benchmarks whose name contains a substring:
+
+```
+python benchmarks/run_benchmarks.py -k dsp
+```
+
+Record the current numbers as the new baseline:
+
+```
+python benchmarks/run_benchmarks.py --save-baseline
+```
+
+The script exits with status 1 when a benchmark regresses by more than
+`--tolerance` against the baseline, so it can gate a deployment. No baseline
+is committed, since the numbers depend on the machine: record one where the
+gate runs. With `--require-baseline`, a missing baseline fails with status 2
+instead of passing.
+"""
+
+import argparse
+import importlib
+import json
+import pathlib
+import platform
+import sys
+
+import harness
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+
+def load_benchmarks():
+    """Imports every `bench_*.py` module so its benchmarks get registered."""
+    for path in sorted(BENCH_DIR.glob("bench_*.py")):
+        importlib.import_module(path.stem)
+    return harness.REGISTRY
+
+
+def print_result(result, reference):
+    if result.skipped:
+        print(f"{result.name:<45} skipped: {result.skipped}")
+        return
+    line = f"{result.name:<45} {result.ops_per_sec:>14,.1f} ops/s {result.peak_alloc_bytes:>12,} B peak"
+    if reference:
+        change = result.ops_per_sec / reference["ops_per_sec"] - 1
+        line += f"  ({change:+.1%} vs baseline)"
+    if result.note:
+        line += f"  {result.note}"
+    print(line, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the cookbook hot-path benchmarks")
+    parser.add_argument("-k", dest="keyword", default="", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--baseline", type=pathlib.Path, default=DEFAULT_BASELINE, help="Baseline JSON file (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file instead of comparing")
+    parser.add_argument("--require-baseline", action="store_true", help="Fail when there is no baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional regression before failing (default: 0.2)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each benchmark (default: 0.5)")
+    parser.add_argument("--json", type=pathlib.Path, help="Also write the raw results to this file")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())["benchmarks"]
+
+    results = []
+    for bench in load_benchmarks():
+        if args.keyword not in bench.name:
+            continue
+        result = harness.run(bench, min_time=args.min_time)
+        print_result(result, baseline.get(result.name))
+        results.append(result)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "benchmarks": {
+            r.name: {"ops_per_sec": r.ops_per_sec, "peak_alloc_bytes": r.peak_alloc_bytes, "iterations": r.iterations}
+            for r in results
+            if not r.skipped
+        },
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            # Keep entries for benchmarks that were filtered out or skipped this time.
+            previous = json.loads(args.baseline.read_text())["benchmarks"]
+            report["benchmarks"] = {**previous, **report["benchmarks"]}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nSaved baseline for {len(report['benchmarks'])} benchmarks to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline to create one.")
+        return 2 if args.require_baseline else 0
+
+    regressions = harness.compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
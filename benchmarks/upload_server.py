@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local stand-in for the File API resumable upload endpoint.
+
+It implements the start, upload, query and finalize commands of the protocol
+`file-api/resumable_upload.py` speaks, and throws the bytes away, so uploads
+can be measured (or interrupted) without the network:
+
+```
+with UploadServer(drop_at=10 << 20) as server:
+    upload_resumable("unused", path, "video/mp4", base_url=server.base_url)
+```
+
+`drop_at` closes the connection once, in the middle of the chunk containing
+that offset, like a dropped connection would. Only whole multiples of
+`GRANULARITY` bytes of a cut chunk are kept, like the real service. With
+`keep_data`, the bytes each session kept are stored in its `"data"`, so an
+interrupted and resumed upload can be checked against the file.
+
+Run it directly to serve on port 8080.
+"""
+
+import http.server
+import itertools
+import json
+import threading
+
+GRANULARITY = 256 << 10
+READ_BYTES = 1 << 20
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # The finalize reply's body would otherwise wait for the ACK of its headers.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        command = self.headers.get("X-Goog-Upload-Command", "")
+        if self.path.startswith("/upload/v1beta/files") and command == "start":
+            metadata = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            session_id = str(next(server.ids))
+            server.sessions[session_id] = {
+                "received": 0,
+                "size": int(self.headers["X-Goog-Upload-Header-Content-Length"]),
+                "mime_type": self.headers.get("X-Goog-Upload-Header-Content-Type"),
+                "display_name": metadata.get("file", {}).get("display_name"),
+                "data": bytearray() if server.keep_data else None,
+            }
+            self._reply(200, {
+                "X-Goog-Upload-Status": "active",
+                "X-Goog-Upload-URL": f"{server.base_url}/upload/session/{session_id}",
+                "X-Goog-Upload-Chunk-Granularity": str(GRANULARITY),
+            })
+            return
+
+        session_id = self.path.rsplit("/", 1)[-1]
+        session = server.sessions.get(session_id)
+        if session is None:
+            self._reply(404)
+            return
+        if command == "query":
+            if session["received"] == session["size"] and session.get("final"):
+                self._reply(200, {"X-Goog-Upload-Status": "final"}, self._file(session_id, session))
+            else:
+                self._reply(200, {
+                    "X-Goog-Upload-Status": "active",
+                    "X-Goog-Upload-Size-Received": str(session["received"]),
+                })
+            return
+
+        length = int(self.headers["Content-Length"])
+        offset = int(self.headers["X-Goog-Upload-Offset"])
+        if offset != session["received"]:
+            self.rfile.read(length)
+            self._reply(400)
+            return
+        drop = server.drop_at is not None and offset <= server.drop_at < offset + length
+        to_read = server.drop_at - offset if drop else length
+        read = 0
+        while read < to_read:
+            data = self.rfile.read(min(READ_BYTES, to_read - read))
+            if not data:
+                break
+            read += len(data)
+            server.bytes_received += len(data)
+            if session["data"] is not None:
+                session["data"] += data
+        if drop:
+            server.drop_at = None
+        if read < length:
+            # Dropped by us, or by the client.
+            session["received"] = offset + read // GRANULARITY * GRANULARITY
+            if session["data"] is not None:
+                del session["data"][session["received"]:]
+            self.close_connection = True
+            return
+        session["received"] = offset + length
+        if "finalize" in command:
+            session["final"] = True
+            self._reply(200, {"X-Goog-Upload-Status": "final"}, self._file(session_id, session))
+        else:
+            self._reply(200, {"X-Goog-Upload-Status": "active"})
+
+    @staticmethod
+    def _file(session_id, session) -> dict:
+        return {"file": {
+            "name": f"files/{session_id}",
+            "displayName": session["display_name"],
+            "mimeType": session["mime_type"],
+            "sizeBytes": str(session["size"]),
+            "state": "ACTIVE",
+        }}
+
+    def _reply(self, status, headers=None, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class UploadServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, drop_at: int = None, keep_data: bool = False):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server_port}"
+        self.drop_at = drop_at
+        self.keep_data = keep_data
+        self.sessions = {}
+        self.ids = itertools.count()
+        self.bytes_received = 0
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    server = UploadServer(port=8080)
+    print(f"[Info] Serving uploads at {server.base_url}")
+    server.serve_forever()
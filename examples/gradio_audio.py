@@ -258,7 +258,8 @@ def registry(
     return interface
 
 # Launch the Gradio interface
-gr.load(
-    name="gemini-3.5-flash-lite",
-    src=registry,
-).launch()
+if __name__ == "__main__":
+    gr.load(
+        name="gemini-3.5-flash-lite",
+        src=registry,
+    ).launch()
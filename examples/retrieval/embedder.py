@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Embeds many texts with few requests.
+
+`embed_content` accepts a list of texts, but the embeddings notebooks send one
+text per request. `BatchEmbedder` packs the texts into requests of at most
+`max_items` texts and `max_tokens` tokens, sends `concurrency` requests at a
+time, no more than `requests_per_minute`, and returns the vectors in input
+order as one float32 array:
+
+```
+embedder = BatchEmbedder(client, model="gemini-embedding-001", task_type="RETRIEVAL_DOCUMENT")
+vectors = embedder.embed(df["Text"])
+```
+
+Tokens are estimated from the text length, without a `count_tokens` request
+per text. Rate limiting (429) and server errors are retried with a jittered
+exponential backoff.
+
+`embed_content` sends a single title for all the texts of a request. Texts
+with titles of their own, e.g. one per passage, are sent in
+`batchEmbedContents` requests giving each text its title instead, through the
+client's connection. Vertex AI has no `batchEmbedContents`: there, texts with
+different titles are sent in different requests.
+
+`embedder.embed(texts, titles)` is also the `embed` argument
+`EmbeddingCache.get_or_embed` expects.
+"""
+
+import concurrent.futures
+import json
+import random
+import threading
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+from google.genai import errors, types
+
+MAX_ITEMS = 100  # Texts per batchEmbedContents request.
+MAX_TOKENS = 20_000  # Estimated tokens per request.
+CHARS_PER_TOKEN = 4  # A rough average for English text, on the safe side.
+# The same policy as quickstarts/file-api/retry.py. This folder is meant to be
+# copied next to a notebook on its own, so it doesn't import it.
+RETRYABLE_CODES = frozenset({408, 429, 500, 502, 503, 504})
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def backoff(attempt: int) -> float:
+    """A random delay up to a bound doubling with each failed `attempt` ("full jitter")."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2**attempt))
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def pack(texts: list, max_items: int = MAX_ITEMS, max_tokens: int = MAX_TOKENS, titles: Optional[list] = None) -> list:
+    """Groups the positions of `texts` into batches that fit in one request each.
+
+    Texts are kept in input order within a batch and, given `titles`, only
+    share a batch with texts of the same title. A text over `max_tokens` gets
+    a batch of its own.
+    """
+    batches = []
+    open_batches = {}  # title -> [positions, tokens] of the batch being filled.
+    for position, text in enumerate(texts):
+        title = titles[position] if titles else None
+        tokens = estimate_tokens(text)
+        batch = open_batches.get(title)
+        if batch is None or len(batch[0]) == max_items or batch[1] + tokens > max_tokens:
+            batch = open_batches[title] = [[], 0]
+            batches.append(batch[0])
+        batch[0].append(position)
+        batch[1] += tokens
+    return batches
+
+
+class RateLimiter:
+    """Spaces calls out to at most `per_minute` a minute, across threads."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(start - now)
+
+
+class BatchEmbedder:
+    """Embeds texts in packed, concurrent `embed_content` requests."""
+
+    def __init__(
+        self,
+        client,
+        model: str = "gemini-embedding-001",
+        task_type: Optional[str] = None,
+        output_dimensionality: Optional[int] = None,
+        max_items: int = MAX_ITEMS,
+        max_tokens: int = MAX_TOKENS,
+        concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        retries: int = 4,
+    ):
+        self.client = client
+        self.model = model
+        self.task_type = task_type
+        self.output_dimensionality = output_dimensionality
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.concurrency = concurrency
+        self.retries = retries
+        self._limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+
+        self.requests = 0
+        self.retried = 0
+        self.texts = 0
+        self.seconds = 0.0
+
+    def embed(self, texts: Iterable[str], titles: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Returns a (len(texts), dimensions) float32 array, in the order of `texts`."""
+        start = time.perf_counter()
+        texts = list(texts)
+        titles = list(titles) if titles is not None else None
+        # Only Vertex AI needs a request per title.
+        batches = pack(texts, self.max_items, self.max_tokens, titles if self.client.vertexai else None)
+        vectors = np.empty((len(texts), self.output_dimensionality or 0), dtype=np.float32)
+
+        with concurrent.futures.ThreadPoolExecutor(self.concurrency) as pool:
+            futures = {
+                pool.submit(
+                    self._embed_batch, [texts[i] for i in batch], [titles[i] for i in batch] if titles else None
+                ): batch
+                for batch in batches
+            }
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    batch_vectors = future.result()
+                    if vectors.shape[1] != batch_vectors.shape[1]:
+                        # The model's default dimensionality, known from the first response.
+                        vectors = np.empty((len(texts), batch_vectors.shape[1]), dtype=np.float32)
+                    vectors[futures[future]] = batch_vectors
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        self.texts += len(texts)
+        self.seconds += time.perf_counter() - start
+        return vectors
+
+    __call__ = embed
+
+    def status(self) -> str:
+        return (
+            f"{self.texts} texts in {self.requests} requests ({self.retried} retried), "
+            f"{self.texts / max(self.seconds, 1e-9):.1f} texts/s"
+        )
+
+    def _embed_batch(self, texts: list, titles: Optional[list]) -> np.ndarray:
+        request = self._request_titled if titles and len(set(titles)) > 1 else self._request
+        for attempt in range(self.retries + 1):
+            if self._limiter:
+                self._limiter.wait()
+            try:
+                vectors = request(texts, titles)
+                break
+            except errors.APIError as e:
+                if attempt == self.retries or e.code not in RETRYABLE_CODES:
+                    raise
+                self.retried += 1
+                time.sleep(backoff(attempt))
+        self.requests += 1
+        return np.array(vectors, dtype=np.float32)
+
+    def _request(self, texts: list, titles: Optional[list]) -> list:
+        config = types.EmbedContentConfig(
+            task_type=self.task_type,
+            title=titles[0] if titles else None,
+            output_dimensionality=self.output_dimensionality,
+        )
+        response = self.client.models.embed_content(model=self.model, contents=texts, config=config)
+        return [embedding.values for embedding in response.embeddings]
+
+    def _request_titled(self, texts: list, titles: list) -> list:
+        """Sends a `batchEmbedContents` request with a title per text, which `embed_content` can't."""
+        model = self.model if "/" in self.model else f"models/{self.model}"
+        requests = []
+        for text, title in zip(texts, titles):
+            request = {"model": model, "content": {"parts": [{"text": text}]}}
+            if title is not None:
+                request["title"] = title
+            if self.task_type:
+                request["taskType"] = self.task_type
+            if self.output_dimensionality:
+                request["outputDimensionality"] = self.output_dimensionality
+            requests.append(request)
+        # The SDK client's connection, with its API key, base URL and errors.
+        response = self.client._api_client.request("post", f"{model}:batchEmbedContents", {"requests": requests})
+        return [embedding["values"] for embedding in json.loads(response.body)["embeddings"]]
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Keeps embeddings on disk, keyed by the content they embed.
+
+Embedding every passage again each time a notebook runs costs one request per
+passage. `EmbeddingCache` stores the vectors it has seen in a float32 matrix
+file, memory-mapped on load, with the SHA-256 of each passage (and title) in an
+index next to it, so a re-run only embeds the passages that changed:
+
+```
+cache = EmbeddingCache("embeddings", model="gemini-embedding-001", task_type="RETRIEVAL_DOCUMENT")
+rows = cache.get_or_embed(df["Text"], embed, titles=df["Title"])
+df["Embeddings"] = list(cache.matrix[rows])
+```
+
+`embed(texts)`, or `embed(texts, titles)` when titles are given, returns one
+vector per text, e.g. with `client.models.embed_content` or
+`embedder.BatchEmbedder`. The vectors of a cache all come from the same model,
+task type and dimensionality, which are checked when it is opened again.
+
+The files are only appended to: the vectors first, then their keys, so a run
+interrupted in between loses at most the vectors whose keys weren't written.
+"""
+
+import hashlib
+import json
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+
+KEY_BYTES = 32  # SHA-256 digest.
+VECTORS_FILE = "vectors.f32"
+KEYS_FILE = "keys.bin"
+META_FILE = "meta.json"
+
+
+def content_key(text: str, title: Optional[str] = None) -> bytes:
+    """The cache key of a passage: the SHA-256 of its title and text."""
+    digest = hashlib.sha256()
+    if title is not None:
+        digest.update(title.encode())
+    # The separator keeps ("ab", "c") and ("a", "bc") apart.
+    digest.update(b"\0")
+    digest.update(text.encode())
+    return digest.digest()
+
+
+class EmbeddingCache:
+    """An on-disk float32 matrix of embeddings, and the index from content keys to its rows."""
+
+    def __init__(self, directory, model: str, task_type: Optional[str] = None, dim: Optional[int] = None):
+        self.directory = directory
+        self.model = model
+        self.task_type = task_type
+        self.dim = dim
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, VECTORS_FILE)
+        self._keys_path = os.path.join(directory, KEYS_FILE)
+        self._matrix = None
+
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if (meta["model"], meta["task_type"]) != (model, task_type) or dim not in (None, meta["dim"]):
+                raise ValueError(
+                    f"{directory} caches {meta['model']} {meta['task_type']} embeddings of {meta['dim']} dimensions"
+                )
+            self.dim = meta["dim"]
+        self._meta_path = meta_path
+
+        self._index = {}
+        self.rows = 0
+        if self.dim:
+            self._load()
+
+    def _load(self):
+        vector_bytes = 4 * self.dim
+        vectors_size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        keys_size = os.path.getsize(self._keys_path) if os.path.exists(self._keys_path) else 0
+        self.rows = min(vectors_size // vector_bytes, keys_size // KEY_BYTES)
+        # Drop whatever an interrupted append left behind.
+        if vectors_size != self.rows * vector_bytes:
+            os.truncate(self._vectors_path, self.rows * vector_bytes)
+        if keys_size != self.rows * KEY_BYTES:
+            os.truncate(self._keys_path, self.rows * KEY_BYTES)
+        if self.rows:
+            with open(self._keys_path, "rb") as f:
+                keys = f.read()
+            self._index = {keys[i:i + KEY_BYTES]: row for row, i in enumerate(range(0, len(keys), KEY_BYTES))}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._index
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The cached vectors, one row each, memory-mapped read-only."""
+        if self._matrix is None or len(self._matrix) != self.rows:
+            if not self.rows:
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+        return self._matrix
+
+    def lookup(self, keys: Iterable[bytes]) -> np.ndarray:
+        """Returns the row of each key, or -1 for the keys that aren't cached."""
+        index = self._index
+        return np.fromiter((index.get(key, -1) for key in keys), dtype=np.int64)
+
+    def add(self, keys: list, vectors) -> np.ndarray:
+        """Appends vectors under their keys, and returns their rows."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(keys):
+            raise ValueError(f"expected {len(keys)} vectors, got an array of shape {vectors.shape}")
+        if not self.dim:
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"expected vectors of {self.dim} dimensions, got {vectors.shape[1]}")
+        if not os.path.exists(self._meta_path):
+            with open(self._meta_path, "w") as f:
+                json.dump({"model": self.model, "task_type": self.task_type, "dim": self.dim}, f)
+
+        with open(self._vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self._keys_path, "ab") as f:
+            f.write(b"".join(keys))
+        rows = np.arange(self.rows, self.rows + len(keys))
+        self._index.update(zip(keys, rows.tolist()))
+        self.rows += len(keys)
+        return rows
+
+    def get_or_embed(self, texts: Iterable[str], embed, titles: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Returns the rows of `matrix` holding the embedding of each text, embedding the new ones."""
+        texts = list(texts)
+        titles = list(titles) if titles is not None else None
+        keys = [content_key(text, titles[i] if titles else None) for i, text in enumerate(texts)]
+        rows = self.lookup(keys)
+
+        missing = {}  # key -> position of its first text, so duplicates are embedded once.
+        for position in np.flatnonzero(rows < 0).tolist():
+            missing.setdefault(keys[position], position)
+        if missing:
+            positions = list(missing.values())
+            new_texts = [texts[i] for i in positions]
+            if titles:
+                vectors = embed(new_texts, [titles[i] for i in positions])
+            else:
+                vectors = embed(new_texts)
+            self.add(list(missing), vectors)
+            rows = self.lookup(keys)
+        return rows
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exact top-k search by dot product.
+
+The embeddings examples stack a list of vectors and take the `np.argmax` of
+their dot products with the query, for every query. `top_k` works on the
+matrix directly (including a memory-mapped `EmbeddingCache.matrix`), scores
+a batch of queries with one matrix product per block of rows, and keeps the
+best `k` of each block with `np.argpartition` instead of sorting all of them:
+
+```
+scores, rows = top_k(cache.matrix, query_vector, k=3)
+```
+
+Blocks bound the memory used for scores, so millions of rows can be searched
+without holding a score for each of them for every query.
+"""
+
+import numpy as np
+
+BLOCK_ROWS = 65536
+
+
+def top_k(matrix, queries, k: int = 5, block_rows: int = BLOCK_ROWS):
+    """Returns the scores and rows of the `k` rows of `matrix` closest to each query, best first.
+
+    `queries` is one vector, or a (queries, dim) array. The results are (k,)
+    arrays for one vector, (queries, k) arrays otherwise. Rows are compared
+    by dot product, which is the cosine similarity for normalized vectors.
+    `k` = 0 returns empty results.
+    """
+    if k < 0:
+        raise ValueError(f"k must be at least 0, got {k}")
+    queries = np.asarray(queries, dtype=np.float32)
+    single = queries.ndim == 1
+    queries = np.atleast_2d(queries)
+    k = min(k, len(matrix))
+
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    best_rows = np.empty((len(queries), 0), dtype=np.int64)
+    # With k = 0 there's nothing to score, and `[:, -0:]` below would keep every column.
+    for start in range(0, len(matrix) if k else 0, block_rows):
+        block = np.asarray(matrix[start:start + block_rows], dtype=np.float32)
+        scores = queries @ block.T
+        if scores.shape[1] > k:
+            # The best k of this block, before merging with the previous ones.
+            rows = np.argpartition(scores, -k, axis=1)[:, -k:]
+            scores = np.take_along_axis(scores, rows, axis=1)
+            rows += start
+        else:
+            rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+        # Candidates: the best of the previous blocks, and of this one.
+        scores = np.concatenate((best_scores, scores), axis=1)
+        rows = np.concatenate((best_rows, rows), axis=1)
+        if scores.shape[1] > k:
+            keep = np.argpartition(scores, -k, axis=1)[:, -k:]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            rows = np.take_along_axis(rows, keep, axis=1)
+        best_scores, best_rows = scores, rows
+
+    order = np.argsort(-best_scores, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_rows = np.take_along_axis(best_rows, order, axis=1)
+    if single:
+        return best_scores[0], best_rows[0]
+    return best_scores, best_rows
+
+
+def normalize(vectors) -> np.ndarray:
+    """Scales vectors to unit length, so that dot products are cosine similarities.
+
+    gemini-embedding-001 vectors of fewer than 3072 dimensions aren't normalized.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
@@ -28,6 +28,11 @@ variable is set to the api-key you obtained from Google AI Studio.
 Important: **Use headphones**. This script uses the system default audio
 input and output, which often won't include echo cancellation. So to prevent
 the model from interrupting itself it is important that you use headphones. 
+Without headphones, add `--aec` to cancel the echo in software instead (this
+also needs `pip install numpy`).
+
+Only the packages of the `--mode` you pick are needed: opencv-python and
+pillow for "camera", mss and pillow for "screen".
 
 ## Run
 
@@ -43,23 +48,35 @@ The default is "camera". To share your screen run:
 ```
 python Get_started_LiveAPI.py --mode screen
 ```
+
+With `--aec`, the echo reduction (ERLE) and the CPU time the echo canceller
+used are printed on exit.
+
+When you interrupt the model, the script prints how long playback took to go
+silent after the interruption reached it (the barge-in latency).
 """
 
 import asyncio
 import io
 import os
+import statistics
 import sys
+import threading
+import time
 import traceback
 import argparse
 
-import cv2
 import pyaudio
-import PIL.Image
-import mss
 
 from google import genai
 from google.genai import types
 
+# Capture dependencies take a while to import, so they're only imported for
+# the video mode that needs them, see `import_video_modules()`.
+cv2 = None
+mss = None
+PIL = None
+
 if sys.version_info < (3, 11, 0):
     import taskgroup, exceptiongroup
 
@@ -72,16 +89,18 @@ CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
 CHUNK_SIZE = 1024
+# Playback is written in slices this long (20 ms), so that an interruption can
+# stop it between two of them, with a device buffer of the same size: stopping
+# plays that buffer out, so it bounds how long playback runs on.
+PLAYBACK_SLICE_FRAMES = 480
+# Interruption-to-silence time to aim for.
+BARGE_IN_TARGET_SECONDS = 0.05
 
 # --- Model Configuration ---
 MODEL = "gemini-3.1-flash-live-preview"
 DEFAULT_MODE = "camera"
 
 
-client = genai.Client(
-    api_key=os.environ.get("GOOGLE_API_KEY"),
-)
-
 # Live session configuration
 # Trigger tokens sent so that model does not hallucinate in long conversations
 # Sliding window to retain the context within the context window limit
@@ -101,12 +120,23 @@ CONFIG = types.LiveConnectConfig(
     ),
 )
 
-pya = pyaudio.PyAudio()
+def import_video_modules(video_mode):
+    """Imports what capturing frames in `video_mode` needs."""
+    global cv2, mss, PIL
+    if video_mode == "camera":
+        import cv2
+        import PIL.Image
+    elif video_mode == "screen":
+        import mss
+        import PIL.Image
 
 
 class AudioVideoLoop:
-    def __init__(self, video_mode=DEFAULT_MODE):
+    def __init__(self, video_mode=DEFAULT_MODE, echo_canceller=None):
         self.video_mode = video_mode
+        import_video_modules(video_mode)
+        self.pya = None  # Opening the audio devices, created by run().
+        self.echo_canceller = echo_canceller
 
         self.audio_in_queue = asyncio.Queue()
         self.out_queue = asyncio.Queue(maxsize = 5) # Limit size to avoid excess memory use
@@ -114,12 +144,17 @@ class AudioVideoLoop:
         self.session = None
         self.audio_stream = None
 
+        self.writing = False  # A chunk is being written to the output stream.
+        self.playback_interrupted = threading.Event()
+        self.interrupted_at = None  # When the last interruption came in.
+        self.barge_in_latencies = []  # Seconds from each interruption to silence.
+
     # --- Audio Handling ---
 
     async def listen_audio(self):
-        mic_info = pya.get_default_input_device_info()
+        mic_info = self.pya.get_default_input_device_info()
         self.audio_stream = await asyncio.to_thread(
-            pya.open,
+            self.pya.open,
             format=FORMAT,
             channels=CHANNELS,
             rate=SEND_SAMPLE_RATE,
@@ -135,6 +170,8 @@ class AudioVideoLoop:
         try:
             while True:
                 data = await asyncio.to_thread(self.audio_stream.read, CHUNK_SIZE, **kwargs)
+                if self.echo_canceller:
+                    data = self.echo_canceller.process(data)
                 payload = {
                     "data": data,
                     "mime_type": "audio/pcm;rate=16000"
@@ -154,18 +191,44 @@ class AudioVideoLoop:
                 self.audio_stream.stop_stream()
                 self.audio_stream.close()
 
+    def _write_slices(self, stream, bytestream):
+        """Writes a chunk one slice at a time, until it's done or playback is interrupted."""
+        view = memoryview(bytestream)
+        step = PLAYBACK_SLICE_FRAMES * CHANNELS * pyaudio.get_sample_size(FORMAT)
+        for start in range(0, len(view), step):
+            if self.playback_interrupted.is_set():
+                return
+            stream.write(view[start:start + step])
+
     async def play_audio(self):
         stream = await asyncio.to_thread(
-            pya.open,
+            self.pya.open,
             format=FORMAT,
             channels=CHANNELS,
             rate=RECEIVE_SAMPLE_RATE,
             output=True,
+            frames_per_buffer=PLAYBACK_SLICE_FRAMES,
         )
         try:
             while True:
                 bytestream = await self.audio_in_queue.get()
-                await asyncio.to_thread(stream.write, bytestream)
+                if self.echo_canceller:
+                    # The microphone will hear this, resampled to its rate, from now on.
+                    self.echo_canceller.add_reference(bytestream)
+                self.writing = True
+                try:
+                    await asyncio.to_thread(self._write_slices, stream, bytestream)
+                finally:
+                    self.writing = False
+                if self.playback_interrupted.is_set():
+                    # stop_stream plays out what's left in the device buffer
+                    # (PyAudio can't abort a stream), which is why that buffer
+                    # is a single slice: its drain time is part of the measured
+                    # barge-in latency. Then get ready to play the next turn.
+                    await asyncio.to_thread(stream.stop_stream)
+                    self.on_silence()
+                    self.playback_interrupted.clear()
+                    await asyncio.to_thread(stream.start_stream)
         except asyncio.CancelledError:
             pass
         finally:
@@ -188,8 +251,7 @@ class AudioVideoLoop:
                     # the rest of this response — a transcription may arrive
                     # on the same message.
                     if server_content.interrupted:
-                        while not self.audio_in_queue.empty():
-                            self.audio_in_queue.get_nowait()
+                        self.flush_playback()
 
                     # Process ALL parts in each server event — a single event
                     # can contain multiple content parts simultaneously.
@@ -206,6 +268,27 @@ class AudioVideoLoop:
         except asyncio.CancelledError:
             pass
 
+    def flush_playback(self):
+        """Drops the queued audio and stops the chunk being played."""
+        while not self.audio_in_queue.empty():
+            self.audio_in_queue.get_nowait()
+        if self.echo_canceller:
+            # The rest of the chunk being played won't be heard.
+            self.echo_canceller.clear_reference()
+        self.interrupted_at = time.perf_counter()
+        if self.writing:
+            # play_audio stops the stream once the current slice is written.
+            self.playback_interrupted.set()
+        else:
+            self.on_silence()
+
+    def on_silence(self):
+        """Records the barge-in latency once playback stopped after an interruption."""
+        latency = time.perf_counter() - self.interrupted_at
+        self.barge_in_latencies.append(latency)
+        over_target = " (over the target)" if latency > BARGE_IN_TARGET_SECONDS else ""
+        print(f"\n[Info] Barge-in: silent {latency * 1000:.0f} ms after the interruption{over_target}")
+
     # --- Video Handling ---
 
     def _capture_frame(self, cap):
@@ -307,6 +390,12 @@ class AudioVideoLoop:
 
     async def run(self):
         """Run all tasks to handle audio/video/text interaction"""
+        # Created here rather than on import: initializing PortAudio scans
+        # the audio devices, which can take seconds.
+        self.pya = await asyncio.to_thread(pyaudio.PyAudio)
+        client = genai.Client(
+            api_key=os.environ.get("GOOGLE_API_KEY"),
+        )
         try:
             async with (
                 client.aio.live.connect(model=MODEL, config=CONFIG) as session,
@@ -338,6 +427,17 @@ class AudioVideoLoop:
         except ExceptionGroup as EG:
             self.audio_stream.close()
             traceback.print_exception(EG)
+        finally:
+            if self.barge_in_latencies:
+                latencies = [latency * 1000 for latency in self.barge_in_latencies]
+                print(
+                    f"[Info] Barge-in latency over {len(latencies)} interruptions: "
+                    f"mean {statistics.mean(latencies):.0f} ms, max {max(latencies):.0f} ms, "
+                    f"{sum(latency > BARGE_IN_TARGET_SECONDS * 1000 for latency in latencies)} over "
+                    f"the {BARGE_IN_TARGET_SECONDS * 1000:.0f} ms target"
+                )
+            if self.echo_canceller:
+                print(f"[Info] Echo cancellation: {self.echo_canceller.status()}")
 
 
 if __name__ == "__main__":
@@ -349,6 +449,18 @@ if __name__ == "__main__":
         help="pixels to stream from",
         choices=["camera", "screen", "none"],
     )
+    parser.add_argument(
+        "--aec",
+        action="store_true",
+        help="cancel the echo of the model's voice in software, for use without headphones",
+    )
     args = parser.parse_args()
-    main = AudioVideoLoop(video_mode=args.mode)
+    echo_canceller = None
+    if args.aec:
+        try:
+            from live_audio.aec import EchoCanceller
+        except ImportError:
+            parser.error("--aec requires numpy: pip install numpy")
+        echo_canceller = EchoCanceller(SEND_SAMPLE_RATE, RECEIVE_SAMPLE_RATE)
+    main = AudioVideoLoop(video_mode=args.mode, echo_canceller=echo_canceller)
     asyncio.run(main.run())
@@ -19,6 +19,7 @@ This script lets you to talk to a Gemini native audio model using the Live API.
 Important: **Use headphones**. This script uses the system default audio
 input and output, which often won't include echo cancellation. So to prevent
 the model from interrupting itself it is important that you use headphones. 
+Without headphones, run with `--aec` to cancel the echo in software instead.
 
 ## Setup
 
@@ -45,10 +46,26 @@ python Get_started_LiveAPI_NativeAudio.py
 ```
 
 Start talking to Gemini
+
+To cancel the echo of the model's voice in the microphone signal, which needs
+`pip install numpy`:
+
+```
+python Get_started_LiveAPI_NativeAudio.py --aec
+```
+
+The echo reduction (ERLE) and the CPU time the echo canceller used are printed
+on exit.
+
+When you interrupt the model, the script prints how long playback took to go
+silent after the interruption reached it (the barge-in latency).
 """
 
+import argparse
 import asyncio
+import statistics
 import sys
+import time
 import traceback
 
 import pyaudio
@@ -89,13 +106,17 @@ CONFIG = {
 
 
 class AudioLoop:
-    def __init__(self):
+    def __init__(self, echo_canceller=None):
+        self.echo_canceller = echo_canceller
         self.audio_in_queue = None
         self.out_queue = None
         self.session = None
         self.audio_stream = None
         self.receive_audio_task = None
         self.play_audio_task = None
+        self.writing = False  # A chunk is being written to the output stream.
+        self.interrupted_at = None  # When the last interruption flushed the playback queue.
+        self.barge_in_latencies = []  # Seconds from each interruption to silence.
 
 
     async def listen_audio(self):
@@ -115,6 +136,8 @@ class AudioLoop:
             kwargs = {}
         while True:
             data = await asyncio.to_thread(self.audio_stream.read, CHUNK_SIZE, **kwargs)
+            if self.echo_canceller:
+                data = self.echo_canceller.process(data)
             await self.out_queue.put({"data": data, "mime_type": "audio/pcm"})
 
     async def send_realtime(self):
@@ -127,18 +150,43 @@ class AudioLoop:
         while True:
             turn = self.session.receive()
             async for response in turn:
-                if data := response.data:
-                    self.audio_in_queue.put_nowait(data)
+                server_content = response.server_content
+                if server_content is None:
                     continue
-                if text := response.text:
-                    print(text, end="")
 
-            # If you interrupt the model, it sends a turn_complete.
-            # For interruptions to work, we need to stop playback.
-            # So empty out the audio queue because it may have loaded
-            # much more audio than has played yet.
-            while not self.audio_in_queue.empty():
-                self.audio_in_queue.get_nowait()
+                # If you interrupt the model, it sends `interrupted`.
+                # For interruptions to work, we need to stop playback right
+                # away. So empty out the audio queue because it may have
+                # loaded much more audio than has played yet.
+                if server_content.interrupted:
+                    self.flush_playback()
+
+                # Read the parts directly rather than through `response.data`,
+                # which joins the audio of all the parts into a new bytes object.
+                if server_content.model_turn:
+                    for part in server_content.model_turn.parts:
+                        if part.inline_data:
+                            self.audio_in_queue.put_nowait(part.inline_data.data)
+                        elif part.text and not part.thought:
+                            print(part.text, end="")
+
+    def flush_playback(self):
+        flushed = 0
+        while not self.audio_in_queue.empty():
+            flushed += len(self.audio_in_queue.get_nowait())
+        if self.echo_canceller:
+            self.echo_canceller.clear_reference()
+        self.interrupted_at = time.perf_counter()
+        print(f"\n[Info] Interrupted, dropped {flushed / 2 / RECEIVE_SAMPLE_RATE:.2f}s of queued audio")
+        if not self.writing:
+            self.on_silence()
+
+    def on_silence(self):
+        """Records the barge-in latency once playback stopped after an interruption."""
+        latency = time.perf_counter() - self.interrupted_at
+        self.interrupted_at = None
+        self.barge_in_latencies.append(latency)
+        print(f"[Info] Barge-in: silent {latency * 1000:.0f} ms after the interruption")
 
     async def play_audio(self):
         stream = await asyncio.to_thread(
@@ -150,7 +198,18 @@ class AudioLoop:
         )
         while True:
             bytestream = await self.audio_in_queue.get()
-            await asyncio.to_thread(stream.write, bytestream)
+            if self.echo_canceller:
+                # The microphone will hear this, resampled to its rate, from now on.
+                self.echo_canceller.add_reference(bytestream)
+            self.writing = True
+            try:
+                await asyncio.to_thread(stream.write, bytestream)
+            finally:
+                self.writing = False
+            if self.interrupted_at is not None:
+                # The chunk that was playing when the interruption came in is
+                # done. The device may still play its buffer for a few ms.
+                self.on_silence()
 
     async def run(self):
         try:
@@ -173,8 +232,31 @@ class AudioLoop:
             if self.audio_stream:
                 self.audio_stream.close()
             traceback.print_exception(eg)
+        finally:
+            if self.barge_in_latencies:
+                latencies = [latency * 1000 for latency in self.barge_in_latencies]
+                print(
+                    f"[Info] Barge-in latency over {len(latencies)} interruptions: "
+                    f"mean {statistics.mean(latencies):.0f} ms, max {max(latencies):.0f} ms"
+                )
+            if self.echo_canceller:
+                print(f"[Info] Echo cancellation: {self.echo_canceller.status()}")
 
 
 if __name__ == "__main__":
-    loop = AudioLoop()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--aec",
+        action="store_true",
+        help="cancel the echo of the model's voice in software, for use without headphones",
+    )
+    args = parser.parse_args()
+    echo_canceller = None
+    if args.aec:
+        try:
+            from live_audio.aec import EchoCanceller
+        except ImportError:
+            parser.error("--aec requires numpy: pip install numpy")
+        echo_canceller = EchoCanceller(SEND_SAMPLE_RATE, RECEIVE_SAMPLE_RATE)
+    loop = AudioLoop(echo_canceller)
     asyncio.run(loop.run())
\ No newline at end of file
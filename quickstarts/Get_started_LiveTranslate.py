@@ -19,7 +19,7 @@
 To install the dependencies for this script, run:
 
 ``` 
-pip install google-genai==2.8.0 pyaudio
+pip install google-genai==2.8.0 pyaudio numpy
 ```
 
 This script also requires `ffmpeg` to be installed on your system. For example, on macOS:
@@ -28,6 +28,9 @@ This script also requires `ffmpeg` to be installed on your system. For example,
 brew install ffmpeg
 ```
 
+Local 16kHz mono 16-bit WAV (or raw `.pcm`) files are streamed directly, without
+ffmpeg.
+
 Before running this script, ensure the `GEMINI_API_KEY` environment
 variable is set to the api-key you obtained from Google AI Studio.
 
@@ -38,36 +41,312 @@ To run the script:
 ```
 python Get_started_LiveTranslate.py --url "https://storage.googleapis.com/generativeai-downloads/gemini-cookbook/audio/gemini-live-translate-sample.wav" --target es
 ```
+
+To translate a recording faster than real time without playing it, use the
+batch mode. It writes the translated audio to `<output>.wav` and the source and
+translation transcripts to `<output>.jsonl`:
+
+```
+python Get_started_LiveTranslate.py --url archive.mp3 --target es --batch --speed 4 --output archive_es
+```
+
+The batch mode can translate to several languages at once. The input is
+decoded once and fed to one Live session per language, each writing to
+`<output>.<language>.wav` and `<output>.<language>.jsonl`:
+
+```
+python Get_started_LiveTranslate.py --url archive.mp3 --target es,fr,de --batch --output archive
+```
+
+Each language then reports its translation lag: the time between the arrival
+of a source phrase's transcript and of its translation's, paired in order.
+
+Long recordings can be split at pauses into segments of at most
+`--max-segment` seconds, translated over `--sessions` concurrent Live sessions
+and stitched back together in order. `<output>.jsonl` then lists the source and
+output timestamps of each segment:
+
+```
+python Get_started_LiveTranslate.py --url lecture.wav --target es --batch --segmented --sessions 8 --output lecture_es
+```
+
+With `--subtitles`, the source and translation transcripts are also written as
+subtitles (`<output>.source.srt`, `<output>.translation.vtt`, ...) timed on the
+audio clock, along with `<output>.metrics.jsonl`, which lists each source phrase,
+its translation and the lag between them:
+
+```
+python Get_started_LiveTranslate.py --url talk.wav --target es --subtitles --output talk
+```
+
+Once the input ends, the script waits until Gemini reported the end of the
+translation and then sent nothing for a moment, or for `--drain-timeout`
+seconds at most.
 """
 
-import array
 import asyncio
 import argparse
+import collections
+import contextlib
+import json
+import time
+import wave
 import pyaudio
 from google import genai
 from google.genai import types
 
+from live_audio.mixer import Mixer, MixerInput
+from live_audio.pcm_file import open_pcm
+from live_audio.segmenter import split_on_silence
+from live_audio.subtitles import SENTENCE_ENDS, SubtitleWriter
+
+try:
+    import resource  # Used to measure the CPU time of ffmpeg, not available on Windows
+except ImportError:
+    resource = None
+
 # Audio Configuration
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
 CHUNK_SIZE = 1600  # samples per chunk (100ms at 16kHz)
+MIX_BLOCK_FRAMES = 480  # frames written to the output device at once (20ms at 24kHz)
+DRAIN_QUIET_SECONDS = 1.5  # silence after a completion before the translation counts as finished
 
-def adjust_volume(pcm_data: bytes, volume: float) -> bytes:
-    """Scales raw PCM 16-bit signed samples by the volume factor."""
-    if volume >= 1.0:
-        return pcm_data
-    if volume <= 0.0:
-        return b'\x00' * len(pcm_data)
-    
-    samples = array.array('h', pcm_data)
-    for i in range(len(samples)):
-        samples[i] = int(samples[i] * volume)
-    return samples.tobytes()
+MODEL = "gemini-3.5-live-translate-preview"
+
+def live_config(target_lang: str) -> types.LiveConnectConfig:
+    """Configures the live connection with translation settings."""
+    return types.LiveConnectConfig(
+        response_modalities=[types.Modality.AUDIO],
+        translation_config=types.TranslationConfig(
+            echo_target_language=True,
+            target_language_code=target_lang,
+        ),
+        input_audio_transcription=types.AudioTranscriptionConfig(),
+        output_audio_transcription=types.AudioTranscriptionConfig(),
+    )
+
+class TranslationLatency:
+    """Measures how long after the original audio its translation is heard.
+
+    Both are played through the same mixer, so the latency is measured in
+    output frames. When a translation chunk arrives, the mixer is asked for
+    the frame at which the original audio sent so far finishes playing, and
+    the frame at which the new translation chunk starts playing.
+    """
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.latencies = []  # in output frames
+        self._pending = {}
+        self._next_tag = 0
+
+    def mark(self, original: MixerInput, translation: MixerInput):
+        tag = self._next_tag
+        self._next_tag += 1
+        original.mark_end(tag)
+        translation.mark_next(tag)
+
+    def on_mark(self, input_name: str, tag: int, output_frame: int):
+        """Called by the mixer once it knows when marked audio is played."""
+        if tag not in self._pending:
+            self._pending[tag] = output_frame
+            return
+        other_frame = self._pending.pop(tag)
+        if input_name == "translation":
+            self.latencies.append(output_frame - other_frame)
+        else:
+            self.latencies.append(other_frame - output_frame)
+
+    def summary(self) -> str:
+        if not self.latencies:
+            return "no translated audio was played"
+        to_ms = lambda frames: frames * 1000 / self.rate
+        mean = sum(self.latencies) / len(self.latencies)
+        return (
+            f"mean {to_ms(mean):.0f} ms, min {to_ms(min(self.latencies)):.0f} ms, "
+            f"max {to_ms(max(self.latencies)):.0f} ms over {len(self.latencies)} chunks"
+        )
+
+class TranscriptLog:
+    """Writes the source and translation transcripts to a JSONL file."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+        self.start_time = time.monotonic()
+
+    def write(self, kind: str, transcription: types.Transcription):
+        record = {
+            "type": kind,
+            "text": transcription.text,
+            "language_code": transcription.language_code,
+            "elapsed_seconds": round(time.monotonic() - self.start_time, 3),
+        }
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+class SegmentTranscript:
+    """Collects the transcripts of one segment, in place of a `TranscriptLog`."""
+
+    def __init__(self):
+        self.texts = {"source": [], "translation": []}
+
+    def write(self, kind: str, transcription: types.Transcription):
+        self.texts[kind].append(transcription.text)
+
+    def text(self, kind: str) -> str:
+        return "".join(self.texts[kind]).strip()
+
+class BroadcastQueue:
+    """Delivers every item put into it to each subscribed queue.
+
+    Each subscriber gets its own bounded queue: `put()` waits until every
+    subscriber has room, so a slow session holds back the producer instead of
+    buffering without limit.
+    """
+
+    def __init__(self):
+        self.queues = []
+
+    def subscribe(self, maxsize: int = 10) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=maxsize)
+        self.queues.append(queue)
+        return queue
+
+    async def put(self, item):
+        for queue in self.queues:
+            await queue.put(item)
+
+    async def join(self):
+        for queue in self.queues:
+            await queue.join()
+
+class TranslationStats:
+    """Tracks the translation lag of one session and its untranslated backlog.
+
+    The lag is measured on the transcripts, like the `lag_seconds` of
+    `SubtitleWriter`: phrases end at sentence punctuation or at the end of a
+    turn, source and translation phrases are paired in order within a turn,
+    and the lag of a pair is the time between the arrival of the first source
+    fragment and of the first translated one. The backlog is a difference of
+    audio durations, not a latency: translated speech needn't last as long as
+    its source.
+    """
+
+    def __init__(self, target_lang: str):
+        self.target_lang = target_lang
+        self.source_bytes = 0
+        self.translated_bytes = 0
+        self.backlogs = []  # source seconds sent minus translated seconds received, at each translated chunk
+        self.lags = []  # seconds from a source phrase to its translation, in arrival time
+        self.input_end_time = None
+        self.last_output_time = None
+        self._phrase_start = {"source": None, "translation": None}
+        self._pending = {"source": collections.deque(), "translation": collections.deque()}
+
+    def on_source(self, chunk: bytes):
+        self.source_bytes += len(chunk)
+
+    @property
+    def source_seconds(self) -> float:
+        return self.source_bytes / (SEND_SAMPLE_RATE * 2)
+
+    @property
+    def translated_seconds(self) -> float:
+        return self.translated_bytes / (RECEIVE_SAMPLE_RATE * 2)
+
+    def on_translation(self, chunk: bytes):
+        self.translated_bytes += len(chunk)
+        self.last_output_time = time.monotonic()
+        self.backlogs.append(self.source_seconds - self.translated_seconds)
+
+    def on_transcript(self, kind: str, text: str, finished: bool = False):
+        """Records the arrival of a "source" or "translation" transcript fragment."""
+        if self._phrase_start[kind] is None:
+            self._phrase_start[kind] = time.monotonic()
+        if finished or text.rstrip().endswith(SENTENCE_ENDS):
+            self._end_phrase(kind)
+
+    def end_turn(self):
+        """Ends the current phrases. Phrases left without a counterpart aren't counted."""
+        for kind in self._phrase_start:
+            self._end_phrase(kind)
+            self._pending[kind].clear()
+
+    def _end_phrase(self, kind: str):
+        start, self._phrase_start[kind] = self._phrase_start[kind], None
+        if start is None:
+            return
+        self._pending[kind].append(start)
+        while self._pending["source"] and self._pending["translation"]:
+            self.lags.append(self._pending["translation"].popleft() - self._pending["source"].popleft())
+
+    def summary(self) -> str:
+        if not self.backlogs:
+            return "no translated audio received"
+        text = ""
+        if self.lags:
+            text = (
+                f"translation lag mean {sum(self.lags) / len(self.lags):.2f}s, max {max(self.lags):.2f}s "
+                f"over {len(self.lags)} phrases, "
+            )
+        text += (
+            f"untranslated source audio backlog mean {sum(self.backlogs) / len(self.backlogs):.2f}s, "
+            f"max {max(self.backlogs):.2f}s"
+        )
+        if self.input_end_time and self.last_output_time:
+            text += f", last output {self.last_output_time - self.input_end_time:.2f}s after input end"
+        return text
+
+class GenerationProgress:
+    """Records when a session last produced output and last reported finishing it.
+
+    A completion only says that Gemini finished the phrase it was working on,
+    which may precede the last audio sent. The translation counts as finished
+    once the latest event is a completion and nothing followed it for a quiet
+    period, so a completion arriving before the end of the input still counts
+    but one followed by more translation doesn't.
+    """
+
+    def __init__(self):
+        self.last_output = None
+        self.last_completion = None
+        self.changed = asyncio.Event()
+
+    def on_output(self):
+        self.last_output = time.monotonic()
+        self.changed.set()
+
+    def on_completion(self):
+        self.last_completion = time.monotonic()
+        self.changed.set()
+
+    def finished_at(self, since: float):
+        """Returns the time from which the session has been idle after a completion, or None."""
+        if self.last_completion is None:
+            return None
+        if self.last_output is not None and self.last_output > self.last_completion:
+            return None
+        return max(since, self.last_completion)
+
+async def decode_audio(url: str, chunk_size_bytes: int):
+    """Yields the audio at `url` as raw PCM 16kHz mono 16-bit chunks.
+
+    Local files already in that format are read from a memory map, anything
+    else is decoded via ffmpeg.
+    """
+    pcm_file = open_pcm(url, SEND_SAMPLE_RATE, CHANNELS)
+    if pcm_file is not None:
+        print(f"\n[Info] Starting audio stream from local PCM file: {url}")
+        with pcm_file:
+            for data in pcm_file.chunks(chunk_size_bytes):
+                yield data
+        return
 
-async def stream_audio_url(url: str, audio_queue: asyncio.Queue, original_playback_queue: asyncio.Queue = None, volume: float = 0.08):
-    """Streams audio from an HTTP URL, decoding it via ffmpeg and putting raw PCM bytes into the audio_queue."""
     print(f"\n[Info] Starting audio stream via ffmpeg from: {url}")
     # Spawn ffmpeg to decode stream to raw PCM 16kHz mono 16-bit
     process = await asyncio.create_subprocess_exec(
@@ -81,36 +360,12 @@ async def stream_audio_url(url: str, audio_queue: asyncio.Queue, original_playba
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.DEVNULL
     )
-
-    # 1600 samples * 2 bytes/sample (16-bit) = 3200 bytes
-    chunk_size_bytes = CHUNK_SIZE * 2
-    bytes_per_second = SEND_SAMPLE_RATE * 2
-    start_time = asyncio.get_event_loop().time()
-    bytes_sent = 0
-
     try:
         while True:
             data = await process.stdout.read(chunk_size_bytes)
             if not data:
                 break
-            
-            await audio_queue.put(data)
-            
-            # Put quieted audio into original playback queue
-            if original_playback_queue is not None and volume > 0.0:
-                quiet_data = adjust_volume(data, volume)
-                await original_playback_queue.put(quiet_data)
-                
-            bytes_sent += len(data)
-            
-            # Rate limit to exactly 1.0x real-time playback speed
-            expected_elapsed = bytes_sent / bytes_per_second
-            actual_elapsed = asyncio.get_event_loop().time() - start_time
-            sleep_time = expected_elapsed - actual_elapsed
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-    except asyncio.CancelledError:
-        pass
+            yield data
     finally:
         if process.returncode is None:
             try:
@@ -118,9 +373,53 @@ async def stream_audio_url(url: str, audio_queue: asyncio.Queue, original_playba
                 await process.wait()
             except Exception:
                 pass
+
+async def pace(start_time: float, bytes_sent: int, speed: float):
+    """Waits until the `bytes_sent` bytes of source audio sent since `start_time` are due.
+
+    Audio is due at `speed` times real time, and 0 doesn't wait at all.
+    `bytes_sent` counts the audio up to the end of the last chunk sent.
+    """
+    if speed <= 0:
+        return
+    sleep_time = bytes_sent / (SEND_SAMPLE_RATE * 2 * speed) - (asyncio.get_event_loop().time() - start_time)
+    if sleep_time > 0:
+        await asyncio.sleep(sleep_time)
+
+async def stream_audio_url(url: str, audio_queue: asyncio.Queue, original_playback: MixerInput = None, speed: float = 1.0) -> int:
+    """Streams audio from a URL or local file, putting raw PCM bytes into the audio_queue.
+
+    The original audio is also written to the `original_playback` mixer input, if any.
+    Audio is sent at `speed` times real time (0 sends it as fast as possible).
+    Returns the number of bytes streamed.
+    """
+    # 1600 samples * 2 bytes/sample (16-bit) = 3200 bytes
+    chunk_size_bytes = CHUNK_SIZE * 2
+    start_time = asyncio.get_event_loop().time()
+    bytes_sent = 0
+
+    try:
+        async with contextlib.aclosing(decode_audio(url, chunk_size_bytes)) as chunks:
+            async for data in chunks:
+                await audio_queue.put(data)
+                
+                # The mixer applies the background volume to the original audio
+                if original_playback is not None:
+                    original_playback.write(data)
+                    
+                bytes_sent += len(data)
+                
+                # Rate limit to `speed` times real-time playback speed
+                await pace(start_time, bytes_sent, speed)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if original_playback is not None:
+            original_playback.finish()
         print("\n[Info] Audio stream finished.")
+    return bytes_sent
 
-async def send_realtime(session, audio_queue: asyncio.Queue):
+async def send_realtime(session, audio_queue: asyncio.Queue, stats: TranslationStats = None):
     """Sends audio from the input queue to the GenAI session."""
     try:
         while True:
@@ -131,76 +430,132 @@ async def send_realtime(session, audio_queue: asyncio.Queue):
                     mime_type=f"audio/pcm;rate={SEND_SAMPLE_RATE}"
                 )
             )
+            if stats:
+                stats.on_source(chunk)
             audio_queue.task_done()
     except asyncio.CancelledError:
         pass
 
-async def receive_responses(session, audio_queue_output: asyncio.Queue):
-    """Receives responses from Gemini, plays audio and prints transcripts."""
+async def receive_responses(session, audio_queue_output: asyncio.Queue, transcript_log: TranscriptLog = None, stats: TranslationStats = None, print_source: bool = True, progress: GenerationProgress = None, subtitles: SubtitleWriter = None):
+    """Receives responses from Gemini, plays audio and prints transcripts.
+
+    `progress` records the output and the completions Gemini reports.
+    `subtitles` are timed with the audio clocks of `stats`, which is required then.
+    """
     try:
         async for response in session.receive():
             server_content = response.server_content
             if server_content:
+                if progress and (server_content.model_turn or server_content.input_transcription or server_content.output_transcription):
+                    progress.on_output()
+                if server_content.generation_complete or server_content.turn_complete:
+                    if progress:
+                        progress.on_completion()
+                    if stats:
+                        stats.end_turn()
+                    if subtitles:
+                        subtitles.end_turn()
+
                 # Handle model audio turn data
                 if server_content.model_turn:
                     for part in server_content.model_turn.parts:
                         if part.inline_data and isinstance(part.inline_data.data, bytes):
                             audio_queue_output.put_nowait(part.inline_data.data)
+                            if stats:
+                                stats.on_translation(part.inline_data.data)
                 
                 # Print input (source) transcript
                 if server_content.input_transcription and server_content.input_transcription.text:
                     lang = f" ({server_content.input_transcription.language_code})" if server_content.input_transcription.language_code else ""
-                    print(f"\n[Source{lang}] {server_content.input_transcription.text}", flush=True)
+                    if print_source:
+                        print(f"\n[Source{lang}] {server_content.input_transcription.text}", flush=True)
+                    if transcript_log:
+                        transcript_log.write("source", server_content.input_transcription)
+                    if stats:
+                        stats.on_transcript(
+                            "source", server_content.input_transcription.text,
+                            bool(server_content.input_transcription.finished),
+                        )
+                    if subtitles:
+                        subtitles.write(
+                            "source", server_content.input_transcription.text, stats.source_seconds,
+                            stats.translated_seconds, bool(server_content.input_transcription.finished),
+                        )
                 
                 # Print output (translated) transcript
                 if server_content.output_transcription and server_content.output_transcription.text:
                     lang = f" ({server_content.output_transcription.language_code})" if server_content.output_transcription.language_code else ""
                     print(f"[Translation{lang}] {server_content.output_transcription.text}", flush=True)
+                    if transcript_log:
+                        transcript_log.write("translation", server_content.output_transcription)
+                    if stats:
+                        stats.on_transcript(
+                            "translation", server_content.output_transcription.text,
+                            bool(server_content.output_transcription.finished),
+                        )
+                    if subtitles:
+                        subtitles.write(
+                            "translation", server_content.output_transcription.text, stats.source_seconds,
+                            stats.translated_seconds, bool(server_content.output_transcription.finished),
+                        )
     except asyncio.CancelledError:
         pass
     except Exception as e:
         print(f"\n[Error] Receiving loop encountered error: {e}")
 
-async def play_audio(audio_queue_output: asyncio.Queue):
-    """Plays translated audio from the output queue."""
-    pya = pyaudio.PyAudio()
+async def finish_input(session, progress: GenerationProgress, timeout: float, quiet: float = DRAIN_QUIET_SECONDS) -> bool:
+    """Signals the end of the audio input and waits for Gemini to finish translating it.
+
+    Gemini has finished once it reported a completion and then stayed silent
+    for `quiet` seconds, counted from the end of the input at the earliest.
+    Returns False if that didn't happen within `timeout` seconds.
+    """
+    await session.send_realtime_input(audio_stream_end=True)
+    input_end = time.monotonic()
+    deadline = input_end + timeout
+    while True:
+        now = time.monotonic()
+        idle_since = progress.finished_at(input_end)
+        if idle_since is not None and now >= idle_since + quiet:
+            return True
+        if now >= deadline:
+            print(f"[Info] Gemini didn't finish within {timeout:.1f}s of the input end, stopping anyway.")
+            return False
+        # The event only wakes this loop up, the state is read from `progress`.
+        progress.changed.clear()
+        wake_at = deadline if idle_since is None else min(deadline, idle_since + quiet)
+        try:
+            await asyncio.wait_for(progress.changed.wait(), wake_at - now)
+        except TimeoutError:
+            pass
+
+async def mix_translation(audio_queue_output: asyncio.Queue, original: MixerInput, translation: MixerInput, latency: TranslationLatency):
+    """Moves translated audio from the output queue to the mixer as soon as it arrives."""
     try:
-        stream = await asyncio.to_thread(
-            pya.open,
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=RECEIVE_SAMPLE_RATE,
-            output=True,
-        )
         while True:
             bytestream = await audio_queue_output.get()
-            await asyncio.to_thread(stream.write, bytestream)
+            latency.mark(original, translation)
+            translation.write(bytestream)
             audio_queue_output.task_done()
     except asyncio.CancelledError:
         pass
-    finally:
-        try:
-            stream.stop_stream()
-            stream.close()
-        except Exception:
-            pass
-        pya.terminate()
 
-async def play_original_audio(original_playback_queue: asyncio.Queue):
-    """Plays quieted original background audio from the queue."""
+async def play_mixed_audio(mixer: Mixer):
+    """Plays the original and translated audio through a single output stream."""
     pya = pyaudio.PyAudio()
     try:
         stream = await asyncio.to_thread(
             pya.open,
             format=FORMAT,
             channels=CHANNELS,
-            rate=SEND_SAMPLE_RATE,  # 16000Hz (original audio rate)
+            rate=mixer.rate,
             output=True,
+            frames_per_buffer=MIX_BLOCK_FRAMES,
         )
+        # The blocking write paces this loop at the device clock, which is
+        # the one clock both the original and the translation are played at.
         while True:
-            bytestream = await original_playback_queue.get()
-            await asyncio.to_thread(stream.write, bytestream)
-            original_playback_queue.task_done()
+            await asyncio.to_thread(stream.write, mixer.read(MIX_BLOCK_FRAMES))
     except asyncio.CancelledError:
         pass
     finally:
@@ -211,39 +566,62 @@ async def play_original_audio(original_playback_queue: asyncio.Queue):
             pass
         pya.terminate()
 
-async def run(url: str, target_lang: str, original_volume: float = 0.08):
+async def write_translation_wav(audio_queue_output: asyncio.Queue, path: str):
+    """Writes translated audio from the output queue to a WAV file."""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(2)
+        wav.setframerate(RECEIVE_SAMPLE_RATE)
+        try:
+            while True:
+                bytestream = await audio_queue_output.get()
+                # The header is only patched with the final length on close
+                wav.writeframesraw(bytestream)
+                audio_queue_output.task_done()
+        except asyncio.CancelledError:
+            pass
+
+async def run(url: str, target_lang: str, original_volume: float = 0.08, drain_timeout: float = 10.0, subtitles_prefix: str = None):
     # Initialize Google GenAI Client
     client = genai.Client()
-    
-    # Configure live connection with translation settings
-    config = types.LiveConnectConfig(
-        response_modalities=[types.Modality.AUDIO],
-        translation_config=types.TranslationConfig(
-            echo_target_language=True,
-            target_language_code=target_lang,
-        ),
-        input_audio_transcription=types.AudioTranscriptionConfig(),
-        output_audio_transcription=types.AudioTranscriptionConfig(),
-    )
+    config = live_config(target_lang)
 
     audio_queue_input = asyncio.Queue(maxsize=10)
     audio_queue_output = asyncio.Queue()
-    original_playback_queue = asyncio.Queue()
 
-    model = "gemini-3.5-live-translate-preview"
-    print(f"[Info] Connecting to Gemini Live ({model})...")
+    # Mix the ducked original and the translation into one 24kHz output stream
+    latency = TranslationLatency(RECEIVE_SAMPLE_RATE)
+    mixer = Mixer(RECEIVE_SAMPLE_RATE, CHANNELS, on_mark=latency.on_mark)
+    original = mixer.add_input(
+        "original",
+        rate=SEND_SAMPLE_RATE,
+        gain=original_volume,
+        # Buffer one input chunk so that the original plays without gaps
+        prebuffer_frames=CHUNK_SIZE * RECEIVE_SAMPLE_RATE // SEND_SAMPLE_RATE,
+    )
+    translation = mixer.add_input("translation")
+    progress = GenerationProgress()
+    stats = TranslationStats(target_lang)
+    subtitles = SubtitleWriter(subtitles_prefix) if subtitles_prefix else None
+
+    print(f"[Info] Connecting to Gemini Live ({MODEL})...")
     
     try:
-        async with client.aio.live.connect(model=model, config=config) as session:
+        async with client.aio.live.connect(model=MODEL, config=config) as session:
             print("[Info] Connected successfully. Ready to stream!")
             async with asyncio.TaskGroup() as tg:
                 stream_task = tg.create_task(
-                    stream_audio_url(url, audio_queue_input, original_playback_queue, original_volume)
+                    stream_audio_url(url, audio_queue_input, original)
+                )
+                send_task = tg.create_task(send_realtime(session, audio_queue_input, stats))
+                receive_task = tg.create_task(
+                    receive_responses(
+                        session, audio_queue_output, stats=stats,
+                        progress=progress, subtitles=subtitles,
+                    )
                 )
-                send_task = tg.create_task(send_realtime(session, audio_queue_input))
-                receive_task = tg.create_task(receive_responses(session, audio_queue_output))
-                play_task = tg.create_task(play_audio(audio_queue_output))
-                play_original_task = tg.create_task(play_original_audio(original_playback_queue))
+                mix_task = tg.create_task(mix_translation(audio_queue_output, original, translation, latency))
+                play_task = tg.create_task(play_mixed_audio(mixer))
                 
                 # Wait for the audio stream to finish reading
                 await stream_task
@@ -252,26 +630,265 @@ async def run(url: str, target_lang: str, original_volume: float = 0.08):
                 await audio_queue_input.join()
                 send_task.cancel()
                 
-                # Wait for original playback to finish
-                await original_playback_queue.join()
-                play_original_task.cancel()
-                
-                # Give Gemini a few seconds to finish translating and speaking the final chunks
-                await asyncio.sleep(4.0)
+                # Wait for Gemini to finish translating the final chunks
+                await finish_input(session, progress, drain_timeout)
                 receive_task.cancel()
+                await audio_queue_output.join()
+                
+                # Wait for the original and the translation to finish playing
+                while original.buffered_frames or translation.buffered_frames:
+                    await asyncio.sleep(MIX_BLOCK_FRAMES / RECEIVE_SAMPLE_RATE)
+                
+                mix_task.cancel()
                 play_task.cancel()
                 
     except Exception as e:
         print(f"[Error] Live session error: {e}")
+    finally:
+        if subtitles:
+            subtitles.close()
+            print(f"[Info] Wrote subtitles and lag metrics to {subtitles_prefix}.*")
+
+    print(f"[Info] Source-to-translation latency: {latency.summary()}")
+
+def child_cpu_seconds() -> float:
+    """Returns the CPU time used by the finished child processes (ffmpeg)."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+async def run_batch(url: str, target_langs: list[str], speed: float = 1.0, output: str = "translation", drain_timeout: float = 10.0, subtitles: bool = False):
+    """Translates the whole input without playing it, writing the results to files.
+
+    With several target languages, the input is decoded once and broadcast to
+    one Live session per language.
+    """
+    # CPU spent so far is the interpreter startup and imports, which separate
+    # processes per language would each pay again.
+    startup_cpu = time.process_time()
+    client = genai.Client()
+
+    broadcast = BroadcastQueue()
+    outputs = [f"{output}.{lang}" if len(target_langs) > 1 else output for lang in target_langs]
+    input_queues = [broadcast.subscribe(maxsize=10) for _ in target_langs]
+    output_queues = [asyncio.Queue() for _ in target_langs]
+    stats = [TranslationStats(lang) for lang in target_langs]
+    progress = [GenerationProgress() for _ in target_langs]
+    transcript_logs = [TranscriptLog(f"{prefix}.jsonl") for prefix in outputs]
+    subtitle_writers = [SubtitleWriter(prefix) if subtitles else None for prefix in outputs]
+
+    print(f"[Info] Connecting {len(target_langs)} Gemini Live ({MODEL}) session(s)...")
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            sessions = [
+                await stack.enter_async_context(client.aio.live.connect(model=MODEL, config=live_config(lang)))
+                for lang in target_langs
+            ]
+            print(f"[Info] Connected successfully. Translating at {speed or 'maximum'}x speed...")
+            start_time = time.monotonic()
+            async with asyncio.TaskGroup() as tg:
+                stream_task = tg.create_task(stream_audio_url(url, broadcast, speed=speed))
+                send_tasks, receive_tasks, write_tasks = [], [], []
+                for i, session in enumerate(sessions):
+                    send_tasks.append(tg.create_task(send_realtime(session, input_queues[i], stats[i])))
+                    receive_tasks.append(tg.create_task(
+                        receive_responses(
+                            session, output_queues[i], transcript_logs[i], stats[i],
+                            print_source=i == 0, progress=progress[i], subtitles=subtitle_writers[i],
+                        )
+                    ))
+                    write_tasks.append(tg.create_task(write_translation_wav(output_queues[i], f"{outputs[i]}.wav")))
+
+                bytes_sent = await stream_task
+                await broadcast.join()
+                for task, session_stats in zip(send_tasks, stats):
+                    task.cancel()
+                    session_stats.input_end_time = time.monotonic()
+
+                # Wait for every session to finish translating the final chunks
+                await asyncio.gather(*(
+                    finish_input(session, session_progress, drain_timeout) for session, session_progress in zip(sessions, progress)
+                ))
+                for task in receive_tasks:
+                    task.cancel()
+                for queue in output_queues:
+                    await queue.join()
+                for task in write_tasks:
+                    task.cancel()
+
+            elapsed = time.monotonic() - start_time
+            audio_seconds = bytes_sent / (SEND_SAMPLE_RATE * 2)
+            print(
+                f"[Info] Translated {audio_seconds:.1f}s of audio in {elapsed:.1f}s: "
+                f"{audio_seconds / elapsed:.2f} audio seconds per second"
+            )
+            for prefix, session_stats in zip(outputs, stats):
+                print(f"[Info] {session_stats.target_lang}: {session_stats.summary()}. Wrote {prefix}.wav and {prefix}.jsonl")
+    except Exception as e:
+        print(f"[Error] Live session error: {e}")
+    finally:
+        for transcript_log in transcript_logs:
+            transcript_log.close()
+        for subtitle_writer in subtitle_writers:
+            if subtitle_writer:
+                subtitle_writer.close()
+
+    if len(target_langs) > 1 and resource is not None:
+        decode_cpu = child_cpu_seconds()
+        total_cpu = time.process_time() + decode_cpu
+        # Not measured: separate processes would each decode the input and
+        # start an interpreter, so the estimate repeats those for each extra language.
+        estimated_saving = (len(target_langs) - 1) * (decode_cpu + startup_cpu)
+        print(
+            f"[Info] CPU: {total_cpu:.2f}s measured for {len(target_langs)} languages (ffmpeg decode {decode_cpu:.2f}s, "
+            f"startup {startup_cpu:.2f}s). Estimate: separate processes would use about {estimated_saving:.2f}s more "
+            f"(~{estimated_saving / (total_cpu + estimated_saving):.0%} saved)."
+        )
+
+async def translate_segment(client, target_lang: str, pcm, speed: float, drain_timeout: float) -> tuple[bytes, SegmentTranscript]:
+    """Translates one segment of PCM audio in its own Live session.
+
+    Returns the translated audio and the transcripts.
+    """
+    audio_queue_output = asyncio.Queue()
+    transcript = SegmentTranscript()
+    progress = GenerationProgress()
+    chunk_size_bytes = CHUNK_SIZE * 2
+
+    async with client.aio.live.connect(model=MODEL, config=live_config(target_lang)) as session:
+        receive_task = asyncio.create_task(
+            receive_responses(session, audio_queue_output, transcript, print_source=False, progress=progress)
+        )
+        try:
+            start_time = asyncio.get_event_loop().time()
+            for offset in range(0, len(pcm), chunk_size_bytes):
+                chunk = bytes(pcm[offset:offset + chunk_size_bytes])
+                await session.send_realtime_input(
+                    audio=types.Blob(
+                        data=chunk,
+                        mime_type=f"audio/pcm;rate={SEND_SAMPLE_RATE}"
+                    )
+                )
+                # Rate limit to `speed` times real-time playback speed
+                await pace(start_time, offset + len(chunk), speed)
+            await finish_input(session, progress, drain_timeout)
+        finally:
+            receive_task.cancel()
+            await receive_task
+
+    audio = []
+    while not audio_queue_output.empty():
+        audio.append(audio_queue_output.get_nowait())
+    return b"".join(audio), transcript
+
+async def run_segmented(url: str, target_lang: str, sessions: int = 4, max_segment_seconds: float = 60.0, speed: float = 1.0, output: str = "translation", drain_timeout: float = 10.0):
+    """Splits the input at pauses and translates the segments over `sessions` concurrent Live sessions.
+
+    The translations are stitched back together in order. Each one starts at
+    the same time as its source segment, or right after the previous
+    translation if that one runs longer.
+    """
+    client = genai.Client()
+
+    pcm = bytearray()
+    async with contextlib.aclosing(decode_audio(url, CHUNK_SIZE * 2)) as chunks:
+        async for data in chunks:
+            pcm += data
+    # A zero-length segment would open a Live session for nothing
+    segments = [
+        (start, end) for start, end in split_on_silence(pcm, SEND_SAMPLE_RATE, max_segment_seconds, channels=CHANNELS)
+        if end > start
+    ]
+    if not segments:
+        print(f"[Error] No audio decoded from {url}, nothing to translate.")
+        return
+    audio_seconds = len(pcm) / (SEND_SAMPLE_RATE * 2 * CHANNELS)
+    print(
+        f"[Info] Split {audio_seconds:.1f}s of audio into {len(segments)} segment(s), "
+        f"translating over {sessions} Gemini Live ({MODEL}) session(s)..."
+    )
+
+    pool = asyncio.Semaphore(sessions)
+    results = [None] * len(segments)
+    samples = memoryview(pcm)
+
+    async def translate(index: int, start: int, end: int):
+        async with pool:
+            try:
+                results[index] = await translate_segment(
+                    client, target_lang, samples[2 * CHANNELS * start:2 * CHANNELS * end], speed, drain_timeout
+                )
+                print(f"[Info] Segment {index + 1}/{len(segments)} translated.")
+            except Exception as e:
+                print(f"[Error] Segment {index + 1}/{len(segments)} failed: {e}")
+                results[index] = (b"", SegmentTranscript())
+
+    start_time = time.monotonic()
+    async with asyncio.TaskGroup() as tg:
+        for index, (start, end) in enumerate(segments):
+            tg.create_task(translate(index, start, end))
+    elapsed = time.monotonic() - start_time
+
+    frame_size = 2 * CHANNELS
+    position = 0  # Output frames written so far
+    with wave.open(f"{output}.wav", "wb") as wav, open(f"{output}.jsonl", "w", encoding="utf-8") as log:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(2)
+        wav.setframerate(RECEIVE_SAMPLE_RATE)
+        for index, ((start, end), (audio, transcript)) in enumerate(zip(segments, results)):
+            # Don't let a translation start before its source segment does
+            source_start = start * RECEIVE_SAMPLE_RATE // SEND_SAMPLE_RATE
+            if position < source_start:
+                wav.writeframesraw(bytes((source_start - position) * frame_size))
+                position = source_start
+            output_start = position
+            wav.writeframesraw(audio)
+            position += len(audio) // frame_size
+            record = {
+                "segment": index,
+                "source_start_seconds": round(start / SEND_SAMPLE_RATE, 3),
+                "source_end_seconds": round(end / SEND_SAMPLE_RATE, 3),
+                "output_start_seconds": round(output_start / RECEIVE_SAMPLE_RATE, 3),
+                "output_end_seconds": round(position / RECEIVE_SAMPLE_RATE, 3),
+                "source": transcript.text("source"),
+                "translation": transcript.text("translation"),
+            }
+            log.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    print(
+        f"[Info] Translated {audio_seconds:.1f}s of audio in {elapsed:.1f}s: "
+        f"{audio_seconds / elapsed:.2f} audio seconds per second. Wrote {output}.wav and {output}.jsonl"
+    )
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Stream audio URL to Gemini Live Translate CLI")
     parser.add_argument("--url", default="https://storage.googleapis.com/generativeai-downloads/gemini-cookbook/audio/gemini-live-translate-sample.wav", help="Audio URL to stream (default: https://storage.googleapis.com/generativeai-downloads/gemini-cookbook/audio/gemini-live-translate-sample.wav)")
-    parser.add_argument("--target", default="es", help="Target translation language code (default: es)")
+    parser.add_argument("--target", default="es", help="Target translation language code, or comma-separated codes in batch mode (default: es)")
     parser.add_argument("--original-volume", type=float, default=0.08, help="Volume of original background audio (0.0 to 1.0, default: 0.08)")
+    parser.add_argument("--batch", action="store_true", help="Write the translation to files instead of playing it")
+    parser.add_argument("--speed", type=float, default=1.0, help="Batch mode: send audio at this multiple of real time, 0 for no limit (default: 1.0)")
+    parser.add_argument("--output", default="translation", help="Path prefix of the output files (default: translation)")
+    parser.add_argument("--drain-timeout", type=float, default=10.0, help="Seconds to wait for the end of the translation once the input ends (default: 10.0)")
+    parser.add_argument("--segmented", action="store_true", help="Batch mode: split the input at pauses and translate the segments in parallel")
+    parser.add_argument("--sessions", type=int, default=4, help="Segmented mode: number of concurrent Live sessions (default: 4)")
+    parser.add_argument("--max-segment", type=float, default=60.0, help="Segmented mode: maximum segment length in seconds (default: 60.0)")
+    parser.add_argument("--subtitles", action="store_true", help="Also write SRT/WebVTT subtitles and per-phrase lag metrics, prefixed with --output")
     args = parser.parse_args()
+    target_langs = [lang.strip() for lang in args.target.split(",") if lang.strip()]
+    if len(target_langs) > 1 and not args.batch:
+        parser.error("translating to several languages requires --batch, only one translation can be played")
+    if args.segmented and (not args.batch or len(target_langs) > 1):
+        parser.error("--segmented requires --batch and a single target language")
+    if args.segmented and args.subtitles:
+        parser.error("--subtitles isn't supported with --segmented, its .jsonl output has the segment timestamps")
 
     try:
-        asyncio.run(run(args.url, args.target, args.original_volume))
+        if args.segmented:
+            asyncio.run(run_segmented(args.url, target_langs[0], args.sessions, args.max_segment, args.speed, args.output, args.drain_timeout))
+        elif args.batch:
+            asyncio.run(run_batch(args.url, target_langs, args.speed, args.output, args.drain_timeout, args.subtitles))
+        else:
+            asyncio.run(run(args.url, args.target, args.original_volume, args.drain_timeout, args.output if args.subtitles else None))
     except KeyboardInterrupt:
         print("\n[Info] Interrupted by user. Exiting...")
@@ -19,7 +19,7 @@
 To install the dependencies for this script, run:
 
 ```
-pip install pyaudio websockets
+pip install pyaudio websockets numpy
 ```
 
 Before running this script, ensure the `GOOGLE_API_KEY` environment
@@ -35,20 +35,66 @@ python LyriaRealTime_EAP.py
 
 The script takes a prompt from the command line and streams the audio back over
 websockets.
+
+To also record the session, to WAV (or FLAC, which requires `ffmpeg`) files
+started every 10 minutes:
+
+```
+python Get_started_LyriaRealTime.py --record session --flac --rotate-minutes 10
+```
+
+Prompt, BPM and scale changes are logged with their sample offset in the
+recording to `session.events.jsonl`.
+
+To play a scripted sequence of prompt and config changes, landing on bar
+boundaries (see `live_audio/timeline.py` for the file format):
+
+```
+python Get_started_LyriaRealTime.py --timeline timeline.json
+```
+
+To layer several sessions, each generating from its own prompt, mixed with a
+gain per layer and all at the same BPM:
+
+```
+python Get_started_LyriaRealTime.py --layer "Funk drums=0.8" --layer "Ambient pads=0.5" --bpm 100
+```
+
+The layers start together, and a layer falling behind skips ahead to stay in
+step with the others. `1=<prompt>` changes the prompt of the first layer,
+`gain1=<number>` its gain, and `bpm=<number>` restarts all of them at a new
+tempo.
 """
+import argparse
 import asyncio
+import contextlib
+import time
 import pyaudio
 import os
 from google import genai
 from google.genai import types
 
+from live_audio.crossfade import ContextCrossfader
+from live_audio.jitter import JitterBuffer
+from live_audio.mixer import Mixer, MixerInput
+from live_audio.playback import AudioPlayer
+from live_audio.recorder import Recorder
+from live_audio.timeline import Timeline, TimelineEvent
+
 # Longer buffer reduces chance of audio drop, but also delays audio and user commands.
+# This is the initial playout delay, it then adapts to the measured network jitter.
 BUFFER_SECONDS=1
+# Fraction of chunks allowed to arrive too late to play, the jitter buffer
+# keeps the smallest delay meeting it.
+TARGET_UNDERRUN_RATE=0.01
 CHUNK=4200
 FORMAT=pyaudio.paInt16
 CHANNELS=2
 MODEL='models/lyria-realtime-exp'
 OUTPUT_RATE=48000
+# In layered mode, audio mixed ahead of the device. Network jitter is absorbed
+# by the BUFFER_SECONDS each layer buffers in the mixer.
+MIX_AHEAD_SECONDS=0.2
 
 api_key = os.environ.get("GOOGLE_API_KEY")
 
@@ -61,35 +107,62 @@ client = genai.Client(
     http_options={'api_version': 'v1alpha',}, # v1alpha since Lyria RealTime is only experimental
 )
 
-async def main():
+def prompts_event(prompts: list[types.WeightedPrompt]) -> list[dict]:
+    return [{"text": prompt.text, "weight": prompt.weight} for prompt in prompts]
+
+def parse_layer(value: str) -> tuple[str, float]:
+    """Parses a `--layer` value, "prompt" or "prompt=gain"."""
+    prompt, separator, gain = value.rpartition("=")
+    if not separator:
+        return value, 1.0
+    return prompt, float(gain)
+
+async def main(record: str = None, flac: bool = False, rotate_minutes: float = None, timeline: Timeline = None):
     p = pyaudio.PyAudio()
+    recorder = None
+    if record:
+        recorder = Recorder(
+            record, OUTPUT_RATE, CHANNELS, rotate_seconds=rotate_minutes * 60 if rotate_minutes else None, flac=flac
+        )
+        recorder.start()
+
+    def log_event(event: str, **data):
+        if recorder:
+            recorder.mark(event, **data)
+
     config = types.LiveMusicGenerationConfig()
     async with client.aio.live.music.connect(model=MODEL) as session:
+        output_stream = p.open(
+            format=FORMAT, channels=CHANNELS, rate=OUTPUT_RATE, output=True, frames_per_buffer=CHUNK)
+        # Plays from its own thread, buffering enough audio to ride out network jitter.
+        jitter_buffer = JitterBuffer(OUTPUT_RATE, TARGET_UNDERRUN_RATE, initial_delay=BUFFER_SECONDS)
+        player = AudioPlayer(output_stream, OUTPUT_RATE, CHANNELS, CHUNK, jitter_buffer=jitter_buffer)
+        player.start()
+        # Keeps the old audio playing across context resets and fades into the new one.
+        crossfader = ContextCrossfader(player)
+
         async def receive():
-            chunks_count = 0
-            output_stream = p.open(
-                format=FORMAT, channels=CHANNELS, rate=OUTPUT_RATE, output=True, frames_per_buffer=CHUNK)
             async for message in session.receive():
-                chunks_count += 1
-                if chunks_count == 1:
-                    # Introduce a delay before starting playback to have a buffer for network jitter.
-                    await asyncio.sleep(BUFFER_SECONDS)
                 # print("Received chunk: ", message)
                 if message.server_content:
                 # print("Received chunk with metadata: ", message.server_content.audio_chunks[0].source_metadata)
                     audio_data = message.server_content.audio_chunks[0].data
-                    output_stream.write(audio_data)
+                    switches = len(crossfader.switches)
+                    crossfader.write(audio_data)
+                    if len(crossfader.switches) > switches:
+                        print(f"[Info] Context switch: {crossfader.status()}")
+                    if recorder:
+                        recorder.write(audio_data)
                 elif message.filtered_prompt:
                     print("Prompt was filtered out: ", message.filtered_prompt)
                 else:
                     print("Unknown error occured with message: ", message)
-                await asyncio.sleep(10**-12)
 
         async def send():
             await asyncio.sleep(5) # Allow initial prompt to play a bit
 
             while True:
-                print("Set new prompt ((bpm=<number|'AUTO'>, scale=<enum|'AUTO'>, top_k=<number|'AUTO'>, 'play', 'pause', 'prompt1:w1,prompt2:w2,...', or single text prompt)")
+                print("Set new prompt ((bpm=<number|'AUTO'>, scale=<enum|'AUTO'>, top_k=<number|'AUTO'>, 'play', 'pause', 'status', 'prompt1:w1,prompt2:w2,...', or single text prompt)")
                 prompt_str = await asyncio.to_thread(
                     input,
                     " > "
@@ -105,12 +178,24 @@ async def main():
 
                 if prompt_str.lower() == 'play':
                     print("Sending PLAY command.")
+                    player.resume()
                     await session.play()
+                    log_event("play")
+                    continue
+
+                if prompt_str.lower() == 'status':
+                    print(f"Playback: {player.status()}")
+                    print(f"Context switches: {crossfader.status()}")
+                    if recorder:
+                        print(f"Recording: {recorder.status()}")
                     continue
 
                 if prompt_str.lower() == 'pause':
                     print("Sending PAUSE command.")
+                    # The player runs dry on purpose, it's not a network underrun.
+                    player.pause()
                     await session.pause()
+                    log_event("pause")
                     continue
 
                 if prompt_str.startswith('bpm='):
@@ -123,6 +208,8 @@ async def main():
                     config.bpm=bpm_value
                   await session.set_music_generation_config(config=config)
                   await session.reset_context()
+                  crossfader.reset()
+                  log_event("config", bpm=getattr(config, "bpm", None))
                   continue
 
                 if prompt_str.startswith('scale='):
@@ -143,6 +230,8 @@ async def main():
                         print("Error: Matching enum not found.")
                   await session.set_music_generation_config(config=config)
                   await session.reset_context()
+                  crossfader.reset()
+                  log_event("config", scale=getattr(config, "scale", None))
                   continue
 
                 if prompt_str.startswith('top_k='):
@@ -151,6 +240,8 @@ async def main():
                     config.top_k = top_k_value
                     await session.set_music_generation_config(config=config)
                     await session.reset_context()
+                    crossfader.reset()
+                    log_event("config", top_k=config.top_k)
                     continue
 
                 # Check for multiple weighted prompts "prompt1:number1, prompt2:number2, ..."
@@ -195,6 +286,7 @@ async def main():
                         else:
                             print(f"Sending multiple weighted prompts: {', '.join(prompt_repr)}")
                         await session.set_weighted_prompts(prompts=parsed_prompts)
+                        log_event("prompts", prompts=prompts_event(parsed_prompts))
                     else: # No valid prompts were parsed from the input string that contained ":"
                         print("Error: Input contained ':' suggesting multi-prompt format, but no valid 'text:weight' segments were successfully parsed. No action taken.")
 
@@ -202,31 +294,226 @@ async def main():
 
                 # If none of the above, treat as a regular single text prompt
                 print(f"Sending single text prompt: \"{prompt_str}\"")
-                await session.set_weighted_prompts(
-                    prompts=[types.WeightedPrompt(text=prompt_str, weight=1.0)]
-                )
+                prompts = [types.WeightedPrompt(text=prompt_str, weight=1.0)]
+                await session.set_weighted_prompts(prompts=prompts)
+                log_event("prompts", prompts=prompts_event(prompts))
 
         print("Starting with some piano")
-        await session.set_weighted_prompts(
-            prompts=[types.WeightedPrompt(text="Piano", weight=1.0)]
-        )
+        prompts = [types.WeightedPrompt(text="Piano", weight=1.0)]
+        await session.set_weighted_prompts(prompts=prompts)
+        log_event("prompts", prompts=prompts_event(prompts))
 
         # Set initial BPM and Scale
-        config.bpm = 120
+        config.bpm = int(timeline.bpm) if timeline else 120
         config.scale = types.Scale.A_FLAT_MAJOR_F_MINOR # Example initial scale
         print(f"Setting initial BPM to {config.bpm} and scale to {config.scale.name}")
         await session.set_music_generation_config(config=config)
+        log_event("config", bpm=config.bpm, scale=config.scale.name)
 
         print(f"Let's get the party started!")
         await session.play()
+        log_event("play")
+
+        async def dispatch(event: TimelineEvent):
+            print(f"[Timeline] {timeline.position(event)} (dispatched {event.jitter * 1000:+.1f} ms from schedule)")
+            log_event("timeline", position=timeline.position(event), jitter_ms=round(event.jitter * 1000, 1))
+            if event.prompts:
+                prompts = [types.WeightedPrompt(text=text, weight=weight) for text, weight in event.prompts.items()]
+                await session.set_weighted_prompts(prompts=prompts)
+                log_event("prompts", prompts=prompts_event(prompts))
+            if event.config:
+                for key, value in event.config.items():
+                    setattr(config, key, types.Scale[value.upper()] if key == "scale" else value)
+                await session.set_music_generation_config(config=config)
+                if "bpm" in event.config or "scale" in event.config:
+                    await session.reset_context()
+                    crossfader.reset()
+                log_event("config", **event.config)
+            if event.action == "play":
+                player.resume()
+                await session.play()
+                log_event("play")
+            elif event.action == "pause":
+                player.pause()
+                await session.pause()
+                log_event("pause")
+            elif event.action == "stop":
+                await session.stop()
 
         send_task = asyncio.create_task(send())
         receive_task = asyncio.create_task(receive())
+        timeline_task = None
+        if timeline:
+            # A change is heard after the playout delay and the device buffer.
+            timeline_task = asyncio.create_task(timeline.run(
+                dispatch,
+                played_seconds=lambda: player.played_seconds,
+                latency_seconds=lambda: (jitter_buffer.effective_delay or jitter_buffer.delay) + CHUNK / OUTPUT_RATE,
+            ))
 
         # Don't quit the loop until tasks are done
-        await asyncio.gather(send_task, receive_task)
+        try:
+            await asyncio.gather(send_task, receive_task)
+        finally:
+            if timeline_task:
+                timeline_task.cancel()
+                print(f"Timeline: {timeline.jitter_summary()}")
+            player.stop()
+            output_stream.close()
+            print(f"Playback: {player.status()}")
+            print(f"Context switches: {crossfader.status()}")
+            if recorder:
+                recorder.close()
+                print(f"Recording: {recorder.status()}")
 
     # Clean up PyAudio
     p.terminate()
 
-asyncio.run(main())
+async def main_layers(
+    layers: list[tuple[str, float]], bpm: int = 120, record: str = None, flac: bool = False, rotate_minutes: float = None
+):
+    """Plays one session per (prompt, gain) layer, mixed into a single output stream."""
+    p = pyaudio.PyAudio()
+    recorder = None
+    if record:
+        recorder = Recorder(
+            record, OUTPUT_RATE, CHANNELS, rotate_seconds=rotate_minutes * 60 if rotate_minutes else None, flac=flac
+        )
+        recorder.start()
+
+    config = types.LiveMusicGenerationConfig(bpm=bpm)
+    mixer = Mixer(OUTPUT_RATE, CHANNELS)
+    mix_seconds = 0.0  # CPU time spent mixing.
+    async with contextlib.AsyncExitStack() as stack:
+        sessions = await asyncio.gather(
+            *(stack.enter_async_context(client.aio.live.music.connect(model=MODEL)) for _ in layers)
+        )
+        inputs = [
+            mixer.add_input(
+                f"{i + 1} ({prompt})", gain=gain, prebuffer_frames=BUFFER_SECONDS * OUTPUT_RATE, realign=True
+            )
+            for i, (prompt, gain) in enumerate(layers)
+        ]
+        output_stream = p.open(
+            format=FORMAT, channels=CHANNELS, rate=OUTPUT_RATE, output=True, frames_per_buffer=CHUNK)
+        player = AudioPlayer(output_stream, OUTPUT_RATE, CHANNELS, CHUNK)
+        player.start()
+
+        def status():
+            print(f"Playback: {player.status()}")
+            print(f"Mixing: {mix_seconds / max(mixer.frames_out / OUTPUT_RATE, 1e-9):.2%} of real time on one core")
+            for mixer_input in inputs:
+                print(
+                    f"Layer {mixer_input.name}: gain {mixer_input.gain:g}, "
+                    f"buffered {mixer_input.buffered_frames / OUTPUT_RATE:.2f}s, "
+                    f"{mixer_input.skipped_frames / OUTPUT_RATE:.2f}s skipped to catch up"
+                )
+
+        async def receive(session, mixer_input: MixerInput):
+            async for message in session.receive():
+                if message.server_content:
+                    mixer_input.write(message.server_content.audio_chunks[0].data)
+                elif message.filtered_prompt:
+                    print(f"Prompt of layer {mixer_input.name} was filtered out: ", message.filtered_prompt)
+                else:
+                    print(f"Unknown error occured with message of layer {mixer_input.name}: ", message)
+
+        async def mix():
+            # Every layer is read on the output clock, as fast as the device plays.
+            nonlocal mix_seconds
+            while True:
+                while player.buffered_seconds < MIX_AHEAD_SECONDS:
+                    start = time.process_time()
+                    block = mixer.read(CHUNK)
+                    mix_seconds += time.process_time() - start
+                    player.write(block)
+                    if recorder:
+                        recorder.write(block)
+                await asyncio.sleep(CHUNK / OUTPUT_RATE / 2)
+
+        async def send():
+            while True:
+                print("Set new layer prompt or gain (<layer>=<prompt>, gain<layer>=<number>, bpm=<number>, 'status', or 'q')")
+                command = await asyncio.to_thread(input, " > ")
+                name, separator, value = command.partition("=")
+                name = name.strip().lower()
+                if command.lower() == 'q':
+                    print("Sending STOP command.")
+                    await asyncio.gather(*(session.stop() for session in sessions))
+                    return
+                if command.lower() == 'status':
+                    status()
+                elif separator and name == 'bpm':
+                    config.bpm = int(value)
+                    print(f"Setting BPM of all layers to {config.bpm}, which requires resetting context.")
+                    await asyncio.gather(*(session.set_music_generation_config(config=config) for session in sessions))
+                    await asyncio.gather(*(session.reset_context() for session in sessions))
+                    # The layers restart from scratch: line them up again.
+                    mixer.start_together()
+                    if recorder:
+                        recorder.mark("config", bpm=config.bpm)
+                elif separator and name.startswith('gain') and name[4:].isdigit() and 0 < int(name[4:]) <= len(inputs):
+                    mixer_input = inputs[int(name[4:]) - 1]
+                    mixer_input.gain = float(value)
+                    print(f"Setting gain of layer {mixer_input.name} to {mixer_input.gain:g}")
+                elif separator and name.isdigit() and 0 < int(name) <= len(inputs):
+                    prompts = [types.WeightedPrompt(text=value.strip(), weight=1.0)]
+                    print(f"Sending prompt \"{value.strip()}\" to layer {name}")
+                    await sessions[int(name) - 1].set_weighted_prompts(prompts=prompts)
+                    if recorder:
+                        recorder.mark("prompts", layer=int(name), prompts=prompts_event(prompts))
+                else:
+                    print(f"Error: Unknown command {command!r}")
+
+        async def start(session, prompt: str):
+            prompts = [types.WeightedPrompt(text=prompt, weight=1.0)]
+            await session.set_weighted_prompts(prompts=prompts)
+            await session.set_music_generation_config(config=config)
+
+        print(f"Starting {len(layers)} layers at {bpm} BPM: {', '.join(mixer_input.name for mixer_input in inputs)}")
+        await asyncio.gather(*(start(session, prompt) for session, (prompt, _) in zip(sessions, layers)))
+        mixer.start_together()
+        await asyncio.gather(*(session.play() for session in sessions))
+        if recorder:
+            recorder.mark("play", layers=[{"prompt": prompt, "gain": gain} for prompt, gain in layers], bpm=bpm)
+
+        receive_tasks = [asyncio.create_task(receive(session, mixer_input)) for session, mixer_input in zip(sessions, inputs)]
+        mix_task = asyncio.create_task(mix())
+        try:
+            await send()
+        finally:
+            mix_task.cancel()
+            for task in receive_tasks:
+                task.cancel()
+            player.stop()
+            output_stream.close()
+            status()
+            if recorder:
+                recorder.close()
+                print(f"Recording: {recorder.status()}")
+
+    p.terminate()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Lyria RealTime music")
+    parser.add_argument("--record", metavar="PREFIX", help="Also record the session to PREFIX.wav and log prompt changes to PREFIX.events.jsonl")
+    parser.add_argument("--flac", action="store_true", help="Record to FLAC instead of WAV, encoded by ffmpeg")
+    parser.add_argument("--rotate-minutes", type=float, help="Start a new recording file every N minutes")
+    parser.add_argument("--timeline", help="JSON file of prompt and config changes to play on beat boundaries")
+    parser.add_argument(
+        "--layer", action="append", type=parse_layer, metavar="PROMPT[=GAIN]",
+        help="Run one session per layer and mix them, repeat for each layer",
+    )
+    parser.add_argument("--bpm", type=int, default=120, help="BPM shared by all the layers")
+    args = parser.parse_args()
+    if args.layer:
+        if args.timeline:
+            parser.error("--timeline is not supported with --layer")
+        asyncio.run(main_layers(args.layer, args.bpm, args.record, args.flac, args.rotate_minutes))
+        raise SystemExit
+    timeline = Timeline.load(args.timeline) if args.timeline else None
+    for event in timeline.events if timeline else []:
+        scale = (event.config or {}).get("scale")
+        if scale and scale.upper() not in types.Scale.__members__:
+            parser.error(f"unknown scale in {args.timeline}: {scale}")
+    asyncio.run(main(args.record, args.flac, args.rotate_minutes, timeline))
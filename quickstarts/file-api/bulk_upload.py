@@ -0,0 +1,192 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Uploads every file of a directory or glob, and prompts the model with each one.
+
+Files go through `concurrency` workers, so a few thousand assets don't wait on
+one round trip after another:
+
+```
+uploader = BulkUploader(client, concurrency=8, prompt="Describe the image")
+asyncio.run(uploader.run(expand("photos/*.png")))
+print(uploader.status())
+```
+
+Each worker uploads a file, polls it until it is ACTIVE (videos are processed
+for a while after the upload), then sends the `generate_content` request that
+uses it. Rate limiting (429), server errors and dropped connections are
+retried with a jittered exponential backoff, so the workers don't all retry
+in lockstep. A file that still fails is reported and skipped.
+"""
+
+import asyncio
+import glob
+import mimetypes
+import os
+import time
+
+import httpx
+from google.genai import errors, types
+
+from retry import backoff, retryable
+from upload_cache import file_sha256, reusable
+
+POLL_SECONDS = 2.0  # Interval between `files.get` calls while a file is PROCESSING.
+
+
+def expand(pattern: str) -> list:
+    """Returns the files in a directory, or matching a glob (`**` recurses)."""
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+async def with_retries(call, retries: int, what: str):
+    """Awaits `call()`, retrying transient failures up to `retries` times."""
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except (errors.APIError, httpx.TransportError) as e:
+            if attempt == retries or (isinstance(e, errors.APIError) and not retryable(e.code)):
+                raise
+            delay = backoff(attempt)
+            print(f"[Info] {what} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+class BulkUploader:
+    """Uploads files with a pool of workers and runs a prompt on each of them."""
+
+    def __init__(
+        self,
+        client,
+        concurrency: int = 8,
+        retries: int = 4,
+        prompt: str = None,
+        model: str = "gemini-2.5-flash",
+        cache=None,
+        delete: bool = False,
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.retries = retries
+        self.prompt = prompt
+        self.model = model
+        self.cache = cache  # An `upload_cache.UploadCache`, to skip unchanged files.
+        self.delete = delete  # Delete each file once its prompt ran.
+
+        self.total = 0
+        self.done = 0
+        self.uploaded = 0
+        self.uploaded_bytes = 0
+        self.reused = 0
+        self.failed = []  # (path, error)
+        self.responses = {}  # path -> response text
+        self.upload_seconds = 0.0  # Until the last upload finished.
+        self._start = None
+
+    async def run(self, paths):
+        self.total = len(paths)
+        self._start = time.perf_counter()
+        if self.cache:
+            self.cache.evict_expired()
+        queue = asyncio.Queue()
+        for path in paths:
+            queue.put_nowait(path)
+        await asyncio.gather(*(self._worker(queue) for _ in range(min(self.concurrency, len(paths)))))
+
+    def status(self) -> str:
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        upload_seconds = max(self.upload_seconds, 1e-9)
+        return (
+            f"{self.done}/{self.total} files in {elapsed:.1f}s, {len(self.failed)} failed. "
+            f"Uploaded {self.uploaded} files ({self.uploaded_bytes / 1e6:.1f} MB) at "
+            f"{self.uploaded / upload_seconds:.1f} files/s, {self.uploaded_bytes / upload_seconds / 1e6:.2f} MB/s; "
+            f"reused {self.reused}"
+        )
+
+    async def _worker(self, queue):
+        while not queue.empty():
+            path = queue.get_nowait()
+            try:
+                await self._process(path)
+            except Exception as e:
+                self.failed.append((path, e))
+                print(f"[Error] {path}: {e!r}")
+            self.done += 1
+
+    async def _process(self, path):
+        mime_type, _ = mimetypes.guess_type(path)
+        if mime_type is None:
+            raise ValueError("unknown mime type, skipped")
+
+        file = await self._upload(path, mime_type)
+        file = await self._wait_active(file)
+        print(f"[Info] {path} is ready as {file.name}")
+
+        if self.prompt:
+            response = await with_retries(
+                lambda: self.client.aio.models.generate_content(model=self.model, contents=[self.prompt, file]),
+                self.retries,
+                f"generate_content for {path}",
+            )
+            self.responses[path] = response.text
+            print(f"[Info] {path}: {response.text}")
+
+        if self.delete:
+            await with_retries(lambda: self.client.aio.files.delete(name=file.name), self.retries, f"delete {path}")
+            if self.cache:
+                self.cache.evict_name(file.name)
+
+    async def _upload(self, path, mime_type) -> types.File:
+        if self.cache:
+            # Hashing reads the whole file, keep it off the event loop.
+            sha256 = await asyncio.to_thread(file_sha256, path)
+            name = self.cache.lookup(sha256, mime_type)
+            if name:
+                try:
+                    file = await self.client.aio.files.get(name=name)
+                except errors.ClientError:
+                    file = None
+                if file and reusable(file):
+                    self.reused += 1
+                    return file
+                self.cache.evict(sha256, mime_type)
+
+        file = await with_retries(
+            lambda: self.client.aio.files.upload(
+                file=path, config={"mime_type": mime_type, "display_name": os.path.basename(path)}
+            ),
+            self.retries,
+            f"upload of {path}",
+        )
+        self.uploaded += 1
+        self.uploaded_bytes += os.path.getsize(path)
+        self.upload_seconds = time.perf_counter() - self._start
+        if self.cache:
+            self.cache.store(sha256, mime_type, file)
+        return file
+
+    async def _wait_active(self, file: types.File) -> types.File:
+        while file.state == types.FileState.PROCESSING:
+            await asyncio.sleep(POLL_SECONDS)
+            file = await with_retries(
+                lambda: self.client.aio.files.get(name=file.name), self.retries, f"files.get of {file.name}"
+            )
+        if file.state == types.FileState.FAILED:
+            raise RuntimeError(f"{file.name} failed processing: {file.error}")
+        return file
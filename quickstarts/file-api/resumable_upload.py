@@ -0,0 +1,254 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Uploads large files in chunks, and resumes interrupted uploads.
+
+`client.files.upload` sends a file in one request: when the connection drops
+in the middle of a multi-GB video, the upload starts over. `upload_resumable`
+uses the File API resumable upload protocol (the one `sample.sh` uses) and
+streams the file from a memory map, `chunk_size` bytes per request:
+
+```
+file = upload_resumable(api_key, "video.mp4", "video/mp4", on_progress=show_progress)
+```
+
+After each chunk, the upload URL and the offset the server confirmed are saved
+in `state_path`. A failed chunk is retried from the offset the server reports,
+and running the upload again after the process was interrupted continues
+where it stopped, as long as the file didn't change.
+"""
+
+import contextlib
+import json
+import mmap
+import os
+import time
+
+import httpx
+from google.genai import types
+
+from retry import backoff, retryable
+
+BASE_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_STATE_PATH = ".upload_sessions.json"
+DEFAULT_CHUNK_SIZE = 8 << 20
+# Bytes handed to the connection at a time, which is also how often
+# `on_progress` is called. Slices of the memory map, so nothing is copied.
+PIECE_BYTES = 1 << 20
+RETRIES = 5  # Consecutive failures of the same chunk before giving up.
+TIMEOUT_SECONDS = 60.0
+
+
+class UploadSessions:
+    """The resumable sessions in progress, in a JSON file."""
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.sessions = json.load(f)
+        except FileNotFoundError:
+            self.sessions = {}
+
+    @staticmethod
+    def key(path) -> str:
+        # A file changed since the session started can't be resumed.
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def get(self, key):
+        return self.sessions.get(key)
+
+    def save(self, key, url: str, offset: int, granularity: int):
+        self.sessions[key] = {"url": url, "offset": offset, "granularity": granularity}
+        self._write()
+
+    def remove(self, key):
+        if self.sessions.pop(key, None) is not None:
+            self._write()
+
+    def _write(self):
+        # Write then rename, so an interruption never leaves a truncated file.
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.sessions, f)
+        os.replace(temp_path, self.path)
+
+
+class _Retry(Exception):
+    pass
+
+
+def _file(response: httpx.Response) -> types.File:
+    """Parses the File of a finished upload.
+
+    `types.File` rejects unknown fields, so this goes through the SDK's own
+    response parsing, which drops the fields the API added after this version.
+    """
+    return types.File._from_response(response=response.json()["file"], kwargs={})
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if retryable(response.status_code):
+        raise _Retry(f"HTTP {response.status_code}")
+    response.raise_for_status()
+    return response
+
+
+def _start(http, base_url, api_key, size, mime_type, display_name):
+    response = _check(
+        http.post(
+            f"{base_url}/upload/v1beta/files",
+            headers={
+                "x-goog-api-key": api_key,
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(size),
+                "X-Goog-Upload-Header-Content-Type": mime_type,
+            },
+            json={"file": {"display_name": display_name}},
+        )
+    )
+    granularity = int(response.headers.get("X-Goog-Upload-Chunk-Granularity", 1))
+    return response.headers["X-Goog-Upload-URL"], granularity
+
+
+def _query(http, url):
+    """Returns the offset the server has, or the finished upload's response, or None if the session is gone."""
+    response = http.post(url, headers={"X-Goog-Upload-Command": "query"})
+    if response.status_code >= 400:
+        if retryable(response.status_code):
+            raise _Retry(f"HTTP {response.status_code}")
+        return None
+    if response.headers.get("X-Goog-Upload-Status") == "final":
+        return response
+    return int(response.headers["X-Goog-Upload-Size-Received"])
+
+
+def _pieces(view, start, end, total, on_progress):
+    for offset in range(start, end, PIECE_BYTES):
+        piece_end = min(offset + PIECE_BYTES, end)
+        piece = view[offset:piece_end]
+        try:
+            yield piece
+        finally:
+            # The memory map can't be closed while a slice of it is alive,
+            # e.g. in the traceback of a failed request.
+            piece.release()
+        if on_progress:
+            on_progress(piece_end, total)
+
+
+def upload_resumable(
+    api_key: str,
+    path,
+    mime_type: str,
+    display_name: str = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    state_path=DEFAULT_STATE_PATH,
+    on_progress=None,
+    on_throughput=None,
+    base_url: str = BASE_URL,
+    http: httpx.Client = None,
+    retries: int = RETRIES,
+) -> types.File:
+    """Uploads the file at `path` in `chunk_size` requests, resuming a previous attempt.
+
+    `on_progress(sent, total)` is called as bytes go out, and
+    `on_throughput(bytes_per_second)` after each chunk with its throughput.
+    `chunk_size` is rounded down to the granularity the server asks for.
+    Pass `http` to reuse one `httpx.Client` (and its connections) across uploads.
+    A chunk failing `retries` more times in a row raises; the upload can be
+    resumed by calling this again.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        raise ValueError(f"{path} is empty")
+    sessions = UploadSessions(state_path)
+    key = UploadSessions.key(path)
+
+    with contextlib.ExitStack() as stack:
+        if http is None:
+            http = stack.enter_context(httpx.Client(timeout=TIMEOUT_SECONDS))
+        f = stack.enter_context(open(path, "rb"))
+        mapped = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        view = stack.enter_context(memoryview(mapped))
+        session = sessions.get(key)
+        offset = None
+        if session:
+            url, granularity = session["url"], session["granularity"]
+            offset = _query(http, url)
+            if isinstance(offset, httpx.Response):
+                sessions.remove(key)
+                return _file(offset)
+            if offset is None:
+                print(f"[Info] The upload session of {path} expired, starting over")
+            else:
+                print(f"[Info] Resuming the upload of {path} at {offset / 1e6:.1f} of {size / 1e6:.1f} MB")
+        if offset is None:
+            url, granularity = _start(http, base_url, api_key, size, mime_type, display_name)
+            offset = 0
+            sessions.save(key, url, offset, granularity)
+        chunk = max(granularity, chunk_size // granularity * granularity)
+
+        failures = 0
+        while True:
+            end = min(offset + chunk, size)
+            command = "upload, finalize" if end == size else "upload"
+            start_time = time.perf_counter()
+            pieces = _pieces(view, offset, end, size, on_progress)
+            try:
+                response = _check(
+                    http.post(
+                        url,
+                        headers={
+                            "Content-Length": str(end - offset),
+                            "X-Goog-Upload-Offset": str(offset),
+                            "X-Goog-Upload-Command": command,
+                        },
+                        content=pieces,
+                    )
+                )
+            except (httpx.TransportError, _Retry) as e:
+                failures += 1
+                if failures > retries:
+                    raise
+                delay = backoff(failures - 1)
+                print(f"[Info] Chunk at {offset} failed ({e!r}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                try:
+                    # Part of the chunk may have arrived.
+                    server_offset = _query(http, url)
+                except (httpx.TransportError, _Retry):
+                    continue
+                if server_offset is None:
+                    sessions.remove(key)
+                    raise RuntimeError(f"The upload session of {path} is gone") from e
+                if isinstance(server_offset, httpx.Response):
+                    response, end = server_offset, size
+                else:
+                    offset = server_offset
+                    continue
+            finally:
+                pieces.close()
+
+            failures = 0
+            if on_throughput:
+                on_throughput((end - offset) / max(time.perf_counter() - start_time, 1e-9))
+            offset = end
+            if offset == size:
+                sessions.remove(key)
+                return _file(response)
+            sessions.save(key, url, offset, granularity)
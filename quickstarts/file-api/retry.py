@@ -0,0 +1,36 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The retry policy shared by `bulk_upload.py` and `resumable_upload.py`.
+
+Timeouts, rate limiting (429) and server errors are retried; other errors
+aren't. Retries wait a random delay up to a bound that doubles on each attempt
+("full jitter"), so that many clients failing at once don't retry in lockstep.
+"""
+
+import random
+
+RETRYABLE_CODES = frozenset({408, 429, 500, 502, 503, 504})
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def retryable(status_code: int) -> bool:
+    return status_code in RETRYABLE_CODES
+
+
+def backoff(attempt: int) -> float:
+    """The delay before the retry following failed attempt `attempt`, counted from 0."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2**attempt))
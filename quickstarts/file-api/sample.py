@@ -13,8 +13,43 @@
 # limitations under the License.
 
 from google import genai
+import argparse
+import asyncio
 import os
+import sys
+import time
 from dotenv import load_dotenv
+from bulk_upload import BulkUploader, expand
+from resumable_upload import upload_resumable
+from upload_cache import DEFAULT_PATH, UploadCache, upload_cached
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--file", default="/content/image.png", help="file to upload")
+parser.add_argument("--mime-type", default="image/png")
+parser.add_argument(
+    "--cache",
+    default=DEFAULT_PATH,
+    help="SQLite index of uploads, so unchanged files aren't uploaded again",
+)
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="always upload, and delete the file at the end",
+)
+parser.add_argument(
+    "--bulk",
+    metavar="DIR_OR_GLOB",
+    help="upload every file of a directory or glob (e.g. 'photos/**/*.jpg') and describe each one",
+)
+parser.add_argument("--concurrency", type=int, default=8, help="files handled at once in --bulk mode")
+parser.add_argument("--retries", type=int, default=4, help="retries of a failed request in --bulk mode")
+parser.add_argument(
+    "--resumable",
+    action="store_true",
+    help="upload in chunks, and continue an interrupted upload of the same file when run again",
+)
+parser.add_argument("--chunk-mb", type=int, default=8, help="chunk size of --resumable uploads")
+args = parser.parse_args()
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,25 +58,79 @@ api_key = os.environ["GOOGLE_API_KEY"]
 # Initialize Google API Client
 client=genai.Client(api_key=api_key)
 
+prompt = "Describe the image with a creative description"
+model_name = "gemini-2.5-flash"
+
+if args.bulk:
+    # Upload the files through a pool of workers, each describing its file once it's ACTIVE
+    paths = expand(args.bulk)
+    print(f"Uploading {len(paths)} files, {args.concurrency} at a time")
+    cache = None if args.no_cache else UploadCache(args.cache)
+    uploader = BulkUploader(
+        client,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        prompt=prompt,
+        model=model_name,
+        cache=cache,
+        delete=args.no_cache,
+    )
+    try:
+        asyncio.run(uploader.run(paths))
+    finally:
+        if cache:
+            cache.close()
+        print(uploader.status())
+    sys.exit(1 if uploader.failed else 0)
+
+def show_progress(sent, total):
+    print(f"\rUploaded {sent / 1e6:.1f} of {total / 1e6:.1f} MB", end="\n" if sent == total else "", flush=True)
+
+def resumable(path, mime_type, display_name):
+    # Streams the file from disk in chunks, the session is saved in .upload_sessions.json
+    return upload_resumable(
+        api_key,
+        path,
+        mime_type,
+        display_name,
+        chunk_size=args.chunk_mb << 20,
+        on_progress=show_progress,
+    )
+
 # Upload a sample file to the client.files API
-file_path = "/content/image.png"
+file_path = args.file
 display_name = "Gemini Logo"
-file_response = client.files.upload(
-    file=open(file_path, "rb"),
-    config={
-        "mime_type":"image/png",
-        "display_name":display_name
-    }
-)
-print(f"Uploaded file {file_response.display_name} as: {file_response.uri}")
+upload = resumable if args.resumable else None
+if args.no_cache:
+    if upload:
+        file_response = upload(file_path, args.mime_type, display_name)
+    else:
+        file_response = client.files.upload(
+            file=open(file_path, "rb"),
+            config={
+                "mime_type":args.mime_type,
+                "display_name":display_name
+            }
+        )
+    print(f"Uploaded file {file_response.display_name} as: {file_response.uri}")
+else:
+    # Reuse the file uploaded by an earlier run if the content hasn't changed
+    with UploadCache(args.cache) as cache:
+        file_response, reused = upload_cached(client, cache, file_path, args.mime_type, display_name, upload)
+    if reused:
+        print(f"Reused file {file_response.display_name} as: {file_response.uri}")
+    else:
+        print(f"Uploaded file {file_response.display_name} as: {file_response.uri}")
 
 # Retrieve the uploaded file from the client.files.get
 get_file =client.files.get(name=file_response.name)
+# Videos are processed for a while after the upload
+while get_file.state == "PROCESSING":
+    time.sleep(2)
+    get_file = client.files.get(name=file_response.name)
 print(f"Retrieved file {get_file.display_name} as: {get_file.uri}")
 
 # Generate content using the client.models API
-prompt = "Describe the image with a creative description"
-model_name = "gemini-2.5-flash"
 response = client.models.generate_content(
     model=model_name,
     contents=[
@@ -51,6 +140,7 @@ response = client.models.generate_content(
 )
 print(response.text)
 
-# Delete the sample file
-client.files.delete(name=file_response.name)
-print(f"Deleted file {file_response.display_name}")
+# Delete the sample file, unless it's kept for the next runs (it expires after 48 hours)
+if args.no_cache:
+    client.files.delete(name=file_response.name)
+    print(f"Deleted file {file_response.display_name}")
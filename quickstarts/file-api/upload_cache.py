@@ -0,0 +1,163 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reuses File API uploads of identical content instead of uploading it again.
+
+Uploaded files are kept by the File API for 48 hours. `UploadCache` remembers,
+in a small SQLite database, which remote file holds which content (the SHA-256
+of the bytes, plus the mime type), so running a pipeline again on the same
+inputs doesn't upload them again:
+
+```
+cache = UploadCache(".file_cache.sqlite")
+file, reused = upload_cached(client, cache, "image.png", "image/png")
+```
+
+A cached file is checked with `files.get` before being reused, since it may
+have been deleted or have failed processing. Entries about to expire are
+dropped.
+"""
+
+import datetime
+import hashlib
+import mmap
+import os
+import sqlite3
+
+from google.genai import errors, types
+
+DEFAULT_PATH = ".file_cache.sqlite"
+# Files expiring sooner than this aren't reused, so they don't expire while
+# the request using them is still running.
+EXPIRY_MARGIN = datetime.timedelta(hours=1)
+# Bytes hashed per update, so only one chunk of the mapped file is paged in at a time.
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_sha256(path) -> str:
+    """Returns the SHA-256 of the file at `path` as a hex string, without reading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # Empty files can't be mapped.
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for start in range(0, size, HASH_CHUNK_BYTES):
+                    digest.update(view[start:start + HASH_CHUNK_BYTES])
+    return digest.hexdigest()
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class UploadCache:
+    """SQLite index from (content SHA-256, mime type) to the uploaded file's name."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        with self.db:
+            self.db.execute(
+                """CREATE TABLE IF NOT EXISTS uploads (
+                    sha256 TEXT NOT NULL,
+                    mime_type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    uri TEXT,
+                    expires REAL,
+                    PRIMARY KEY (sha256, mime_type)
+                )"""
+            )
+
+    def lookup(self, sha256: str, mime_type: str):
+        """Returns the name of the file holding this content, or None."""
+        row = self.db.execute(
+            "SELECT name FROM uploads WHERE sha256 = ? AND mime_type = ?", (sha256, mime_type)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store(self, sha256: str, mime_type: str, file: types.File):
+        expires = file.expiration_time.timestamp() if file.expiration_time else None
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)",
+                (sha256, mime_type, file.name, file.uri, expires),
+            )
+
+    def evict(self, sha256: str, mime_type: str):
+        with self.db:
+            self.db.execute("DELETE FROM uploads WHERE sha256 = ? AND mime_type = ?", (sha256, mime_type))
+
+    def evict_name(self, name: str):
+        """Drops the entries of a remote file, e.g. after deleting it."""
+        with self.db:
+            self.db.execute("DELETE FROM uploads WHERE name = ?", (name,))
+
+    def evict_expired(self) -> int:
+        """Drops the entries expiring within EXPIRY_MARGIN, and returns how many."""
+        with self.db:
+            cursor = self.db.execute(
+                "DELETE FROM uploads WHERE expires < ?", ((_now() + EXPIRY_MARGIN).timestamp(),)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def reusable(file: types.File) -> bool:
+    """Whether a previously uploaded file can still be used in requests."""
+    if file.state == types.FileState.FAILED:
+        return False
+    return not file.expiration_time or file.expiration_time > _now() + EXPIRY_MARGIN
+
+
+def upload_cached(client, cache: UploadCache, path, mime_type: str, display_name=None, upload=None):
+    """Uploads the file at `path`, unless the same content was uploaded before.
+
+    Returns the `types.File` and whether it was reused. A reused file may still
+    be PROCESSING, like a new upload. `upload(path, mime_type, display_name)`
+    replaces `client.files.upload`, e.g. with `resumable_upload.upload_resumable`.
+    """
+    cache.evict_expired()
+    sha256 = file_sha256(path)
+    name = cache.lookup(sha256, mime_type)
+    if name:
+        try:
+            file = client.files.get(name=name)
+        except errors.ClientError:
+            # Deleted, or not visible to this API key.
+            file = None
+        if file and reusable(file):
+            return file, True
+        cache.evict(sha256, mime_type)
+
+    if upload:
+        file = upload(path, mime_type, display_name)
+    else:
+        file = client.files.upload(
+            file=path,
+            config={"mime_type": mime_type, "display_name": display_name},
+        )
+    cache.store(sha256, mime_type, file)
+    return file, False
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Removes the echo of the played audio from the microphone signal.
+
+Without headphones the microphone picks up the model's own voice, and the model
+then interrupts itself. `EchoCanceller` learns the echo path, from the speakers
+through the room to the microphone, with a frequency-domain NLMS adaptive
+filter, and subtracts the echo it predicts from each microphone chunk:
+
+```
+echo_canceller = EchoCanceller(rate=16000, reference_rate=24000)
+...
+echo_canceller.add_reference(chunk)     # Right before writing it to the speakers.
+echo_canceller.clear_reference()        # When playback is cut short.
+...
+mic = echo_canceller.process(mic)       # Right after reading it from the microphone.
+```
+
+The filter is split into partitions of `block` samples (PBFDAF, partitioned
+block frequency-domain adaptive filter), so covering `filter_seconds` of echo
+path costs a few FFTs per block. Adaptation pauses while the user talks over
+the played audio (Geigel double-talk detection), so their voice doesn't
+disturb the filter.
+
+`status()` reports the echo return loss enhancement (ERLE), how much quieter
+the echo is after cancellation, and the CPU time spent per second of audio.
+"""
+
+import collections
+import time
+
+import numpy as np
+
+from live_audio import dsp
+
+# Near-end louder than this fraction of the recent far-end peak is taken as the
+# user talking (Geigel detector). Laptop speakers can be about as loud at the
+# microphone as the played audio itself, so the echo is only assumed no louder.
+DOUBLE_TALK_THRESHOLD = 1.0
+# Fraction of the mean reference power added to each bin's power in the NLMS normalization.
+POWER_FLOOR = 0.1
+# The filter is reset when it makes a block this much louder (in power) than
+# it was, and than the echo usually is.
+DIVERGENCE_RATIO = 4.0
+# Reference blocks quieter than this peak are treated as silence.
+MIN_REFERENCE_PEAK = 100.0
+
+
+class EchoCanceller:
+    """Cancels the echo of a reference signal in a microphone signal, both 16-bit mono PCM."""
+
+    def __init__(
+        self,
+        rate: int = 16000,
+        reference_rate: int = 16000,
+        block: int = 256,
+        filter_seconds: float = 0.25,
+        step: float = 0.5,
+        max_reference_seconds: float = 1.0,
+    ):
+        self.rate = rate
+        self.reference_rate = reference_rate
+        self.block = block
+        self.partitions = max(1, int(np.ceil(filter_seconds * rate / block)))
+        self.step = step
+        self.max_reference = int(max_reference_seconds * rate)
+
+        self.frames_processed = 0
+        self.cpu_seconds = 0.0
+        self.double_talk_blocks = 0
+        self.resets = 0  # Times the filter diverged and started over.
+        self._echo_power = 0.0  # Microphone power while only the reference plays.
+        self._residual_power = 0.0  # The same after cancellation.
+
+        bins = block + 1
+        self._resampler = dsp.Resampler(reference_rate, rate) if reference_rate != rate else None
+        self._reference = np.zeros(0, dtype=np.float32)
+        self._near = np.zeros(0, dtype=np.float32)
+        self._previous = np.zeros(block, dtype=np.float32)
+        self._spectra = np.zeros((self.partitions, bins), dtype=np.complex64)  # Newest first.
+        self._weights = np.zeros((self.partitions, bins), dtype=np.complex64)
+        self._power = np.zeros(bins, dtype=np.float32)
+        self._peaks = collections.deque([0.0] * self.partitions, maxlen=self.partitions)
+        self._padded = np.zeros(2 * block, dtype=np.float32)
+        # Regularizes the normalization in quiet bins, about the power of a
+        # reference at the MIN_REFERENCE_PEAK level.
+        self._delta = np.float32(2 * block * MIN_REFERENCE_PEAK**2)
+
+    @property
+    def erle(self) -> float:
+        """Echo return loss enhancement in dB, while only the reference was playing."""
+        if not self._residual_power:
+            return 0.0
+        return 10 * np.log10(self._echo_power / self._residual_power)
+
+    def add_reference(self, pcm):
+        """Queues audio about to be played, at `reference_rate`."""
+        samples = self._resampler.process(pcm) if self._resampler else dsp.as_samples(pcm)
+        self._reference = np.concatenate((self._reference, samples.astype(np.float32)))
+        if len(self._reference) > self.max_reference:
+            # Playback got ahead of the microphone by more than the filter could cover anyway.
+            self._reference = self._reference[-self.max_reference:]
+
+    def clear_reference(self):
+        """Drops the queued reference, when playback stops before it's heard (barge-in).
+
+        Otherwise the filter would go on predicting the echo of audio that
+        never plays while the user talks, and diverge. The echo of the audio
+        already played stays in the filter.
+        """
+        self._reference = np.zeros(0, dtype=np.float32)
+        if self._resampler:
+            self._resampler = dsp.Resampler(self.reference_rate, self.rate)
+
+    def process(self, pcm) -> bytes:
+        """Returns the microphone chunk `pcm` with the echo removed.
+
+        Audio is processed in whole blocks: up to `block - 1` samples are held
+        back until the next call.
+        """
+        start = time.perf_counter()
+        self._near = np.concatenate((self._near, dsp.as_samples(pcm).astype(np.float32)))
+        count = len(self._near) // self.block * self.block
+        out = np.empty(count, dtype=np.float32)
+        for offset in range(0, count, self.block):
+            out[offset:offset + self.block] = self._process_block(self._near[offset:offset + self.block])
+        self._near = self._near[count:]
+        self.frames_processed += count
+        self.cpu_seconds += time.perf_counter() - start
+        return dsp.to_pcm(out).tobytes()
+
+    def status(self) -> str:
+        audio_seconds = self.frames_processed / self.rate
+        return (
+            f"ERLE {self.erle:.1f} dB, {self.double_talk_blocks * self.block / self.rate:.1f}s of double talk, "
+            f"{self.resets} filter resets, "
+            f"{self.cpu_seconds / max(audio_seconds, 1e-9) * 1000:.1f} ms of CPU per second of audio"
+        )
+
+    def _next_reference(self) -> np.ndarray:
+        reference = self._reference[:self.block]
+        self._reference = self._reference[len(reference):]
+        if len(reference) < self.block:
+            # Nothing is playing.
+            reference = np.concatenate((reference, np.zeros(self.block - len(reference), dtype=np.float32)))
+        return reference
+
+    def _process_block(self, near: np.ndarray) -> np.ndarray:
+        block = self.block
+        reference = self._next_reference()
+
+        # Overlap-save: the spectrum of the previous and current reference blocks.
+        self._spectra[1:] = self._spectra[:-1]
+        self._spectra[0] = np.fft.rfft(np.concatenate((self._previous, reference)))
+        self._previous = reference
+        # NLMS normalizes by the reference power over the whole filter length, per bin.
+        self._power = (self._spectra.real ** 2 + self._spectra.imag ** 2).sum(axis=0)
+
+        echo = np.fft.irfft((self._weights * self._spectra).sum(axis=0))[block:]
+        error = near - echo
+
+        self._peaks.append(float(np.abs(reference).max()))
+        far_peak = max(self._peaks)
+        if far_peak < MIN_REFERENCE_PEAK:
+            return error
+        if np.abs(near).max() > DOUBLE_TALK_THRESHOLD * far_peak:
+            self.double_talk_blocks += 1
+            return error
+
+        near_power = float(np.dot(near, near))
+        error_power = float(np.dot(error, error))
+        if error_power > DIVERGENCE_RATIO * max(near_power, self._echo_power):
+            # Undetected double talk, or a reference the filter can't track.
+            self._weights.fill(0)
+            self.resets += 1
+            return near
+        self._echo_power = 0.99 * self._echo_power + 0.01 * near_power
+        self._residual_power = 0.99 * self._residual_power + 0.01 * error_power
+
+        # NLMS update of every partition, constrained to `block` taps each so
+        # that the circular convolution stays a linear one.
+        self._padded[block:] = error
+        error_spectrum = np.fft.rfft(self._padded)
+        # Bins with little reference power get a huge step, which the constraint
+        # then spreads to their neighbours: floor the power at a fraction of the mean.
+        power = self._power + (POWER_FLOOR * self._power.mean() + self._delta)
+        gradient = np.conj(self._spectra) * (error_spectrum / power)
+        taps = np.fft.irfft(gradient, axis=1)
+        taps[:, block:] = 0
+        self._weights += self.step * np.fft.rfft(taps, axis=1).astype(np.complex64)
+        return error
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Crossfades between streams when a generation context is reset.
+
+After a reset (e.g. Lyria's `reset_context()`), the old stream stops and the new
+one only starts once the new context is up. Appending one after the other
+makes the switch audible: a hard cut, and silence if the new audio is late.
+`ContextCrossfader` sits between the receive loop and an `AudioPlayer`:
+
+```
+crossfader = ContextCrossfader(player, fade_seconds=0.25)
+...
+await session.reset_context()
+crossfader.reset()
+...
+crossfader.write(chunk)  # Instead of player.write(chunk)
+```
+
+The old audio still buffered in the player keeps playing. Once `fade_seconds`
+of new audio have arrived, the end of the old audio is crossfaded into the
+start of the new one. As long as the new context starts within the playout
+delay, the switch has no gap at all. Otherwise the old audio fades out, and the
+silence until the new audio fades in is measured.
+"""
+
+import time
+from typing import Optional
+
+from live_audio import dsp
+from live_audio.playback import AudioPlayer
+
+
+class ContextCrossfader:
+    """Writes to an `AudioPlayer`, crossfading across `reset()` calls."""
+
+    def __init__(self, player: AudioPlayer, fade_seconds: float = 0.25):
+        self.player = player
+        self.fade_frames = int(fade_seconds * player.rate)
+        self.channels = player.frame_size // dsp.PCM_DTYPE.itemsize
+        self.switches = []  # (spin-up seconds, gap heard in seconds) of each reset.
+
+        self._reset_time: Optional[float] = None
+        self._reset_underrun_frames = 0
+        self._pending = bytearray()
+
+    def reset(self):
+        """Marks the start of a new stream: audio written from now on belongs to it."""
+        self._reset_time = time.monotonic()
+        self._reset_underrun_frames = self.player.underrun_frames
+        self._pending.clear()
+        self.player.expecting_gap = True
+
+    def write(self, pcm):
+        if self._reset_time is None:
+            self.player.write(pcm)
+            return
+        self._pending += pcm
+        if len(self._pending) >= self.fade_frames * self.player.frame_size:
+            self._switch()
+
+    def _switch(self):
+        frame_size = self.player.frame_size
+        spin_up = time.monotonic() - self._reset_time
+        # Take back the end of the old audio that hasn't been played yet.
+        old_tail = self.player.ring.pop_tail(self.fade_frames * frame_size)
+        gap = (self.player.underrun_frames - self._reset_underrun_frames) / self.player.rate
+        new = bytes(self._pending)
+        self._pending.clear()
+        if old_tail:
+            overlap = len(old_tail)
+            self.player.ring.write(dsp.crossfade(old_tail, new[:overlap], self.channels).tobytes())
+        else:
+            # The old audio already ran out: fade in from silence.
+            overlap = self.fade_frames * frame_size
+            self.player.ring.write(dsp.fade(new[:overlap], 0.0, 1.0, self.channels).tobytes())
+        self.player.ring.write(new[overlap:])
+
+        self.switches.append((spin_up, gap))
+        self._reset_time = None
+        self.player.expecting_gap = False
+        if self.player.jitter_buffer:
+            # The new stream's arrivals have nothing to do with the old one's.
+            self.player.jitter_buffer.restart()
+
+    def status(self) -> str:
+        if not self.switches:
+            return "no context switches"
+        spin_up, gap = self.switches[-1]
+        return (
+            f"{len(self.switches)} context switches, last one: new audio after {spin_up:.2f}s, "
+            f"{gap:.2f}s gap heard (max {max(g for _, g in self.switches):.2f}s)"
+        )
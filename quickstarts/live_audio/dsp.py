@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Vectorized helpers for 16-bit PCM audio.
+
+The Live API sends and receives raw 16-bit little-endian PCM. Every function
+here accepts any bytes-like object (`bytes`, `bytearray`, `memoryview`) or an
+int16 NumPy array, and reads it through a zero-copy view. Functions producing
+audio take an optional `out` buffer, which can be the input itself when it's
+writable, so a chunk can be processed in place.
+
+Gains saturate: results are clipped to the int16 range instead of wrapping.
+
+```
+pip install numpy
+```
+"""
+
+import numpy as np
+
+PCM_DTYPE = np.dtype("<i2")  # 16-bit signed little-endian, as used by the Live API.
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+
+def as_samples(pcm) -> np.ndarray:
+    """Returns an int16 view of `pcm` without copying it.
+
+    The view is read-only when `pcm` is immutable (e.g. `bytes`).
+    """
+    if isinstance(pcm, np.ndarray):
+        return pcm
+    return np.frombuffer(pcm, dtype=PCM_DTYPE)
+
+
+def _output(out, like: np.ndarray) -> np.ndarray:
+    if out is None:
+        return np.empty_like(like, dtype=PCM_DTYPE)
+    out = as_samples(out)
+    if out.shape != like.shape:
+        raise ValueError(f"Output has {out.size} samples, expected {like.size}.")
+    return out
+
+
+def to_pcm(values: np.ndarray, out=None) -> np.ndarray:
+    """Clips float samples to the int16 range and writes them to `out`.
+
+    `values` is clipped in place.
+    """
+    out = _output(out, values)
+    np.clip(values, INT16_MIN, INT16_MAX, out=values)
+    # Casting truncates toward zero, like `int()` does.
+    np.copyto(out, values, casting="unsafe")
+    return out
+
+
+def apply_gain(pcm, gain: float, out=None) -> np.ndarray:
+    """Multiplies every sample by `gain`, saturating at the int16 limits.
+
+    The product is computed in float64, like `int(sample * gain)` in Python,
+    so the result matches that loop exactly. A float32 product differs from
+    it by one step on some samples for most gains.
+    """
+    samples = as_samples(pcm)
+    out = _output(out, samples)
+    return to_pcm(samples * np.float64(gain), out)
+
+
+def fade(pcm, start_gain: float, end_gain: float, channels: int = 1, out=None) -> np.ndarray:
+    """Applies a linear gain ramp from `start_gain` to `end_gain` over the buffer.
+
+    For interleaved multi-channel audio, pass `channels` so that all the
+    samples of a frame get the same gain.
+    """
+    samples = as_samples(pcm)
+    out = _output(out, samples)
+    frames = samples.reshape(-1, channels)
+    ramp = np.linspace(start_gain, end_gain, len(frames), endpoint=False, dtype=np.float32)
+    to_pcm(frames * ramp[:, None], out.reshape(-1, channels))
+    return out
+
+
+def mix(a, b, gain_a: float = 1.0, gain_b: float = 1.0, out=None) -> np.ndarray:
+    """Returns `a * gain_a + b * gain_b`, saturating at the int16 limits."""
+    a = as_samples(a)
+    b = as_samples(b)
+    if a.shape != b.shape:
+        raise ValueError(f"Cannot mix buffers of {a.size} and {b.size} samples.")
+    out = _output(out, a)
+    mixed = a * np.float32(gain_a)
+    mixed += b * np.float32(gain_b)
+    return to_pcm(mixed, out)
+
+
+def crossfade(a, b, channels: int = 1, out=None) -> np.ndarray:
+    """Fades from `a` to `b` over their whole length, with equal-power ramps.
+
+    Equal-power (cosine/sine) gains keep the loudness constant when the two
+    signals are uncorrelated, e.g. two different pieces of music.
+    """
+    a = as_samples(a)
+    b = as_samples(b)
+    if a.shape != b.shape:
+        raise ValueError(f"Cannot crossfade buffers of {a.size} and {b.size} samples.")
+    out = _output(out, a)
+    frames = a.size // channels
+    phase = (np.arange(frames, dtype=np.float32) + np.float32(0.5)) * np.float32(np.pi / 2 / max(frames, 1))
+    mixed = a.reshape(-1, channels) * np.cos(phase)[:, None]
+    mixed += b.reshape(-1, channels) * np.sin(phase)[:, None]
+    to_pcm(mixed, out.reshape(-1, channels))
+    return out
+
+
+def peak(pcm) -> int:
+    """Returns the largest absolute sample value."""
+    samples = as_samples(pcm)
+    if samples.size == 0:
+        return 0
+    # abs() of int16 would overflow on -32768, so compare the extremes instead.
+    return max(int(samples.max()), -int(samples.min()))
+
+
+def rms(pcm) -> float:
+    """Returns the root mean square of the samples."""
+    samples = as_samples(pcm)
+    if samples.size == 0:
+        return 0.0
+    energy = np.einsum("i,i->", samples.ravel(), samples.ravel(), dtype=np.int64)
+    return float(np.sqrt(energy / samples.size))
+
+
+def frame_rms(pcm, frame_samples: int, channels: int = 1) -> np.ndarray:
+    """Returns the root mean square of each frame of `frame_samples` samples per channel.
+
+    A trailing partial frame is ignored.
+    """
+    samples = as_samples(pcm)
+    frame_size = frame_samples * channels
+    count = samples.size // frame_size
+    frames = samples[:count * frame_size].reshape(count, frame_size)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.int64)
+    return np.sqrt(energy / frame_size)
+
+
+def to_dbfs(level: float) -> float:
+    """Converts a peak or RMS level to dB relative to full scale."""
+    if level <= 0:
+        return float("-inf")
+    return float(20 * np.log10(level / 32768))
+
+
+class Resampler:
+    """Streaming linear-interpolation resampler for interleaved 16-bit PCM.
+
+    Output sample positions are tracked as exact fractions of the input rate,
+    so any number of chunks can be resampled without the output drifting from
+    `dst_rate / src_rate` times the input length.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: int = 1):
+        divisor = np.gcd(src_rate, dst_rate)
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.channels = channels
+        # Positions are in units of 1 / self._dst of an input sample.
+        self._src = src_rate // divisor
+        self._dst = dst_rate // divisor
+        self._phase = self._dst  # The first output sample lands on the first input sample.
+        self._previous = np.zeros((1, channels), dtype=np.float32)
+        # Streams usually arrive in equally sized chunks, so the interpolation
+        # indices and weights only take a few distinct values.
+        self._plans = {}
+
+    def _plan(self, last: int):
+        key = (self._phase, last)
+        plan = self._plans.get(key)
+        if plan is None:
+            count = (last * self._dst - self._phase) // self._src + 1 if self._phase <= last * self._dst else 0
+            positions = self._phase + self._src * np.arange(count, dtype=np.int64)
+            index, remainder = np.divmod(positions, self._dst)
+            weight = (remainder / self._dst).astype(np.float32)[:, None]
+            if len(self._plans) > 64:
+                self._plans.clear()
+            plan = self._plans[key] = (count, index, index + 1, weight)
+        return plan
+
+    def process(self, pcm) -> np.ndarray:
+        """Resamples a chunk and returns the int16 samples ready so far."""
+        frames = as_samples(pcm).reshape(-1, self.channels)
+        if len(frames) == 0:
+            return np.empty(0, dtype=PCM_DTYPE)
+
+        # Prepend the last frame of the previous chunk so that output samples
+        # falling between two chunks can be interpolated, and repeat the last
+        # frame so that an output landing exactly on it has a right neighbour.
+        extended = np.concatenate((self._previous, frames, frames[-1:]), dtype=np.float32)
+        last = len(frames)
+        count, left_index, right_index, weight = self._plan(last)
+
+        left = extended[left_index]
+        right = extended[right_index]
+        right -= left
+        right *= weight
+        left += right
+
+        self._phase += count * self._src - last * self._dst
+        self._previous = extended[-1:]
+        np.rint(left, out=left)
+        return to_pcm(left).reshape(-1)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Adapts the playout delay of streamed audio to the network jitter.
+
+A fixed prebuffer is either too short for a bad network, causing drop-outs, or
+longer than needed, delaying every change of the stream. `JitterBuffer` measures
+how late each chunk arrives compared with the stream's own clock, and picks the
+smallest playout delay that would have been late for no more than
+`target_underrun_rate` of the recent chunks:
+
+```
+jitter_buffer = JitterBuffer(rate=48000, initial_delay=1.0)
+player = AudioPlayer(stream, 48000, 2, 4200, jitter_buffer=jitter_buffer)
+```
+
+The delay grows as soon as an underrun happens, and shrinks slowly, by at most
+`shrink_rate` seconds per second, once playback has been stable for
+`stable_seconds`.
+
+The delay playback actually runs with is measured at each arrival, as the
+audio still buffered plus the lateness of the chunk. The player skips the
+`excess_frames()` above the chosen delay to bring it down.
+"""
+
+import collections
+import threading
+import time
+from typing import Optional
+
+
+class JitterBuffer:
+    """Tracks chunk arrival jitter and the resulting playout delay, in seconds."""
+
+    def __init__(
+        self,
+        rate: int,
+        target_underrun_rate: float = 0.01,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 5.0,
+        window: int = 200,
+        grow_factor: float = 1.5,
+        shrink_rate: float = 0.01,
+        stable_seconds: float = 10.0,
+    ):
+        self.rate = rate
+        self.target_underrun_rate = target_underrun_rate
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.grow_factor = grow_factor
+        self.shrink_rate = shrink_rate
+        self.stable_seconds = stable_seconds
+
+        self.delay = initial_delay
+        self.effective_delay: Optional[float] = None  # The delay playback is running with.
+        self.underruns = 0
+        self._transits = collections.deque(maxlen=window)
+        self._frames_received = 0
+        self._stable_since = None  # Time of the first arrival, or of the last underrun.
+        self._last_update = None
+        self._lock = threading.Lock()
+
+    @property
+    def delay_frames(self) -> int:
+        return int(self.delay * self.rate)
+
+    def jitter_delay(self) -> Optional[float]:
+        """The delay that covers all but `target_underrun_rate` of the recent arrivals."""
+        with self._lock:
+            if len(self._transits) < 2:
+                return None
+            # Lateness of each chunk relative to the earliest one, on the stream's clock.
+            base = min(self._transits)
+            lateness = sorted(transit - base for transit in self._transits)
+        index = min(len(lateness) - 1, int(len(lateness) * (1 - self.target_underrun_rate)))
+        return lateness[index]
+
+    def on_arrival(self, frames: int, buffered_frames: Optional[int] = None, now: Optional[float] = None):
+        """Records a chunk of `frames` frames received at `now`.
+
+        `buffered_frames` is the audio left to play when it arrived, if playing.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            # The chunk's first frame belongs at this point of the stream.
+            transit = now - self._frames_received / self.rate
+            if self._transits and transit - min(self._transits) > self.max_delay:
+                # The stream was paused, or stalled for longer than any delay
+                # could cover: measure from scratch.
+                self._transits.clear()
+            self._transits.append(transit)
+            self._frames_received += frames
+            if buffered_frames is not None:
+                self.effective_delay = buffered_frames / self.rate + transit - min(self._transits)
+            if self._stable_since is None:
+                self._stable_since = now
+
+    def on_underrun(self, now: Optional[float] = None):
+        """Grows the delay after the player ran out of audio."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.underruns += 1
+            self._stable_since = now
+            self.effective_delay = None
+            self.delay = min(self.max_delay, max(self.min_delay, self.delay * self.grow_factor))
+
+    def update(self, now: Optional[float] = None) -> float:
+        """Moves the delay towards what the measured jitter needs and returns it."""
+        now = time.monotonic() if now is None else now
+        needed = self.jitter_delay()
+        with self._lock:
+            elapsed = 0.0 if self._last_update is None else now - self._last_update
+            self._last_update = now
+            if needed is None:
+                return self.delay
+            needed = min(self.max_delay, max(self.min_delay, needed))
+            if needed > self.delay:
+                self.delay = needed
+            elif self._stable_since is not None and now - self._stable_since >= self.stable_seconds:
+                self.delay = max(needed, self.delay - self.shrink_rate * elapsed)
+            return self.delay
+
+    def excess_frames(self) -> int:
+        """Frames by which playback runs behind the chosen delay."""
+        with self._lock:
+            if self.effective_delay is None:
+                return 0
+            return max(0, int((self.effective_delay - self.delay) * self.rate))
+
+    def on_skip(self, frames: int):
+        """Records that the player skipped `frames` frames to shrink its delay."""
+        with self._lock:
+            if self.effective_delay is not None:
+                self.effective_delay -= frames / self.rate
+
+    def restart(self):
+        """Forgets the arrival history, e.g. when a new stream starts after a deliberate gap."""
+        with self._lock:
+            self._transits.clear()
+            self._frames_received = 0
+            self.effective_delay = None
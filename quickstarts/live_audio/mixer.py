@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Mixes several 16-bit PCM inputs onto a single output clock.
+
+Each input is resampled to the output rate as it's written and buffered.
+`Mixer.read()` then pulls the same number of frames from every input, applies
+the per-input gains and returns one saturated block, ready to be written to a
+single audio device stream.
+
+```
+mixer = Mixer(rate=24000)
+original = mixer.add_input("original", rate=16000, gain=0.08)
+translation = mixer.add_input("translation")
+...
+stream.write(mixer.read(480))
+```
+
+Because every input is played against the same output frame counter, the mixer
+can also report exactly when a given piece of audio is heard, see
+`MixerInput.mark_end()` and `MixerInput.mark_next()`.
+
+Inputs that must stay in step with each other, like layers of the same piece of
+music, are added with `realign=True` and started with `Mixer.start_together()`:
+they all start on the same output frame, and an input that runs dry drops its
+late audio to catch up rather than playing behind the others.
+"""
+
+import collections
+from typing import Callable, Optional
+
+import numpy as np
+
+from live_audio import dsp
+
+
+class MixerInput:
+    """One input of a `Mixer`. Create it with `Mixer.add_input()`."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: int,
+        out_rate: int,
+        channels: int,
+        gain: float,
+        prebuffer_frames: int,
+        realign: bool = False,
+    ):
+        self.name = name
+        self.gain = gain
+        self.channels = channels
+        # Frames this input must have buffered before it starts (or resumes
+        # after running dry), to absorb the jitter of whoever writes to it.
+        self.prebuffer_frames = prebuffer_frames
+        # Keep playing after running dry, and skip the audio that arrives late.
+        self.realign = realign
+
+        # All counters are in frames at the output rate.
+        self.frames_written = 0
+        self.frames_consumed = 0
+        self.starved_frames = 0  # Zero-filled while the input was playing.
+        self.skipped_frames = 0  # Dropped because they arrived too late, with `realign`.
+
+        self._resampler = dsp.Resampler(rate, out_rate, channels) if rate != out_rate else None
+        self._chunks = collections.deque()
+        self._offset = 0  # Frames already consumed from self._chunks[0].
+        self._playing = False
+        self._late_frames = 0  # Frames owed to the output clock, with `realign`.
+        self._last_end = 0  # Output frame at which the last consumed frame ended.
+        self._marks = collections.deque()
+
+    @property
+    def buffered_frames(self) -> int:
+        return self.frames_written - self.frames_consumed
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough audio is buffered to start playing."""
+        return bool(self.buffered_frames) and self.buffered_frames >= self.prebuffer_frames
+
+    def write(self, pcm):
+        """Queues PCM audio at the input rate."""
+        samples = dsp.as_samples(pcm)
+        if self._resampler:
+            samples = self._resampler.process(samples)
+        frames = samples.reshape(-1, self.channels)
+        if len(frames):
+            self._chunks.append(frames)
+            self.frames_written += len(frames)
+
+    def mark_end(self, tag):
+        """Reports the output frame at which the audio written so far finishes playing.
+
+        The mixer's `on_mark(input_name, tag, output_frame)` is called once
+        that frame is known.
+        """
+        self._marks.append((self.frames_written, False, tag))
+
+    def mark_next(self, tag):
+        """Reports the output frame at which the next audio written starts playing."""
+        self._marks.append((self.frames_written, True, tag))
+
+    def finish(self):
+        """Signals that no more audio will be written, so what's left plays without prebuffering."""
+        self.prebuffer_frames = 0
+
+    def clear(self):
+        """Drops all the buffered audio."""
+        self._chunks.clear()
+        self._offset = 0
+        self.frames_consumed = self.frames_written
+        self._late_frames = 0
+        if self.realign:
+            self._playing = False
+
+    def _skip(self, frames: int) -> int:
+        skipped = 0
+        while skipped < frames and self._chunks:
+            count = min(frames - skipped, len(self._chunks[0]) - self._offset)
+            skipped += count
+            self._offset += count
+            if self._offset == len(self._chunks[0]):
+                self._chunks.popleft()
+                self._offset = 0
+        self.frames_consumed += skipped
+        self.skipped_frames += skipped
+        return skipped
+
+    def _mix_into(self, accumulator: np.ndarray, out_frame: int, on_mark: Optional[Callable]):
+        frames = len(accumulator)
+        if not self._playing and self.ready:
+            self._playing = True
+        if self._late_frames:
+            self._late_frames -= self._skip(self._late_frames)
+
+        start = self.frames_consumed
+        filled = 0
+        while self._playing and filled < frames and self._chunks:
+            chunk = self._chunks[0]
+            count = min(frames - filled, len(chunk) - self._offset)
+            if self.gain:
+                accumulator[filled:filled + count] += chunk[self._offset:self._offset + count] * np.float32(self.gain)
+            filled += count
+            self._offset += count
+            if self._offset == len(chunk):
+                self._chunks.popleft()
+                self._offset = 0
+        self.frames_consumed += filled
+
+        while self._marks:
+            position, next_frame, tag = self._marks[0]
+            if position > self.frames_consumed or (next_frame and position == self.frames_consumed):
+                break
+            self._marks.popleft()
+            if position > start or (next_frame and position == start):
+                played_at = out_frame + position - start
+            else:
+                played_at = self._last_end
+            if on_mark:
+                on_mark(self.name, tag, played_at)
+
+        if filled:
+            self._last_end = out_frame + filled
+        if self._playing and filled < frames:
+            self.starved_frames += frames - filled
+            if self.realign:
+                self._late_frames += frames - filled
+            else:
+                self._playing = False
+
+
+class Mixer:
+    """Mixes `MixerInput`s into blocks of 16-bit PCM at `rate`."""
+
+    def __init__(self, rate: int, channels: int = 1, on_mark: Optional[Callable] = None):
+        self.rate = rate
+        self.channels = channels
+        self.inputs: list[MixerInput] = []
+        self.frames_out = 0
+        self._on_mark = on_mark
+        self._holding = False
+        self._accumulator = np.zeros((0, channels), dtype=np.float32)
+
+    def add_input(
+        self,
+        name: str,
+        rate: Optional[int] = None,
+        gain: float = 1.0,
+        prebuffer_frames: int = 0,
+        realign: bool = False,
+    ) -> MixerInput:
+        """Adds an input sampled at `rate` (the output rate by default)."""
+        mixer_input = MixerInput(name, rate or self.rate, self.rate, self.channels, gain, prebuffer_frames, realign)
+        self.inputs.append(mixer_input)
+        return mixer_input
+
+    def start_together(self):
+        """Plays silence until every input is ready, then starts them on the same frame.
+
+        The inputs already playing are cleared, e.g. after all their streams
+        were restarted.
+        """
+        for mixer_input in self.inputs:
+            mixer_input.clear()
+            mixer_input._playing = False
+        self._holding = True
+
+    def read(self, frames: int) -> bytes:
+        """Mixes the next `frames` output frames. Inputs without audio contribute silence."""
+        if len(self._accumulator) != frames:
+            self._accumulator = np.zeros((frames, self.channels), dtype=np.float32)
+        else:
+            self._accumulator.fill(0)
+        if self._holding and all(mixer_input.ready for mixer_input in self.inputs):
+            self._holding = False
+        for mixer_input in self.inputs if not self._holding else ():
+            mixer_input._mix_into(self._accumulator, self.frames_out, self._on_mark)
+        self.frames_out += frames
+        return dsp.to_pcm(self._accumulator).tobytes()
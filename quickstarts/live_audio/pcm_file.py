@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reads local 16-bit PCM files without decoding them.
+
+Local WAV files (and headerless `.pcm`/`.raw` files) that are already 16-bit
+PCM at the sample rate and channel count the Live API expects don't need to go
+through ffmpeg. `open_pcm()` memory-maps them instead, so streaming one costs no
+process startup and no pipe copies:
+
+```
+pcm_file = open_pcm("clip.wav", rate=16000, channels=1)
+if pcm_file is None:
+    ...  # Not a matching local file, decode it with ffmpeg.
+with pcm_file:
+    for chunk in pcm_file.chunks(3200):
+        ...
+```
+"""
+
+import mmap
+import os
+import struct
+import urllib.parse
+import urllib.request
+from typing import Iterator, Optional
+
+RAW_EXTENSIONS = (".pcm", ".raw")  # Headerless files, assumed to be in the requested format.
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+SAMPLE_WIDTH = 2
+
+
+class PcmFile:
+    """The samples of a memory-mapped PCM file. Create it with `open_pcm()`."""
+
+    def __init__(self, path: str, data_offset: int = 0, data_size: Optional[int] = None, frame_size: int = SAMPLE_WIDTH):
+        self.path = path
+        with open(path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            # mmap can't map empty files.
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if file_size else None
+        available = max(0, file_size - data_offset)
+        size = available if data_size is None else min(data_size, available)
+        self.start = data_offset
+        self.size = size - size % frame_size  # Drop a trailing partial frame.
+
+    def chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Yields the samples in `chunk_size` byte chunks, the last one possibly shorter."""
+        end = self.start + self.size
+        for offset in range(self.start, end, chunk_size):
+            yield self._mmap[offset:min(offset + chunk_size, end)]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def local_path(url: str) -> Optional[str]:
+    """Returns the local file `url` refers to (a path or a file:// URL), if any."""
+    if os.path.isfile(url):
+        return url
+    parsed = urllib.parse.urlparse(url)
+    if parsed.scheme == "file":
+        path = urllib.request.url2pathname(parsed.path)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _wav_data(f, rate: int, channels: int) -> Optional[tuple[int, int]]:
+    """Returns the (offset, size) of the data chunk of a WAV file in the requested format."""
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+        return None
+
+    matches_format = False
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        if chunk_id == b"fmt ":
+            fmt = f.read(chunk_size)
+            if len(fmt) < 16:
+                return None
+            format_tag, file_channels, file_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                # The sub-format GUID starts with the actual format tag.
+                format_tag = struct.unpack("<H", fmt[24:26])[0]
+            matches_format = (
+                format_tag == WAVE_FORMAT_PCM
+                and bits == 8 * SAMPLE_WIDTH
+                and file_rate == rate
+                and file_channels == channels
+            )
+            if not matches_format:
+                return None
+            f.seek(chunk_size % 2, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if not matches_format:
+                return None  # No "fmt " chunk before the samples.
+            # Files written while recording may leave the size at 0 or 0xFFFFFFFF.
+            return f.tell(), chunk_size if chunk_size not in (0, 0xFFFFFFFF) else None
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+def open_pcm(url: str, rate: int, channels: int) -> Optional[PcmFile]:
+    """Memory-maps `url` if it's a local 16-bit PCM file at `rate` with `channels`.
+
+    Returns None for anything that needs decoding: remote URLs, compressed or
+    differently sampled audio, and files that can't be read.
+    """
+    path = local_path(url)
+    if path is None:
+        return None
+    try:
+        if path.lower().endswith(RAW_EXTENSIONS):
+            return PcmFile(path, frame_size=SAMPLE_WIDTH * channels)
+        with open(path, "rb") as f:
+            data = _wav_data(f, rate, channels)
+        if data is None:
+            return None
+        return PcmFile(path, *data, frame_size=SAMPLE_WIDTH * channels)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Plays PCM audio from a dedicated thread.
+
+Writing to a blocking PyAudio stream from a coroutine stalls the whole event
+loop while the device plays. `AudioPlayer` owns the stream in its own thread
+instead and feeds it from a preallocated `RingBuffer`, so the event loop only
+copies the received bytes in:
+
+```
+stream = pya.open(format=pyaudio.paInt16, channels=2, rate=48000, output=True, frames_per_buffer=4200)
+player = AudioPlayer(stream, rate=48000, channels=2, frames_per_buffer=4200, prebuffer_seconds=1)
+player.start()
+async for message in session.receive():
+    player.write(message.server_content.audio_chunks[0].data)
+...
+player.stop()
+```
+
+The player plays silence while the buffer is empty, and counts those
+underruns. `AudioPlayer.status()` summarizes them along with the fill level.
+
+With a `JitterBuffer`, the prebuffer follows the measured network jitter
+instead: playback pauses to rebuffer after an underrun, and excess buffered
+audio is skipped a little at a time when the delay shrinks, crossfading the
+audio on either side of each skip.
+
+When the stream is paused at its source, call `pause()` so that the buffer
+running dry isn't taken for network trouble, and `resume()` when asking for
+the stream again.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from live_audio import dsp
+from live_audio.jitter import JitterBuffer
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+class RingBuffer:
+    """A fixed-size FIFO of bytes, for one writer thread and one reader thread."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = memoryview(bytearray(capacity))
+        self._lock = threading.Lock()
+        # Total bytes written and read, the positions are these modulo the capacity.
+        self._written = 0
+        self._read = 0
+
+    @property
+    def available(self) -> int:
+        """Bytes that can be read."""
+        return self._written - self._read
+
+    @property
+    def free(self) -> int:
+        """Bytes that can be written."""
+        return self.capacity - self.available
+
+    def write(self, data) -> int:
+        """Copies as much of `data` as fits. Returns the number of bytes written."""
+        data = memoryview(data).cast("B")
+        with self._lock:
+            count = min(len(data), self.capacity - (self._written - self._read))
+            self._copy_in(self._written % self.capacity, data[:count])
+            self._written += count
+        return count
+
+    def read_into(self, out) -> int:
+        """Moves up to `len(out)` bytes into `out`. Returns the number of bytes read."""
+        out = memoryview(out).cast("B")
+        with self._lock:
+            count = min(len(out), self._written - self._read)
+            start = self._read % self.capacity
+            first = min(count, self.capacity - start)
+            out[:first] = self._buffer[start:start + first]
+            out[first:count] = self._buffer[:count - first]
+            self._read += count
+        return count
+
+    def discard(self, count: int) -> int:
+        """Drops up to `count` bytes. Returns the number of bytes dropped."""
+        with self._lock:
+            count = min(count, self._written - self._read)
+            self._read += count
+        return count
+
+    def clear(self):
+        with self._lock:
+            self._read = self._written
+
+    def pop_tail(self, count: int) -> bytes:
+        """Removes and returns up to the last `count` bytes written that haven't been read."""
+        with self._lock:
+            count = min(count, self._written - self._read)
+            start = (self._written - count) % self.capacity
+            first = min(count, self.capacity - start)
+            tail = bytes(self._buffer[start:start + first]) + bytes(self._buffer[:count - first])
+            self._written -= count
+        return tail
+
+    def _copy_in(self, start: int, data: memoryview):
+        first = min(len(data), self.capacity - start)
+        self._buffer[start:start + first] = data[:first]
+        self._buffer[:len(data) - first] = data[first:]
+
+
+class AudioPlayer:
+    """Writes audio from a `RingBuffer` to a blocking output stream, from its own thread.
+
+    Playback starts once `prebuffer_seconds` of audio are buffered, or the
+    delay chosen by `jitter_buffer`. Audio written while the buffer is full is
+    dropped and counted in `dropped_frames`.
+    """
+
+    # Most audio skipped per device buffer to shrink the delay: 1% speeds the
+    # stream up by less than a listener would notice.
+    MAX_SKIP_FRACTION = 0.01
+    # The audio before and after a skip is crossfaded over this long, so that
+    # the jump doesn't click.
+    SKIP_CROSSFADE_SECONDS = 0.01
+
+    def __init__(
+        self,
+        stream,
+        rate: int,
+        channels: int,
+        frames_per_buffer: int,
+        prebuffer_seconds: float = 0.0,
+        capacity_seconds: float = 10.0,
+        jitter_buffer: Optional[JitterBuffer] = None,
+    ):
+        self.stream = stream
+        self.rate = rate
+        self.channels = channels
+        self.frame_size = SAMPLE_WIDTH * channels
+        self.frames_per_buffer = frames_per_buffer
+        self.prebuffer_frames = int(prebuffer_seconds * rate)
+        self.ring = RingBuffer(int(capacity_seconds * rate) * self.frame_size)
+        self.jitter_buffer = jitter_buffer
+
+        self.frames_played = 0
+        self.underruns = 0  # Device buffers that couldn't be filled while playing.
+        self.underrun_frames = 0
+        self.dropped_frames = 0
+        self.skipped_frames = 0  # Skipped to shrink the playout delay.
+
+        self.expecting_gap = False  # Set while a gap is expected, e.g. a context reset.
+        self._resuming = False  # Set by `resume()` until audio arrives again.
+        self._playing = False
+        self._block_start = (0, 0.0, 0)  # frames_played, time and frames of the last device buffer.
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def buffered_seconds(self) -> float:
+        return self.ring.available / self.frame_size / self.rate
+
+    @property
+    def played_seconds(self) -> float:
+        """Seconds of audio played so far, interpolated within the current device buffer."""
+        frames, start_time, block_frames = self._block_start
+        return (frames + min(block_frames, (time.monotonic() - start_time) * self.rate)) / self.rate
+
+    @property
+    def fill_level(self) -> float:
+        """Fraction of the ring buffer in use."""
+        return self.ring.available / self.ring.capacity
+
+    def write(self, pcm):
+        """Queues audio for playback, without blocking."""
+        if self._resuming:
+            # The gap of the pause is over.
+            self._resuming = False
+            self.expecting_gap = False
+            if self.jitter_buffer:
+                # The resumed stream's arrivals have nothing to do with the paused one's.
+                self.jitter_buffer.restart()
+        if self.jitter_buffer:
+            buffered_frames = self.ring.available // self.frame_size if self._playing else None
+            self.jitter_buffer.on_arrival(len(pcm) // self.frame_size, buffered_frames)
+        written = self.ring.write(pcm)
+        if written < len(pcm):
+            self.dropped_frames += (len(pcm) - written) // self.frame_size
+
+    def clear(self):
+        """Drops the buffered audio."""
+        self.ring.clear()
+
+    def pause(self):
+        """Expects the buffer to run dry, after pausing the stream at its source."""
+        self._resuming = False
+        self.expecting_gap = True
+
+    def resume(self):
+        """Ends the gap expected since `pause()` once audio is written again."""
+        self._resuming = True
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="AudioPlayer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the playback thread after the buffer it's currently playing."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def status(self) -> str:
+        text = (
+            f"buffered {self.buffered_seconds:.2f}s ({self.fill_level:.0%} full), "
+            f"{self.underruns} underruns ({self.underrun_frames / self.rate:.2f}s of silence), "
+            f"{self.dropped_frames / self.rate:.2f}s dropped"
+        )
+        if self.jitter_buffer:
+            text += (
+                f", playout delay {self.jitter_buffer.delay:.2f}s "
+                f"({self.skipped_frames / self.rate:.2f}s skipped to shrink it)"
+            )
+        return text
+
+    def _run(self):
+        block = bytearray(self.frames_per_buffer * self.frame_size)
+        view = memoryview(block)
+        silence = bytes(len(block))
+        max_skip_frames = int(self.frames_per_buffer * self.MAX_SKIP_FRACTION)
+        fade_frames = min(self.frames_per_buffer, int(self.SKIP_CROSSFADE_SECONDS * self.rate))
+        scratch = memoryview(bytearray((max_skip_frames + fade_frames) * self.frame_size))
+        while not self._stop.is_set():
+            prebuffer_frames = self.prebuffer_frames
+            if self.jitter_buffer:
+                prebuffer_frames = int(self.jitter_buffer.update() * self.rate)
+            available = self.ring.available
+            count = 0
+            if not self._playing and available and available >= prebuffer_frames * self.frame_size:
+                self._playing = True
+            elif self._playing and self.jitter_buffer:
+                # Catch up with a shrunk delay
+                excess_frames = self.jitter_buffer.excess_frames()
+                if excess_frames > 0:
+                    count = self._skip(min(excess_frames, max_skip_frames), fade_frames, scratch, view)
+            if self._playing:
+                count += self.ring.read_into(view[count:])
+            if count < len(block):
+                view[count:] = silence[count:]
+                if self._playing:
+                    self.underruns += 1
+                    self.underrun_frames += (len(block) - count) // self.frame_size
+                    if self.jitter_buffer and not self.expecting_gap:
+                        # Rebuffer up to the grown delay rather than stutter.
+                        self.jitter_buffer.on_underrun()
+                        self._playing = False
+            self._block_start = (self.frames_played, time.monotonic(), count // self.frame_size)
+            self.frames_played += count // self.frame_size
+            self.stream.write(block)
+
+    def _skip(self, frames: int, fade_frames: int, scratch: memoryview, out: memoryview) -> int:
+        """Skips `frames` frames, crossfading the audio on either side into `out`.
+
+        Returns the number of bytes written to `out`, none when there isn't
+        enough audio buffered to crossfade yet.
+        """
+        skip_size = frames * self.frame_size
+        fade_size = fade_frames * self.frame_size
+        if self.ring.available < skip_size + fade_size:
+            return 0
+        self.ring.read_into(scratch[:skip_size + fade_size])
+        dsp.crossfade(
+            scratch[:fade_size], scratch[skip_size:skip_size + fade_size], self.channels, out=out[:fade_size]
+        )
+        self.skipped_frames += frames
+        self.jitter_buffer.on_skip(frames)
+        return fade_size
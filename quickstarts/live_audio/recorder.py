@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Records a PCM stream to disk without blocking the code producing it.
+
+`Recorder.write()` only appends the chunk to a bounded queue. A background
+thread drains it into WAV files through large buffered writes, or pipes it to
+an `ffmpeg` process encoding FLAC. Files are rotated every `rotate_seconds`:
+
+```
+recorder = Recorder("session", rate=48000, channels=2, rotate_seconds=600)
+recorder.start()
+recorder.write(chunk)                  # session.000.wav, session.001.wav, ...
+recorder.mark("prompts", prompts=[...])  # session.events.jsonl
+...
+recorder.close()
+```
+
+`mark()` logs an event in `<prefix>.events.jsonl` with the sample offset the
+recording had reached, both in the whole recording and in the current file.
+
+If the disk can't keep up and the queue fills up, chunks are dropped rather
+than stalling the caller, and counted in `dropped_writes` / `dropped_frames`.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+import time
+import wave
+from typing import Optional
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+WRITE_BUFFER_BYTES = 1 << 20
+
+_CLOSE = object()
+
+
+class Recorder:
+    """Writes 16-bit PCM chunks to rotating WAV or FLAC files from a background thread."""
+
+    def __init__(
+        self,
+        prefix: str,
+        rate: int,
+        channels: int,
+        rotate_seconds: Optional[float] = None,
+        flac: bool = False,
+        max_queued_seconds: float = 30.0,
+    ):
+        self.prefix = prefix
+        self.rate = rate
+        self.channels = channels
+        self.frame_size = SAMPLE_WIDTH * channels
+        self.rotate_frames = int(rotate_seconds * rate) if rotate_seconds else None
+        self.flac = flac
+
+        self.frames_queued = 0  # Sample offset of the next chunk written.
+        self.frames_written = 0
+        self.dropped_writes = 0
+        self.dropped_frames = 0
+        self.error: Optional[Exception] = None
+        self.files: list[str] = []
+
+        # Chunks are usually well under a second long, so this bounds memory
+        # to about `max_queued_seconds` of audio.
+        self._queue = queue.Queue(maxsize=max(1, int(max_queued_seconds * 10)))
+        self._thread: Optional[threading.Thread] = None
+        self._file_start = 0  # Sample offset at which the current file starts.
+        self._file = None
+        self._wav = None
+        self._encoder = None
+        self._events = None
+
+    def start(self):
+        self._events = open(f"{self.prefix}.events.jsonl", "w", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="Recorder", daemon=True)
+        self._thread.start()
+
+    def write(self, pcm):
+        """Queues a chunk for writing. Never blocks, drops the chunk if the queue is full."""
+        frames = len(pcm) // self.frame_size
+        try:
+            self._queue.put_nowait(bytes(pcm))
+        except queue.Full:
+            self.dropped_writes += 1
+            self.dropped_frames += frames
+            return
+        self.frames_queued += frames
+
+    def mark(self, event: str, **data):
+        """Logs an event at the current sample offset of the recording."""
+        try:
+            self._queue.put_nowait((self.frames_queued, event, data))
+        except queue.Full:
+            self.dropped_writes += 1
+
+    def status(self) -> str:
+        return (
+            f"recorded {self.frames_written / self.rate:.1f}s to {len(self.files)} file(s), "
+            f"{self.dropped_writes} dropped writes ({self.dropped_frames / self.rate:.2f}s of audio)"
+        )
+
+    def close(self):
+        """Writes everything queued so far and closes the files."""
+        if self._thread is None:
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._thread = None
+        self._events.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                break
+            try:
+                if isinstance(item, tuple):
+                    self._write_event(*item)
+                elif self.error is None:
+                    self._write_audio(memoryview(item))
+                else:
+                    self.dropped_writes += 1
+                    self.dropped_frames += len(item) // self.frame_size
+            except (OSError, ValueError) as e:
+                # Keep draining the queue so writers never block on it.
+                print(f"[Error] Recording to {self.prefix} failed: {e}")
+                self.error = e
+        try:
+            self._close_file()
+        except (OSError, ValueError) as e:
+            print(f"[Error] Recording to {self.prefix} failed: {e}")
+
+    def _write_audio(self, data: memoryview):
+        while len(data):
+            if self._wav is None and self._encoder is None:
+                self._open_file()
+            count = len(data)
+            if self.rotate_frames:
+                room = self.rotate_frames - (self.frames_written - self._file_start)
+                count = min(count, room * self.frame_size)
+            if self._encoder is not None:
+                self._encoder.stdin.write(data[:count])
+            else:
+                self._wav.writeframesraw(data[:count])
+            self.frames_written += count // self.frame_size
+            data = data[count:]
+            if self.rotate_frames and self.frames_written - self._file_start >= self.rotate_frames:
+                self._close_file()
+
+    def _write_event(self, offset: int, event: str, data: dict):
+        # Files start at multiples of `rotate_frames`, even if not opened yet.
+        index = offset // self.rotate_frames if self.rotate_frames else 0
+        record = {
+            "event": event,
+            "sample": offset,
+            "seconds": round(offset / self.rate, 3),
+            "file": self._file_name(index),
+            "file_sample": offset - index * self.rotate_frames if self.rotate_frames else offset,
+            "time": time.time(),
+            **data,
+        }
+        self._events.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._events.flush()
+
+    def _file_name(self, index: int) -> str:
+        extension = "flac" if self.flac else "wav"
+        if self.rotate_frames:
+            return f"{self.prefix}.{index:03d}.{extension}"
+        return f"{self.prefix}.{extension}"
+
+    def _open_file(self):
+        index = self.frames_written // self.rotate_frames if self.rotate_frames else 0
+        path = self._file_name(index)
+        self._file_start = self.frames_written
+        if self.flac:
+            # Encoding runs in its own process, fed through a large pipe buffer.
+            self._encoder = subprocess.Popen(
+                [
+                    "ffmpeg", "-loglevel", "error", "-y",
+                    "-f", "s16le", "-ar", str(self.rate), "-ac", str(self.channels), "-i", "-",
+                    path,
+                ],
+                stdin=subprocess.PIPE,
+                bufsize=WRITE_BUFFER_BYTES,
+            )
+        else:
+            self._file = open(path, "wb", buffering=WRITE_BUFFER_BYTES)
+            self._wav = wave.open(self._file, "wb")
+            self._wav.setnchannels(self.channels)
+            self._wav.setsampwidth(SAMPLE_WIDTH)
+            self._wav.setframerate(self.rate)
+        self.files.append(path)
+
+    def _close_file(self):
+        if self._encoder is not None:
+            self._encoder.stdin.close()
+            self._encoder.wait()
+            self._encoder = None
+        if self._wav is not None:
+            # Patches the header with the final length.
+            self._wav.close()
+            self._file.close()
+            self._wav = None
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Splits long 16-bit PCM recordings at pauses.
+
+Each segment is at most `max_seconds` long. Within the last part of that range,
+the cut is placed in the middle of the quietest `pause_seconds` window, so that
+a segment rarely ends in the middle of a word:
+
+```
+for start, end in split_on_silence(pcm, rate=16000, max_seconds=60):
+    segment = pcm[2 * start:2 * end]
+```
+
+The energy analysis runs once over the whole recording, on 10ms frames.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from live_audio import dsp
+
+FRAME_SECONDS = 0.01
+
+
+def split_on_silence(
+    pcm,
+    rate: int,
+    max_seconds: float = 60.0,
+    min_seconds: Optional[float] = None,
+    pause_seconds: float = 0.3,
+    channels: int = 1,
+) -> list[tuple[int, int]]:
+    """Returns the (start, end) frame ranges of the segments of `pcm`.
+
+    Cuts are searched between `min_seconds` (half of `max_seconds` by
+    default) and `max_seconds` after the start of each segment. Empty audio
+    has no segments.
+    """
+    total_frames = dsp.as_samples(pcm).size // channels
+    if total_frames == 0:
+        return []
+    frame_samples = max(1, round(FRAME_SECONDS * rate))
+    max_frames = max(1, int(max_seconds / FRAME_SECONDS))
+    min_frames = max(1, int((max_seconds / 2 if min_seconds is None else min_seconds) / FRAME_SECONDS))
+    min_frames = min(min_frames, max_frames)
+
+    # Mean energy of the pause-long window starting at each 10ms frame.
+    levels = dsp.frame_rms(pcm, frame_samples, channels)
+    window = max(1, min(len(levels), int(pause_seconds / FRAME_SECONDS)))
+    energy = np.concatenate(([0.0], np.cumsum(levels ** 2)))
+    window_energy = (energy[window:] - energy[:-window]) / window
+
+    segments = []
+    start = 0  # In 10ms frames.
+    while (total_frames - start * frame_samples) > max_frames * frame_samples:
+        lo = start + min_frames
+        hi = min(start + max_frames - window + 1, len(window_energy))
+        if hi <= lo:
+            cut = start + max_frames
+        else:
+            cut = lo + int(np.argmin(window_energy[lo:hi])) + window // 2
+        segments.append((start * frame_samples, cut * frame_samples))
+        start = cut
+    segments.append((start * frame_samples, total_frames))
+    return segments
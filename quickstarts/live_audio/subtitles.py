@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Writes live transcripts as SRT and WebVTT subtitles.
+
+The Live API streams transcripts as small text fragments. `SubtitleWriter`
+groups them into phrases (cues) that end at sentence punctuation, at the end of
+a turn or after `MAX_CUE_SECONDS`. Timestamps come from audio clocks, the
+seconds of audio sent (source) and received (translation) when a fragment
+arrives, so they line up with the audio rather than with the wall clock.
+
+```
+subtitles = SubtitleWriter("talk")  # talk.source.srt, talk.translation.vtt, ...
+subtitles.write("source", "Hello there.", source_seconds=1.2, translation_seconds=0.0)
+...
+subtitles.close()
+```
+
+Cues are written as soon as they're complete, so the files can be followed
+while a live session is running. Source and translation phrases are paired in
+order, and each pair is also written to `<prefix>.metrics.jsonl` with its lag.
+"""
+
+import collections
+import dataclasses
+import json
+from typing import Optional
+
+SENTENCE_ENDS = (".", "!", "?", "…", "。", "！", "？")
+MAX_CUE_SECONDS = 7.0
+MIN_CUE_SECONDS = 1.0  # Display time given to phrases that fit in a single fragment.
+
+
+@dataclasses.dataclass
+class Cue:
+    start: float  # On the clock of the track the cue belongs to.
+    end: float
+    text: str = ""
+    source_seconds: float = 0.0  # Source audio sent when the cue started.
+
+
+def format_timestamp(seconds: float, decimal_separator: str = ",") -> str:
+    """Formats `seconds` as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (WebVTT)."""
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_separator}{milliseconds:03d}"
+
+
+class SubtitleTrack:
+    """Groups the transcript fragments of one audio track into cues, written to `<prefix>.srt` and `<prefix>.vtt`."""
+
+    def __init__(self, prefix: str):
+        self.srt = open(f"{prefix}.srt", "w", encoding="utf-8")
+        self.vtt = open(f"{prefix}.vtt", "w", encoding="utf-8")
+        self.vtt.write("WEBVTT\n\n")
+        self.cue_count = 0
+        self._cue: Optional[Cue] = None
+
+    def add(self, text: str, seconds: float, source_seconds: float, finished: bool = False) -> list[Cue]:
+        """Adds a fragment heard at `seconds`. Returns the cues it completes."""
+        completed = []
+        if self._cue and seconds - self._cue.start > MAX_CUE_SECONDS:
+            completed.append(self.flush())
+        if self._cue is None:
+            self._cue = Cue(start=seconds, end=seconds, source_seconds=source_seconds)
+        self._cue.text += text
+        self._cue.end = seconds
+        if finished or text.rstrip().endswith(SENTENCE_ENDS):
+            completed.append(self.flush())
+        return [cue for cue in completed if cue]
+
+    def flush(self) -> Optional[Cue]:
+        """Completes the current cue, e.g. at the end of a turn."""
+        cue, self._cue = self._cue, None
+        if cue is None or not cue.text.strip():
+            return None
+        cue.text = cue.text.strip()
+        cue.end = max(cue.end, cue.start + MIN_CUE_SECONDS)
+        self.cue_count += 1
+        self.srt.write(
+            f"{self.cue_count}\n{format_timestamp(cue.start)} --> {format_timestamp(cue.end)}\n{cue.text}\n\n"
+        )
+        self.vtt.write(f"{format_timestamp(cue.start, '.')} --> {format_timestamp(cue.end, '.')}\n{cue.text}\n\n")
+        self.srt.flush()
+        self.vtt.flush()
+        return cue
+
+    def close(self):
+        self.flush()
+        self.srt.close()
+        self.vtt.close()
+
+
+class SubtitleWriter:
+    """Writes the source and translation subtitles, and the lag of each phrase pair."""
+
+    def __init__(self, prefix: str):
+        self.tracks = {
+            "source": SubtitleTrack(f"{prefix}.source"),
+            "translation": SubtitleTrack(f"{prefix}.translation"),
+        }
+        self.metrics = open(f"{prefix}.metrics.jsonl", "w", encoding="utf-8")
+        self.pair_count = 0
+        self._pending = {kind: collections.deque() for kind in self.tracks}
+
+    def write(self, kind: str, text: str, source_seconds: float, translation_seconds: float, finished: bool = False):
+        """Adds a "source" or "translation" fragment, given the audio sent and received so far."""
+        seconds = source_seconds if kind == "source" else translation_seconds
+        for cue in self.tracks[kind].add(text, seconds, source_seconds, finished):
+            self._completed(kind, cue)
+
+    def end_turn(self):
+        """Completes the current phrases. Phrases left without a counterpart are logged unpaired."""
+        for kind, track in self.tracks.items():
+            self._completed(kind, track.flush())
+        while self._pending["source"] or self._pending["translation"]:
+            self._write_pair(
+                self._pending["source"].popleft() if self._pending["source"] else None,
+                self._pending["translation"].popleft() if self._pending["translation"] else None,
+            )
+
+    def _completed(self, kind: str, cue: Optional[Cue]):
+        if cue is None:
+            return
+        self._pending[kind].append(cue)
+        while self._pending["source"] and self._pending["translation"]:
+            self._write_pair(self._pending["source"].popleft(), self._pending["translation"].popleft())
+
+    def _write_pair(self, source: Optional[Cue], translation: Optional[Cue]):
+        record = {"segment": self.pair_count}
+        for kind, cue in (("source", source), ("translation", translation)):
+            if cue:
+                record[f"{kind}_start_seconds"] = round(cue.start, 3)
+                record[f"{kind}_end_seconds"] = round(cue.end, 3)
+                record[f"{kind}_text"] = cue.text
+        if source and translation:
+            # How much more source audio had been sent by the time the
+            # translation of the phrase started arriving.
+            record["lag_seconds"] = round(translation.source_seconds - source.start, 3)
+        self.metrics.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.metrics.flush()
+        self.pair_count += 1
+
+    def close(self):
+        self.end_turn()
+        for track in self.tracks.values():
+            track.close()
+        self.metrics.close()
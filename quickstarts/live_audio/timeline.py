@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dispatches timed control events so they're heard on beat boundaries.
+
+A timeline is a JSON file listing events at a bar (or beat) position:
+
+```
+{
+  "bpm": 120,
+  "beats_per_bar": 4,
+  "events": [
+    {"bar": 0, "prompts": {"Piano": 1.0}},
+    {"bar": 8, "prompts": {"Piano": 0.5, "Drums": 1.0}},
+    {"bar": 16, "config": {"bpm": 100}},
+    {"bar": 24, "action": "pause"},
+    {"bar": 26, "action": "play"}
+  ]
+}
+```
+
+Positions are converted to seconds of played audio with the tempo map the
+`bpm` events define. A change takes `latency_seconds()` to be heard, the audio
+buffered ahead of the speakers, so each event is dispatched that long before
+its position comes up. The difference between the time an event was due to be
+dispatched and the time it actually was is recorded as its jitter.
+
+Nothing is played during a pause, so from a "pause" event until audio plays
+again after a "play", positions advance with the wall clock instead: above,
+playback resumes after two bars of silence.
+"""
+
+import asyncio
+import dataclasses
+import json
+import statistics
+from typing import Awaitable, Callable, Optional
+
+POLL_SECONDS = 0.25  # Re-estimate the latency at least this often while waiting.
+
+
+@dataclasses.dataclass
+class TimelineEvent:
+    beat: float
+    prompts: Optional[dict[str, float]] = None
+    config: Optional[dict] = None
+    action: Optional[str] = None  # "play", "pause" or "stop"
+    seconds: float = 0.0  # Position in played audio, filled in by `Timeline`.
+    jitter: Optional[float] = None  # Actual minus scheduled dispatch time.
+    overdue: bool = False  # Already due when the timeline got to it, e.g. at bar 0.
+
+
+class _PlaybackClock:
+    """The timeline position, following played audio except while paused.
+
+    From a pause until audio plays again after the next play, the position
+    runs on `wall_time` from where it was at the pause. The time spent paused
+    is then added to the played seconds from there on.
+    """
+
+    def __init__(self, played_seconds: Callable[[], float], wall_time: Callable[[], float]):
+        self.played_seconds = played_seconds
+        self.wall_time = wall_time
+        self.paused_seconds = 0.0  # Time spent paused so far.
+        self._anchor: Optional[tuple[float, float]] = None  # Position and wall time at the pause.
+        self._resumed_at: Optional[float] = None  # Played seconds when playing was asked for again.
+
+    def seconds(self) -> float:
+        if self._anchor is None:
+            return self.played_seconds() + self.paused_seconds
+        position, since = self._anchor
+        position += self.wall_time() - since
+        played = self.played_seconds()
+        if self._resumed_at is not None and played > self._resumed_at:
+            # Audio is playing again: follow it from here on.
+            self.paused_seconds = position - played
+            self._anchor = self._resumed_at = None
+        return position
+
+    def pause(self):
+        if self._anchor is None:
+            self._anchor = (self.seconds(), self.wall_time())
+        self._resumed_at = None
+
+    def play(self):
+        if self._anchor is not None:
+            self._resumed_at = self.played_seconds()
+
+
+class Timeline:
+    """A list of `TimelineEvent`s positioned on a tempo map."""
+
+    def __init__(self, events: list[TimelineEvent], bpm: float = 120.0, beats_per_bar: int = 4):
+        self.bpm = bpm
+        self.beats_per_bar = beats_per_bar
+        self.events = sorted(events, key=lambda event: event.beat)
+
+        # Tempo changes apply from the beat of the event setting them.
+        beat, seconds = 0.0, 0.0
+        for event in self.events:
+            seconds += (event.beat - beat) * 60 / bpm
+            beat = event.beat
+            event.seconds = seconds
+            if event.config and event.config.get("bpm"):
+                bpm = event.config["bpm"]
+
+    @classmethod
+    def load(cls, path: str) -> "Timeline":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        beats_per_bar = data.get("beats_per_bar", 4)
+        events = []
+        for item in data["events"]:
+            beat = item.get("beat", 0) + item.get("bar", 0) * beats_per_bar
+            if item.get("action") not in (None, "play", "pause", "stop"):
+                raise ValueError(f"Unknown timeline action: {item['action']!r}")
+            events.append(
+                TimelineEvent(beat=beat, prompts=item.get("prompts"), config=item.get("config"), action=item.get("action"))
+            )
+        return cls(events, data.get("bpm", 120.0), beats_per_bar)
+
+    def position(self, event: TimelineEvent) -> str:
+        bar, beat = divmod(event.beat, self.beats_per_bar)
+        return f"bar {bar:g} beat {beat:g}"
+
+    async def run(
+        self,
+        dispatch: Callable[[TimelineEvent], Awaitable[None]],
+        played_seconds: Callable[[], float],
+        latency_seconds: Callable[[], float],
+    ):
+        """Calls `dispatch` for each event, `latency_seconds()` before its position is played."""
+        loop = asyncio.get_running_loop()
+        clock = _PlaybackClock(played_seconds, loop.time)
+        for event in self.events:
+            event.overdue = event.seconds - clock.seconds() - latency_seconds() < 0
+            while True:
+                wait = event.seconds - clock.seconds() - latency_seconds()
+                due = loop.time() + wait
+                if wait <= POLL_SECONDS:
+                    break
+                await asyncio.sleep(POLL_SECONDS)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            event.jitter = loop.time() - due
+            if event.action == "pause":
+                clock.pause()
+            elif event.action == "play":
+                clock.play()
+            await dispatch(event)
+
+    def jitter_summary(self) -> str:
+        dispatched = [event for event in self.events if event.jitter is not None]
+        jitters = [abs(event.jitter) * 1000 for event in dispatched if not event.overdue]
+        text = f"{len(dispatched)} events dispatched"
+        if len(jitters) < len(dispatched):
+            text += f" ({len(dispatched) - len(jitters)} already overdue)"
+        if jitters:
+            text += f", jitter mean {statistics.mean(jitters):.1f} ms, max {max(jitters):.1f} ms"
+        return text
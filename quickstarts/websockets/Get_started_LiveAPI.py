@@ -29,6 +29,9 @@ Important: **Use headphones**. This script uses the system default audio
 input and output, which often won't include echo cancellation. So to prevent
 the model from interrupting itself it is important that you use headphones. 
 
+Only the packages of the `--mode` you pick are needed: opencv-python and
+pillow for "camera", mss and pillow for "screen".
+
 ## Run
 
 To run the script:
@@ -53,10 +56,7 @@ import os
 import sys
 import traceback
 
-import cv2
 import pyaudio
-import PIL.Image
-import mss
 import argparse
 
 from websockets.asyncio.client import connect
@@ -77,14 +77,30 @@ host = "generativelanguage.googleapis.com"
 model = "gemini-2.5-flash-native-audio-latest"
 DEFAULT_MODE="camera"
 
+# Capture dependencies take a while to import, so they're only imported for
+# the video mode that needs them, see `import_video_modules()`.
+cv2 = None
+mss = None
+PIL = None
+
 
-api_key = os.environ["GOOGLE_API_KEY"]
-uri = f"wss://{host}/ws/google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent?key={api_key}"
+def import_video_modules(video_mode):
+    """Imports what capturing frames in `video_mode` needs."""
+    global cv2, mss, PIL
+    if video_mode == "camera":
+        import cv2
+        import PIL.Image
+    elif video_mode == "screen":
+        import mss
+        import mss.tools
+        import PIL.Image
 
 
 class AudioLoop:
     def __init__(self, video_mode=DEFAULT_MODE):
         self.video_mode=video_mode
+        import_video_modules(video_mode)
+        self.pya = None  # Opening the audio devices, created by run().
         self.audio_in_queue = None
         self.out_queue = None
 
@@ -185,10 +201,8 @@ class AudioLoop:
             await self.ws.send(json.dumps(msg))
 
     async def listen_audio(self):
-        pya = pyaudio.PyAudio()
-
-        mic_info = pya.get_default_input_device_info()
-        self.audio_stream = pya.open(
+        mic_info = self.pya.get_default_input_device_info()
+        self.audio_stream = self.pya.open(
             format=FORMAT,
             channels=CHANNELS,
             rate=SEND_SAMPLE_RATE,
@@ -240,8 +254,7 @@ class AudioLoop:
                         self.audio_in_queue.get_nowait()
 
     async def play_audio(self):
-        pya = pyaudio.PyAudio()
-        stream = pya.open(
+        stream = self.pya.open(
             format=FORMAT, channels=CHANNELS, rate=RECEIVE_SAMPLE_RATE, output=True
         )
         while True:
@@ -253,6 +266,11 @@ class AudioLoop:
 
         Splits and displays files if the queue pauses for more than `max_pause`.
         """
+        api_key = os.environ["GOOGLE_API_KEY"]
+        uri = f"wss://{host}/ws/google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent?key={api_key}"
+        # Created here rather than on import: initializing PortAudio scans
+        # the audio devices, which can take seconds.
+        self.pya = await asyncio.to_thread(pyaudio.PyAudio)
         try:
             async with (
                 await connect(